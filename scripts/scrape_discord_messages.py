@@ -6,6 +6,7 @@ Features:
 - Stores messages with author, channel, and timestamp metadata
 - Supports analytics for user/channel activity
 - Handles rate limits and pagination
+- Adaptive channel parallelism (backs off on 429s / rising latency)
 """
 
 import asyncio
@@ -20,7 +21,13 @@ from dotenv import load_dotenv
 from src.rag import MultimodalEmbedder, MultimodalIndexer
 from src.rag.indexer import DocumentMetadata
 from src.llm import OpenRouterClient
-from src.utils import get_config, get_logger
+from src.utils import get_config, get_logger, AdaptiveConcurrency, ThroughputMeter
+from src.utils.adaptive_concurrency import (
+    install_rate_limit_listener,
+    prioritize_channels,
+    remove_rate_limit_listener,
+    timed_history,
+)
 
 # Add parent directory to path
 import sys
@@ -51,6 +58,14 @@ class DiscordMessageScraper:
         self.indexer: Optional[MultimodalIndexer] = None
         self.llm_client: Optional[OpenRouterClient] = None
         
+        # Channel parallelism (adapts to rate limits)
+        self.concurrency = AdaptiveConcurrency(
+            initial=self.config.auto_indexing.parallel_channels,
+            maximum=self.config.auto_indexing.max_parallel_channels,
+            latency_backoff_ratio=self.config.auto_indexing.latency_backoff_ratio,
+        )
+        self.throughput = ThroughputMeter()
+        
         # Statistics
         self.stats = {
             "total_messages": 0,
@@ -125,7 +140,10 @@ class DiscordMessageScraper:
         
         try:
             # Fetch messages with pagination
-            async for message in channel.history(limit=limit, oldest_first=False):
+            history = channel.history(limit=limit, oldest_first=False)
+            async for message in timed_history(history, self.concurrency.record_success):
+                self.throughput.add()
+                
                 # Skip bot messages
                 if message.author.bot:
                     continue
@@ -198,7 +216,11 @@ class DiscordMessageScraper:
                 
                 # Progress update
                 if messages_scraped % 100 == 0:
-                    print(f"  ⏳ Scraped {messages_scraped} messages, indexed {messages_indexed}...")
+                    print(
+                        f"  ⏳ #{channel_name}: scraped {messages_scraped}, indexed {messages_indexed} "
+                        f"({self.throughput.per_second:.1f} msg/s overall, "
+                        f"{self.concurrency.limit} channels)..."
+                    )
             
             # Update channel stats
             self.stats["messages_by_channel"][channel_id] = messages_indexed
@@ -268,36 +290,47 @@ class DiscordMessageScraper:
         print(f"   Target Guilds: {len(guilds)}")
         print(f"\n{'='*80}\n")
         
+        rate_limit_listener = install_rate_limit_listener(self.concurrency)
+        
         # Scrape each guild
-        for guild in guilds:
-            print(f"\n🏢 Guild: {guild.name} (ID: {guild.id})")
-            print(f"   Total Channels: {len(guild.text_channels)}")
-            
-            # Scrape each text channel
-            for channel in guild.text_channels:
-                try:
-                    stats = await self.scrape_channel(
-                        channel=channel,
-                        limit=limit_per_channel,
-                    )
-                    
-                    self.stats["total_messages"] += stats["indexed"]
-                    self.stats["total_channels"] += 1
-                    
-                    # Rate limit protection
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(
-                        "channel_scraping_failed",
-                        channel_name=channel.name,
-                        error=str(e),
-                    )
-                    self.stats["errors"] += 1
+        try:
+            for guild in guilds:
+                print(f"\n🏢 Guild: {guild.name} (ID: {guild.id})")
+                print(f"   Total Channels: {len(guild.text_channels)}")
+                
+                # Recently active and largest channels first, run adaptively in parallel
+                channels = prioritize_channels(guild.text_channels)
+                await asyncio.gather(*[
+                    self._scrape_channel_with_limit(channel, limit_per_channel)
+                    for channel in channels
+                ])
+        finally:
+            remove_rate_limit_listener(rate_limit_listener)
         
         # Print final statistics
         self.print_statistics()
     
+    async def _scrape_channel_with_limit(
+        self,
+        channel: discord.TextChannel,
+        limit: Optional[int],
+    ):
+        """Scrape a channel once the concurrency controller grants a slot."""
+        async with self.concurrency.slot():
+            try:
+                stats = await self.scrape_channel(channel=channel, limit=limit)
+                
+                self.stats["total_messages"] += stats["indexed"]
+                self.stats["total_channels"] += 1
+                
+            except Exception as e:
+                logger.error(
+                    "channel_scraping_failed",
+                    channel_name=channel.name,
+                    error=str(e),
+                )
+                self.stats["errors"] += 1
+    
     def print_statistics(self):
         """Print scraping statistics."""
         print(f"\n{'='*80}")
@@ -307,6 +340,8 @@ class DiscordMessageScraper:
         print(f"   Total Channels: {self.stats['total_channels']}")
         print(f"   Total Messages: {self.stats['total_messages']}")
         print(f"   Errors: {self.stats['errors']}")
+        print(f"   Throughput: {self.throughput.per_second:.1f} msg/s")
+        print(f"   Rate Limits: {self.concurrency.rate_limits}")
         
         print(f"\n📊 Top Channels by Activity:")
         sorted_channels = sorted(
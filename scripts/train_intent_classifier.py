@@ -0,0 +1,76 @@
+"""
+Train the local intent classifier from logged queries.
+
+The bot appends every classified mention to data/intent_samples.jsonl.
+Rule-labeled lines and hand-labeled lines ("source": "manual") are used as
+training data; the model then covers paraphrases the rules don't match.
+Since those are exactly the queries it was not trained on, model decisions
+only pick the agent and whether tools run - they never skip RAG.
+
+Usage:
+    python scripts/train_intent_classifier.py
+    python scripts/train_intent_classifier.py --samples data/intent_samples.jsonl --extra labeled.jsonl
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.bot.intent_classifier import (
+    DEFAULT_MODEL_PATH,
+    DEFAULT_SAMPLE_LOG,
+    HashedLogisticRegression,
+    load_samples,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local intent classifier")
+    parser.add_argument("--samples", type=Path, default=DEFAULT_SAMPLE_LOG, help="Logged queries (JSONL)")
+    parser.add_argument("--extra", type=Path, action="append", default=[], help="Extra labeled JSONL files")
+    parser.add_argument("--output", type=Path, default=DEFAULT_MODEL_PATH, help="Model file")
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--holdout", type=float, default=0.1, help="Fraction kept for evaluation")
+    args = parser.parse_args()
+
+    samples = {}
+    for path in [args.samples, *args.extra]:
+        if not path.exists():
+            print(f"⚠️ Missing: {path}")
+            continue
+        samples.update(load_samples(path))
+
+    if len(samples) < 20:
+        print(f"❌ Not enough labeled queries ({len(samples)}), need at least 20")
+        return
+
+    items = list(samples.items())
+    random.Random(0).shuffle(items)
+    split = int(len(items) * (1 - args.holdout))
+    train, test = items[:split], items[split:]
+
+    counts = {}
+    for _, intent in items:
+        counts[intent] = counts.get(intent, 0) + 1
+    print(f"Samples: {len(items)} ({', '.join(f'{k}: {v}' for k, v in sorted(counts.items()))})")
+
+    model = HashedLogisticRegression()
+    model.fit([q for q, _ in train], [i for _, i in train], epochs=args.epochs)
+
+    if test:
+        started = time.perf_counter()
+        correct = sum(model.predict(q)[0] == intent for q, intent in test)
+        per_query_ms = (time.perf_counter() - started) * 1000 / len(test)
+        print(f"Holdout accuracy: {correct / len(test):.1%} ({len(test)} queries, {per_query_ms:.3f} ms/query)")
+
+    model.save(args.output)
+    print(f"✅ Saved model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 """Agent implementations."""
 
 from .agent_factory import AgentFactory
-from .base_agent import AgentConfig, BaseAgent
+from .base_agent import AgentConfig, AgentContext, BaseAgent
 from .expert_agent import ExpertAgent
 from .general_agent import GeneralAgent
+from .prompt_builder import PromptPrefixCache, get_prompt_prefix_cache
 
 __all__ = [
     "AgentFactory",
     "BaseAgent",
     "AgentConfig",
+    "AgentContext",
     "ExpertAgent",
     "GeneralAgent",
+    "PromptPrefixCache",
+    "get_prompt_prefix_cache",
 ]
@@ -3,18 +3,45 @@ Base agent class for multi-agent system.
 """
 
 import asyncio
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import discord
 
+from src.agents.prompt_builder import (
+    build_context_message,
+    build_user_message,
+    get_prompt_prefix_cache,
+)
 from src.llm import OpenRouterClient
-from src.rag import HybridRetriever
-from src.utils import get_logger
+from src.rag import AnswerCache, HybridRetriever, answer_cache_scope, get_answer_cache
+from src.utils import get_channel_index, get_config, get_logger
+from src.utils.metrics import STAGE_LATENCY
+from src.utils.stage_pipeline import Stage, StagePipeline
+
+if TYPE_CHECKING:
+    from src.bot.intent_classifier import IntentDecision
 
 logger = get_logger(__name__)
 
+# Called with the accumulated response text while streaming
+PartialCallback = Callable[[str], Awaitable[None]]
+
+# Queries about the asker can't share answers with other users
+_PERSONAL_QUERY_RE = re.compile(
+    r"\b(i|i'm|im|me|my|mine|myself|we|our|us|я|мне|меня|мой|моя|мои|моё)\b",
+    re.IGNORECASE,
+)
+
+# Follow-ups only make sense together with the conversation history
+_FOLLOW_UP_RE = re.compile(
+    r"^(and|also|but|so|then|what about|how about|а|и)\b"
+    r"|\b(it|that|this|these|those|them|above|previous|earlier|это|этот|там)\b",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class AgentConfig:
@@ -33,6 +60,26 @@ class AgentConfig:
     response: Dict[str, Any]
 
 
+@dataclass
+class AgentContext:
+    """
+    Per-request state passed through the agent pipeline.
+    
+    Agents are shared singletons, so nothing request-specific is stored on
+    them - concurrent mentions each carry their own context.
+    """
+    
+    message: discord.Message
+    query: str
+    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    on_partial: Optional[PartialCallback] = None
+    intent: Optional["IntentDecision"] = None  # Confident local intent decision
+    
+    @property
+    def guild(self) -> Optional[discord.Guild]:
+        return self.message.guild if self.message else None
+
+
 class BaseAgent(ABC):
     """
     Base class for all agents.
@@ -54,8 +101,6 @@ class BaseAgent(ABC):
         self.config = config
         self.llm_client = llm_client
         self.retriever = retriever
-        self._guild_channels: Optional[str] = None  # Cached channel list
-        self._channel_purposes: Optional[Dict[str, str]] = None  # Channel purposes
         
         logger.info(
             "agent_initialized",
@@ -64,19 +109,13 @@ class BaseAgent(ABC):
             tools=config.tools,
         )
     
-    def set_guild_channels(self, channels_info: str):
-        """Set current guild channels for context."""
-        self._guild_channels = channels_info
-    
-    def set_channel_purposes(self, purposes: Dict[str, str]):
-        """Set channel purposes for context (channel_id -> description)."""
-        self._channel_purposes = purposes
-    
     async def process_message(
         self,
         message: discord.Message,
         query: str,
         conversation_history: Optional[List[Dict[str, str]]] = None,
+        on_partial: Optional[PartialCallback] = None,
+        intent: Optional["IntentDecision"] = None,
     ) -> str:
         """
         Process incoming message and generate response.
@@ -85,6 +124,10 @@ class BaseAgent(ABC):
             message: Discord message object
             query: User query text
             conversation_history: Previous messages in conversation (optional)
+            on_partial: Stream the completion, awaiting this with the
+                accumulated text as deltas arrive (optional)
+            intent: Local intent decision; skips RAG/tools the message
+                doesn't need (optional)
             
         Returns:
             Generated response text
@@ -95,22 +138,76 @@ class BaseAgent(ABC):
             query=query[:50],
         )
         
-        # Store message for channel link formatting
-        self._message = message
-        
-        # Build context
-        context = await self._build_context(query, message)
+        ctx = AgentContext(
+            message=message,
+            query=query,
+            conversation_history=conversation_history or [],
+            on_partial=on_partial,
+            intent=intent,
+        )
         
-        # Execute tools if needed
-        tool_results = await self._execute_tools(query, message)
+        # Repeated FAQ-style questions are answered from the cache
+        answer_cache = self._get_answer_cache(message, query, conversation_history)
+        # Answers contain guild-specific channel links
+        cache_scope = answer_cache_scope(self.config.name, message.guild and message.guild.id)
+        if answer_cache:
+            try:
+                cached = await answer_cache.lookup(
+                    cache_scope, query, self.retriever.embedder.embed_query
+                )
+            except Exception as e:
+                logger.warning("answer_cache_lookup_failed", error=str(e))
+                cached = None
+            if cached:
+                return cached
+        
+        # RAG context and tools are independent - run them concurrently.
+        # Both are optional: a slow search degrades to no context.
+        timeouts = get_config().performance.stage_timeouts
+        rag_stage = Stage(
+            "rag_context",
+            lambda _: self._build_context(ctx),
+            timeout=timeouts.get("rag_context"),
+            optional=True,
+            default="",
+        )
+        pipeline = []
+        if intent is None or intent.needs_rag:
+            pipeline.append(rag_stage)
+        if intent is None or intent.needs_tools:
+            pipeline.append(Stage(
+                "tools",
+                lambda _: self._execute_tools(ctx),
+                timeout=timeouts.get("tools"),
+                optional=True,
+            ))
+        stages = (await StagePipeline(f"agent:{self.config.name}", pipeline).run()).values
+        
+        # Tool intent, but no tool produced output: fall back to doc context
+        if "rag_context" not in stages and "tools" in stages and not stages["tools"]:
+            stages.update((await StagePipeline(f"agent:{self.config.name}", [rag_stage]).run()).values)
+        
+        context = stages.get("rag_context", "")
+        tool_results = stages.get("tools")
         if tool_results:
             context = f"{context}\n\n**Tool Results:**\n{tool_results}"
         
         # Generate response with conversation history and images
-        response = await self._generate_response(query, context, conversation_history or [], message)
+        with STAGE_LATENCY.time(pipeline=f"agent:{self.config.name}", stage="generate"):
+            response = await self._generate_response(ctx, context)
         
         # Format response
-        formatted_response = await self._format_response(response, context)
+        formatted_response = await self._format_response(ctx, response, context)
+        
+        # Tool output (channel reads, user info) is time-dependent - don't cache it
+        if answer_cache and not tool_results:
+            try:
+                await answer_cache.store(
+                    cache_scope, query, formatted_response,
+                    self.retriever.embedder.embed_query,
+                )
+            except Exception as e:
+                logger.warning("answer_cache_store_failed", error=str(e))
         
         logger.info(
             "agent_response_generated",
@@ -120,6 +217,37 @@ class BaseAgent(ABC):
         
         return formatted_response
     
+    def _get_answer_cache(
+        self,
+        message: discord.Message,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+    ) -> Optional[AnswerCache]:
+        """
+        Get the answer cache if this query's answer can be shared.
+        
+        Excluded: replies, attachments, mentions of users/roles/channels,
+        personal questions, and follow-ups that depend on history.
+        """
+        if not get_config().performance.cache.get("enabled", False):
+            return None
+        if not self.config.rag_enabled or not self.retriever:
+            return None
+        
+        if message.reference or message.attachments or message.stickers:
+            return None
+        if message.role_mentions or message.channel_mentions or message.mention_everyone:
+            return None
+        if any(not user.bot for user in message.mentions):
+            return None
+        
+        if self._should_skip_rag(query) or _PERSONAL_QUERY_RE.search(query):
+            return None
+        if conversation_history and _FOLLOW_UP_RE.search(query):
+            return None
+        
+        return get_answer_cache()
+    
     def _clean_query_for_rag(self, query: str, message: discord.Message) -> str:
         """
         Clean query for better RAG search.
@@ -206,12 +334,9 @@ class BaseAgent(ABC):
         
         return False
     
-    async def _build_context(
-        self,
-        query: str,
-        message: discord.Message,
-    ) -> str:
+    async def _build_context(self, ctx: AgentContext) -> str:
         """Build context from RAG and other sources."""
+        query, message = ctx.query, ctx.message
         logger.debug(
             "build_context_called",
             agent=self.config.name,
@@ -382,11 +507,7 @@ class BaseAgent(ABC):
         
         return collections_to_search
     
-    async def _execute_tools(
-        self,
-        query: str,
-        message: discord.Message,
-    ) -> Optional[str]:
+    async def _execute_tools(self, ctx: AgentContext) -> Optional[str]:
         """Execute agent tools if needed."""
         if not self.config.tools:
             return None
@@ -394,109 +515,75 @@ class BaseAgent(ABC):
         # Subclasses override this to implement tool execution
         return None
     
-    async def _generate_response(
-        self,
-        query: str,
-        context: str,
-        conversation_history: List[Dict[str, str]],
-        message: discord.Message = None,
-    ) -> str:
+    async def _generate_response(self, ctx: AgentContext, context: str) -> str:
         """Generate LLM response with conversation history and optional images."""
-        # Build base system prompt
-        base_prompt = self.config.system_prompt
+        messages, system_prompt = self._build_generation_request(ctx, context)
+        max_tokens = self.config.response.get("max_tokens", 1000)
+        
+        if ctx.on_partial is None:
+            response = await self.llm_client.chat_completion(
+                messages=messages,
+                system_prompt=system_prompt,
+                max_tokens=max_tokens,
+                temperature=0.7,
+            )
+            return response.content.strip()
         
-        # Add channel list if available
-        if self._guild_channels:
-            base_prompt += f"\n\n**available server channels (use exact names when mentioning):**\n{self._guild_channels}"
+        # Stream: hand the accumulated text to the caller as it grows
+        stream = self.llm_client.stream_completion(
+            messages=messages,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=0.7,
+        )
+        text = ""
+        async for delta in stream:
+            text += delta
+            await ctx.on_partial(text)
         
-        # Add channel purposes if available
-        if self._channel_purposes:
-            purposes_text = "\n".join([f"<#{cid}>: {desc}" for cid, desc in self._channel_purposes.items()])
-            base_prompt += f"""
-
-**CHANNEL GUIDE (CRITICAL - follow these rules strictly):**
-{purposes_text}
-
-**CHANNEL ACCESS RULES:**
-- "open to all users" = ANYONE can write messages there, no special roles needed
-- "read only" = users can ONLY read, cannot post messages (official announcements, etc.)
-
-**NEVER give wrong info about channels:**
-- NEVER say a channel requires special roles if it's marked "open to all users"
-- NEVER suggest users can post in "read only" channels
-- when directing users to a channel, mention if they can post there or just read"""
-            logger.debug(
-                "channel_purposes_injected",
-                agent=self.config.name,
-                purposes_count=len(self._channel_purposes),
-            )
+        return text.strip()
+    
+    def _build_generation_request(
+        self,
+        ctx: AgentContext,
+        context: str,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Build LLM messages and system prompt (history, context, images).
         
-        # Build system prompt with context
-        if context:
-            system_prompt = f"""{base_prompt}
-
-**IMPORTANT - Use this retrieved information to answer:**
-
-{context}
-
-**CRITICAL RULES for using context:**
-- If context contains URLs/links - use them EXACTLY as provided, don't make up alternatives
-- If context contains specific facts (APY, fees, features) - use the exact numbers/details
-- Only say "I don't know" if the context truly doesn't have the answer
-- Never guess or make up information when precise details are in the context"""
-        else:
-            system_prompt = base_prompt
+        The system prompt is a static per-guild prefix; retrieved context
+        goes in a trailing message so the prefix stays cacheable.
+        """
+        system_prompt = get_prompt_prefix_cache().get(
+            self.config.name,
+            self.config.system_prompt,
+            ctx.guild,
+        )
         
         # Build messages with conversation history
         messages = []
         
         # Add conversation history (last N messages based on max_history)
         max_history = self.config.max_history
+        conversation_history = ctx.conversation_history
         if conversation_history and max_history > 0:
-            # Take last max_history pairs (user + assistant)
-            recent_history = conversation_history[-(max_history * 2):]
-            messages.extend(recent_history)
-        
-        # Build current query message with images if present
-        if message and (message.attachments or message.stickers):
-            # Multimodal content with text + images
-            content = [{"type": "text", "text": query}]
-            
-            # Add image attachments
-            for attachment in message.attachments:
-                if attachment.content_type and attachment.content_type.startswith("image/"):
-                    content.append({
-                        "type": "image_url",
-                        "image_url": {"url": attachment.url}
-                    })
-            
-            # Add stickers (they have URLs too)
-            for sticker in message.stickers:
-                if hasattr(sticker, 'url') and sticker.url:
-                    content.append({
-                        "type": "image_url",
-                        "image_url": {"url": sticker.url}
-                    })
-            
-            messages.append({"role": "user", "content": content})
-        else:
-            # Text-only message
-            messages.append({"role": "user", "content": query})
+            # Summary of older turns (if any) leads, then last max_history pairs
+            if conversation_history[0]["role"] == "system":
+                messages.append(conversation_history[0])
+                conversation_history = conversation_history[1:]
+            messages.extend(conversation_history[-(max_history * 2):])
         
-        # Generate response
-        response = await self.llm_client.chat_completion(
-            messages=messages,
-            system_prompt=system_prompt,
-            max_tokens=self.config.response.get("max_tokens", 1000),
-            temperature=0.7,
-        )
+        if context:
+            messages.append(build_context_message(context))
         
-        return response.content.strip()
+        messages.append(build_user_message(ctx.query, ctx.message))
+        
+        return messages, system_prompt
     
     def _format_channel_links(
         self,
         response: str,
-        guild_id: int,
+        guild: discord.Guild,
     ) -> str:
         """
         Convert #channel mentions to Discord links.
@@ -508,18 +595,15 @@ class BaseAgent(ABC):
         
         # Pattern to match #channel-name
         pattern = r'#([\w-]+)'
+        index = get_channel_index()
         
         def replace_channel(match):
-            channel_name = match.group(1)
+            # Indexed lookup by name in the guild
+            channel_id = index.get_id(guild, match.group(1))
             
-            # Try to find channel by name in the guild
-            if hasattr(self, '_message') and self._message and self._message.guild:
-                guild = self._message.guild
-                channel = discord.utils.get(guild.channels, name=channel_name)
-                
-                if channel:
-                    # Return Discord link format
-                    return f"<#{channel.id}>"
+            if channel_id:
+                # Return Discord link format
+                return f"<#{channel_id}>"
             
             # If not found, keep original
             return match.group(0)
@@ -528,6 +612,7 @@ class BaseAgent(ABC):
     
     async def _format_response(
         self,
+        ctx: AgentContext,
         response: str,
         context: str,
     ) -> str:
@@ -536,8 +621,8 @@ class BaseAgent(ABC):
         formatted = response.replace("####", "###")
         
         # Convert #channel mentions to Discord links
-        if hasattr(self, '_message') and self._message and self._message.guild:
-            formatted = self._format_channel_links(formatted, self._message.guild.id)
+        if ctx.guild:
+            formatted = self._format_channel_links(formatted, ctx.guild)
         
         # Add citations if enabled
         if self.config.response.get("include_citations") and context:
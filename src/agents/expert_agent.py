@@ -4,9 +4,7 @@ Expert agent for Liquid platform knowledge.
 
 from typing import Optional
 
-import discord
-
-from src.agents.base_agent import AgentConfig, BaseAgent
+from src.agents.base_agent import AgentConfig, AgentContext, BaseAgent
 from src.llm import OpenRouterClient
 from src.rag import HybridRetriever
 from src.tools.web_search_tool import WebSearchTool
@@ -41,12 +39,9 @@ class ExpertAgent(BaseAgent):
         
         logger.info("expert_agent_initialized", web_search_enabled=True)
     
-    async def _execute_tools(
-        self,
-        query: str,
-        message: discord.Message,
-    ) -> Optional[str]:
+    async def _execute_tools(self, ctx: AgentContext) -> Optional[str]:
         """Execute web search tool if needed."""
+        query = ctx.query
         query_lower = query.lower()
         
         # Check if web search is needed
@@ -69,6 +64,7 @@ class ExpertAgent(BaseAgent):
     
     async def _format_response(
         self,
+        ctx: AgentContext,
         response: str,
         context: str,
     ) -> str:
@@ -6,7 +6,7 @@ from typing import Optional
 
 import discord
 
-from src.agents.base_agent import AgentConfig, BaseAgent
+from src.agents.base_agent import AgentConfig, AgentContext, BaseAgent
 from src.llm import OpenRouterClient
 from src.rag import HybridRetriever
 from src.utils import get_logger
@@ -171,12 +171,9 @@ class GeneralAgent(BaseAgent):
         
         return "\n".join(lines)
     
-    async def _execute_tools(
-        self,
-        query: str,
-        message: discord.Message,
-    ) -> Optional[str]:
+    async def _execute_tools(self, ctx: AgentContext) -> Optional[str]:
         """Execute tools: check channel list, reading, or routing suggestions."""
+        query, message = ctx.query, ctx.message
         
         if self.channel_reader and message.guild:
             # Check if user wants list of all channels
@@ -256,6 +253,7 @@ class GeneralAgent(BaseAgent):
     
     async def _format_response(
         self,
+        ctx: AgentContext,
         response: str,
         context: str,
     ) -> str:
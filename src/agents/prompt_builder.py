@@ -0,0 +1,171 @@
+"""
+Prefix-stable prompt assembly.
+
+Provider-side prompt caching only applies to an identical leading run of
+tokens. The prompt is therefore laid out from most to least stable:
+
+1. system  - static prefix: persona, server channel list, channel guide and
+             the rules for using retrieved context (cached per agent+guild,
+             rebuilt only after channel create/delete/update events)
+2. history - earlier turns (stable across a user's conversation)
+3. system  - volatile retrieved context / tool results for this request
+4. user    - current query (with images)
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+from src.utils import get_channel_index, get_channel_purposes, get_logger
+
+logger = get_logger(__name__)
+
+# Max channels listed in the prefix
+MAX_LISTED_CHANNELS = 30
+
+CHANNEL_GUIDE_RULES = """**CHANNEL ACCESS RULES:**
+- "open to all users" = ANYONE can write messages there, no special roles needed
+- "read only" = users can ONLY read, cannot post messages (official announcements, etc.)
+
+**NEVER give wrong info about channels:**
+- NEVER say a channel requires special roles if it's marked "open to all users"
+- NEVER suggest users can post in "read only" channels
+- when directing users to a channel, mention if they can post there or just read"""
+
+CONTEXT_RULES = """**CRITICAL RULES for using retrieved information** (sent as a separate message when available):
+- If context contains URLs/links - use them EXACTLY as provided, don't make up alternatives
+- If context contains specific facts (APY, fees, features) - use the exact numbers/details
+- Only say "I don't know" if the context truly doesn't have the answer
+- Never guess or make up information when precise details are in the context"""
+
+
+def format_channel_list(guild: discord.Guild) -> str:
+    """Channels the bot can see, in server order."""
+    channel_ids = get_channel_index().visible_text_channels(guild)
+    return ", ".join(f"<#{cid}>" for cid in channel_ids[:MAX_LISTED_CHANNELS])
+
+
+class PromptPrefixCache:
+    """
+    Static system prompt prefix per (agent, guild).
+
+    Usage:
+        prefix = get_prompt_prefix_cache().get(agent_name, system_prompt, guild)
+        get_prompt_prefix_cache().invalidate(guild.id)  # channel events
+    """
+
+    def __init__(self):
+        self._prefixes: Dict[Tuple[str, Optional[int]], str] = {}
+        self.stats = {"hits": 0, "builds": 0, "invalidations": 0}
+
+    def get(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        guild: Optional[discord.Guild] = None,
+    ) -> str:
+        """
+        Get the static prefix, building it on first use.
+
+        Args:
+            agent_name: Agent name
+            system_prompt: Agent persona prompt
+            guild: Guild the message came from (None for DMs)
+
+        Returns:
+            System prompt prefix (byte-identical until invalidated)
+        """
+        key = (agent_name, guild.id if guild else None)
+        prefix = self._prefixes.get(key)
+        if prefix is not None:
+            self.stats["hits"] += 1
+            return prefix
+
+        prefix = self._build(system_prompt, guild)
+        self._prefixes[key] = prefix
+        self.stats["builds"] += 1
+
+        logger.debug(
+            "prompt_prefix_built",
+            agent=agent_name,
+            guild_id=key[1],
+            chars=len(prefix),
+            prefix_hash=hashlib.sha1(prefix.encode("utf-8")).hexdigest()[:12],
+        )
+        return prefix
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        """
+        Drop cached prefixes.
+
+        Args:
+            guild_id: Guild whose channels changed (None = all guilds)
+        """
+        if guild_id is None:
+            self._prefixes.clear()
+        else:
+            for key in [k for k in self._prefixes if k[1] == guild_id]:
+                del self._prefixes[key]
+        self.stats["invalidations"] += 1
+
+    def _build(self, system_prompt: str, guild: Optional[discord.Guild]) -> str:
+        parts = [system_prompt]
+
+        # Channel info only applies to server messages
+        if guild:
+            channel_list = format_channel_list(guild)
+            if channel_list:
+                parts.append(
+                    f"**available server channels (use exact names when mentioning):**\n{channel_list}"
+                )
+
+            purposes = get_channel_purposes()
+            if purposes:
+                purposes_text = "\n".join(f"<#{cid}>: {desc}" for cid, desc in purposes.items())
+                parts.append(
+                    f"**CHANNEL GUIDE (CRITICAL - follow these rules strictly):**\n{purposes_text}"
+                    f"\n\n{CHANNEL_GUIDE_RULES}"
+                )
+
+        parts.append(CONTEXT_RULES)
+        return "\n\n".join(parts)
+
+
+def build_context_message(context: str) -> Dict[str, Any]:
+    """Volatile per-request context, placed after the cacheable prefix."""
+    return {
+        "role": "system",
+        "content": f"**IMPORTANT - Use this retrieved information to answer:**\n\n{context}",
+    }
+
+
+def build_user_message(query: str, message: Optional[discord.Message] = None) -> Dict[str, Any]:
+    """Current query, with image attachments and stickers if present."""
+    if not message or not (message.attachments or message.stickers):
+        return {"role": "user", "content": query}
+
+    content: List[Dict[str, Any]] = [{"type": "text", "text": query}]
+
+    for attachment in message.attachments:
+        if attachment.content_type and attachment.content_type.startswith("image/"):
+            content.append({"type": "image_url", "image_url": {"url": attachment.url}})
+
+    # Stickers have URLs too
+    for sticker in message.stickers:
+        if getattr(sticker, "url", None):
+            content.append({"type": "image_url", "image_url": {"url": sticker.url}})
+
+    return {"role": "user", "content": content}
+
+
+# Singleton instance
+_prefix_cache: Optional[PromptPrefixCache] = None
+
+
+def get_prompt_prefix_cache() -> PromptPrefixCache:
+    """Get singleton prompt prefix cache."""
+    global _prefix_cache
+    if _prefix_cache is None:
+        _prefix_cache = PromptPrefixCache()
+    return _prefix_cache
@@ -312,40 +312,49 @@ class ActivityChecker:
             "gm gm! ☀️ haven't heard from you in a bit. hope life's treating you well. we're here when you're ready",
         ]
         
-        success_count = 0
-        fail_count = 0
+        from src.bot.bulk_actions import BulkAction, BulkActionExecutor
         
-        for user_data in inactive_users:
-            member = user_data["member"]
-            message_count = user_data["message_count"]
-            
-            try:
+        def make_dm_action(member: discord.Member, message_count: int):
+            async def send_dm():
                 # Pick a random message
                 dm_text = random.choice(dm_messages)
                 
                 # Add context about activity
                 dm_text += f"\n\n*ps: you've sent {message_count} messages in the last {days} days. no judgment, just keeping track* 📊"
                 
-                # Try to send DM
-                await member.send(dm_text)
+                try:
+                    await member.send(dm_text)
+                except discord.Forbidden:
+                    # User has DMs disabled
+                    logger.debug(
+                        f"dm_forbidden | user={member.name} | dms_closed"
+                    )
+                    raise
                 
                 logger.info(
                     f"📨 DM_SENT | @{member.name} ({member.id}) | msgs={message_count}"
                 )
-                success_count += 1
-                
-            except discord.Forbidden:
-                # User has DMs disabled
-                logger.debug(
-                    f"dm_forbidden | user={member.name} | dms_closed"
-                )
-                fail_count += 1
-                
-            except Exception as e:
-                logger.error(
-                    f"dm_failed | user={member.name} | error={e}"
-                )
-                fail_count += 1
+            
+            return send_dm
+        
+        actions = [
+            BulkAction(
+                bucket="dm",
+                run=make_dm_action(user_data["member"], user_data["message_count"]),
+                key=str(user_data["member"].id),
+            )
+            for user_data in inactive_users
+        ]
+        
+        # DMs run through the bulk executor (concurrent up to the DM bucket limit, 429-aware)
+        result = await BulkActionExecutor().run(actions)
+        
+        success_count = result.succeeded
+        fail_count = result.failed
+        
+        for error in result.errors:
+            if "Forbidden" not in error:
+                logger.error(f"dm_failed | {error}")
         
         logger.info(
             f"📬 DM_SUMMARY | sent={success_count} | failed={fail_count} | total={len(inactive_users)}"
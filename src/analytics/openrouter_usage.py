@@ -0,0 +1,291 @@
+"""
+OpenRouter credits/analytics snapshot.
+
+/usage used to call the credits and activity endpoints on every
+invocation. A background task now refreshes both on an interval; the
+activity response is reduced to per-day, per-model totals once per
+refresh and the snapshot is persisted (data/openrouter_usage.json) so
+/usage is served locally, even right after a restart.
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+from src.utils import get_config, get_logger
+
+logger = get_logger(__name__)
+
+CREDITS_URL = "https://openrouter.ai/api/v1/credits"
+ACTIVITY_URL = "https://openrouter.ai/api/v1/activity"
+
+DEFAULT_SNAPSHOT_PATH = Path("data/openrouter_usage.json")
+
+_TOTAL_KEYS = ("requests", "prompt_tokens", "completion_tokens", "reasoning_tokens", "cost_usd")
+
+
+class OpenRouterUsage:
+    """
+    Periodically refreshed OpenRouter credits and activity.
+
+    Usage:
+        usage = get_openrouter_usage()
+        usage.start()
+        ...
+        credits = usage.credits
+        stats = usage.get_analytics(days=7)
+        await usage.refresh(force=True)  # admin-requested refresh
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        provisioning_key: Optional[str] = None,
+        refresh_interval: float = 600.0,
+        min_force_interval: float = 60.0,
+        snapshot_path: Optional[Path] = DEFAULT_SNAPSHOT_PATH,
+    ):
+        """
+        Initialize snapshot.
+
+        Args:
+            api_key: OpenRouter API key (credits endpoint)
+            provisioning_key: Provisioning key (activity endpoint; None = credits only)
+            refresh_interval: Seconds between background refreshes
+            min_force_interval: Forced refreshes within this many seconds reuse the snapshot
+            snapshot_path: File the last snapshot is persisted to (None = memory only)
+        """
+        self.api_key = api_key
+        self.provisioning_key = provisioning_key
+        self.refresh_interval = refresh_interval
+        self.min_force_interval = min_force_interval
+        self.snapshot_path = snapshot_path
+
+        self.credits: Optional[Dict] = None
+        # {date: {model: {requests, prompt_tokens, completion_tokens, reasoning_tokens, cost_usd}}}
+        self.daily: Optional[Dict[str, Dict[str, Dict]]] = None
+        self.fetched_at: Optional[float] = None
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._aggregates: Dict[int, Dict] = {}  # days -> aggregate for the current snapshot
+
+        self.stats = {"refreshes": 0, "failures": 0, "forced": 0}
+
+        self._load_snapshot()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh."""
+        return time.time() - self.fetched_at if self.fetched_at else None
+
+    def start(self):
+        """Start the background refresher (call from the loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Stop the refresher and close the HTTP client."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Fetch credits and activity.
+
+        Concurrent callers share one refresh; forced refreshes are
+        rate-limited by min_force_interval.
+
+        Args:
+            force: Refresh even if the snapshot is younger than refresh_interval
+
+        Returns:
+            True if the snapshot was updated
+        """
+        started = time.time()
+        async with self._lock:
+            # Someone else refreshed while we waited for the lock
+            if self.fetched_at and self.fetched_at >= started:
+                return True
+            min_age = self.min_force_interval if force else self.refresh_interval
+            if self.age is not None and self.age < min_age:
+                return False
+            if force:
+                self.stats["forced"] += 1
+
+            credits, daily = await asyncio.gather(self._fetch_credits(), self._fetch_activity())
+            if credits is None and daily is None:
+                self.stats["failures"] += 1
+                return False
+
+            # Keep the previous value for whichever endpoint failed
+            if credits is not None:
+                self.credits = credits
+            if daily is not None:
+                self.daily = daily
+            self.fetched_at = time.time()
+            self._aggregates.clear()
+            self.stats["refreshes"] += 1
+
+        await self._save_snapshot()
+        return True
+
+    def get_analytics(self, days: int = 30) -> Optional[Dict]:
+        """
+        Aggregate the snapshot over the last N days (max 30).
+
+        Returns:
+            Dict with totals and per-model breakdown, or None without activity data
+        """
+        if self.daily is None:
+            return None
+
+        cached = self._aggregates.get(days)
+        if cached is not None:
+            return cached
+
+        cutoff = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+        totals = dict.fromkeys(_TOTAL_KEYS, 0)
+        by_model: Dict[str, Dict] = {}
+        for date, models in self.daily.items():
+            if days > 0 and date < cutoff:
+                continue
+            for model, values in models.items():
+                model_totals = by_model.setdefault(model, dict.fromkeys(_TOTAL_KEYS, 0))
+                for key in _TOTAL_KEYS:
+                    model_totals[key] += values.get(key, 0)
+                    totals[key] += values.get(key, 0)
+
+        stats = {
+            "total_requests": totals["requests"],
+            "total_prompt_tokens": totals["prompt_tokens"],
+            "total_completion_tokens": totals["completion_tokens"],
+            "total_reasoning_tokens": totals["reasoning_tokens"],
+            "total_cost_usd": totals["cost_usd"],
+            "by_model": by_model,
+        }
+        self._aggregates[days] = stats
+        return stats
+
+    def snapshot(self) -> Dict:
+        """Refresher stats for metrics."""
+        return {**self.stats, "age_seconds": self.age if self.age is not None else -1}
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.stats["failures"] += 1
+                logger.error("openrouter_usage_refresh_error", error=str(e))
+            await asyncio.sleep(self.refresh_interval)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+
+    async def _fetch_credits(self) -> Optional[Dict]:
+        try:
+            response = await self._get_client().get(
+                CREDITS_URL,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            logger.error("openrouter_credits_fetch_failed", error=str(e))
+            return None
+
+        return {
+            "total_credits": data.get("total_credits", 0),
+            "credits_used": data.get("credits_used", 0),
+            "credits_remaining": data.get("credits_remaining", 0),
+        }
+
+    async def _fetch_activity(self) -> Optional[Dict[str, Dict[str, Dict]]]:
+        """Fetch activity and reduce it to per-day, per-model totals."""
+        if not self.provisioning_key:
+            return None
+
+        try:
+            response = await self._get_client().get(
+                ACTIVITY_URL,
+                headers={"Authorization": f"Bearer {self.provisioning_key}"},
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            logger.error("openrouter_analytics_fetch_failed", error=str(e))
+            return None
+
+        daily: Dict[str, Dict[str, Dict]] = {}
+        for item in data.get("data", []):
+            # "YYYY-MM-DD" or "YYYY-MM-DD HH:MM:SS"
+            date = item["date"].split()[0]
+            model = item.get("model", "unknown")
+            values = daily.setdefault(date, {}).setdefault(model, dict.fromkeys(_TOTAL_KEYS, 0))
+            values["requests"] += int(item.get("requests", 0))
+            values["prompt_tokens"] += int(item.get("prompt_tokens", 0))
+            values["completion_tokens"] += int(item.get("completion_tokens", 0))
+            values["reasoning_tokens"] += int(item.get("reasoning_tokens", 0))
+            values["cost_usd"] += float(item.get("usage", 0))  # usage is already in USD
+        return daily
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return
+        try:
+            data = json.loads(self.snapshot_path.read_text())
+            self.credits = data.get("credits")
+            self.daily = data.get("daily")
+            self.fetched_at = data.get("fetched_at")
+        except (OSError, ValueError) as e:
+            logger.warning("openrouter_usage_snapshot_unreadable", error=str(e))
+
+    async def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        payload = json.dumps({
+            "fetched_at": self.fetched_at,
+            "credits": self.credits,
+            "daily": self.daily,
+        })
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(self.snapshot_path.write_text, payload)
+        except OSError as e:
+            logger.warning("openrouter_usage_snapshot_save_failed", error=str(e))
+
+
+# Singleton instance
+_usage: Optional[OpenRouterUsage] = None
+
+
+def get_openrouter_usage() -> OpenRouterUsage:
+    """Get singleton OpenRouter usage snapshot (configured from llm and monitoring.openrouter_usage)."""
+    global _usage
+    if _usage is None:
+        config = get_config()
+        settings = config.monitoring.openrouter_usage
+        _usage = OpenRouterUsage(
+            api_key=config.llm.api_key,
+            provisioning_key=config.llm.provisioning_key,
+            refresh_interval=settings.get("refresh_interval", 600),
+            min_force_interval=settings.get("min_force_interval", 60),
+        )
+    return _usage
@@ -1,18 +1,35 @@
 """
 Usage statistics tracker for LLM API calls.
 
-Tracks token usage, costs, and provides analytics.
+Every completion is appended to a SQLite ledger (data/usage.db) with its
+model, purpose (chat, routing, scam_analysis, caption, ...), tokens, cost
+and latency. `track_request` only appends to an in-memory buffer; a
+background writer flushes the buffer in batches and maintains daily
+rollups in the same transaction. Queries run in a worker thread.
 """
 
+import asyncio
+import atexit
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
-import json
+from typing import Dict, List, Optional, Tuple
 
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_DB_PATH = Path("data/usage.db")
+LEGACY_STATS_PATH = Path("data/usage_stats.json")
+
+# (ts, model, purpose, prompt, completion, cached, cost, cache_savings, latency_ms)
+LedgerRow = Tuple[float, str, str, int, int, int, float, float, float]
+
+BREAKDOWNS = ("purpose", "model", "day")
+
 
 class UsageStats:
     """Usage statistics container."""
@@ -24,7 +41,9 @@ class UsageStats:
         self.total_cached_tokens: int = 0
         self.total_cost_usd: float = 0.0
         self.cache_savings_usd: float = 0.0
+        self.avg_latency_ms: float = 0.0
         self.by_model: Dict[str, Dict] = {}
+        self.by_purpose: Dict[str, Dict] = {}
         self.period_start: datetime = datetime.utcnow()
         self.period_end: datetime = datetime.utcnow()
     
@@ -37,7 +56,9 @@ class UsageStats:
             "total_cached_tokens": self.total_cached_tokens,
             "total_cost_usd": round(self.total_cost_usd, 4),
             "cache_savings_usd": round(self.cache_savings_usd, 4),
+            "avg_latency_ms": round(self.avg_latency_ms, 1),
             "by_model": self.by_model,
+            "by_purpose": self.by_purpose,
             "period_start": self.period_start.isoformat(),
             "period_end": self.period_end.isoformat(),
         }
@@ -48,11 +69,17 @@ class UsageTracker:
     Track LLM usage statistics across all requests.
     
     Features:
-    - Real-time tracking
-    - Per-model statistics
+    - Append-only ledger (one row per request) with daily rollups
+    - Buffered writes: no disk I/O on the request path
+    - Arbitrary time windows and per-purpose/model/day breakdowns in SQL
     - Cost calculation with correct Grok-4-Fast pricing
     - Cache savings tracking
-    - Persistent storage
+    
+    Usage:
+        tracker = get_usage_tracker()
+        tracker.track_request(model, prompt_tokens, completion_tokens, purpose="routing")
+        stats = await tracker.get_stats(window=timedelta(hours=6))
+        await tracker.close()  # flush on shutdown
     """
     
     # Grok-4-Fast pricing (per 1M tokens)
@@ -66,57 +93,116 @@ class UsageTracker:
         }
     }
     
-    def __init__(self, storage_path: str = "data/usage_stats.json"):
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        flush_interval: float = 5.0,
+        max_buffer: int = 200,
+        legacy_path: Optional[Path] = LEGACY_STATS_PATH,
+    ):
         """
         Initialize usage tracker.
         
         Args:
-            storage_path: Path to store usage statistics
+            db_path: SQLite ledger path
+            flush_interval: Seconds between background flushes
+            max_buffer: Buffered rows that trigger an early flush
+            legacy_path: Old JSON totals imported into an empty ledger
         """
-        self.storage_path = Path(storage_path)
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
         
-        # Load existing stats or create new
-        self.all_time_stats = self._load_stats()
-        self.daily_stats: Dict[str, UsageStats] = {}
+        self._buffer: List[LedgerRow] = []
+        self._writer_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
         
-        # Silent init
-    
-    def _load_stats(self) -> UsageStats:
-        """Load statistics from disk."""
-        if not self.storage_path.exists():
-            return UsageStats()
+        self._init_tables()
+        if legacy_path:
+            self._import_legacy(Path(legacy_path))
         
-        try:
-            with open(self.storage_path, 'r') as f:
-                data = json.load(f)
-            
-            stats = UsageStats()
-            stats.total_requests = data.get("total_requests", 0)
-            stats.total_prompt_tokens = data.get("total_prompt_tokens", 0)
-            stats.total_completion_tokens = data.get("total_completion_tokens", 0)
-            stats.total_cached_tokens = data.get("total_cached_tokens", 0)
-            stats.total_cost_usd = data.get("total_cost_usd", 0.0)
-            stats.cache_savings_usd = data.get("cache_savings_usd", 0.0)
-            stats.by_model = data.get("by_model", {})
-            
-            if "period_start" in data:
-                stats.period_start = datetime.fromisoformat(data["period_start"])
-            if "period_end" in data:
-                stats.period_end = datetime.fromisoformat(data["period_end"])
-            
-            return stats
-        except Exception as e:
-            logger.error("failed_to_load_usage_stats", error=str(e))
-            return UsageStats()
+        # Scripts that end with asyncio.run() never call close()
+        atexit.register(self._flush_at_exit)
     
-    def _save_stats(self):
-        """Save statistics to disk."""
+    @contextmanager
+    def _get_connection(self):
+        """Get database connection with context manager."""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(self.all_time_stats.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.error("failed_to_save_usage_stats", error=str(e))
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def _init_tables(self):
+        """Create ledger and rollup tables."""
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS usage_ledger (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    model TEXT NOT NULL,
+                    purpose TEXT NOT NULL,
+                    prompt_tokens INTEGER NOT NULL,
+                    completion_tokens INTEGER NOT NULL,
+                    cached_tokens INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    cache_savings_usd REAL NOT NULL,
+                    latency_ms REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_ledger_ts ON usage_ledger(ts)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS usage_daily (
+                    day TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    purpose TEXT NOT NULL,
+                    requests INTEGER NOT NULL,
+                    prompt_tokens INTEGER NOT NULL,
+                    completion_tokens INTEGER NOT NULL,
+                    cached_tokens INTEGER NOT NULL,
+                    cost_usd REAL NOT NULL,
+                    cache_savings_usd REAL NOT NULL,
+                    latency_ms REAL NOT NULL,
+                    PRIMARY KEY (day, model, purpose)
+                )
+            """)
+    
+    def _import_legacy(self, path: Path):
+        """Carry the old JSON totals over as one "legacy" rollup row per model."""
+        if not path.exists():
+            return
+        with self._get_connection() as conn:
+            if conn.execute("SELECT 1 FROM usage_daily LIMIT 1").fetchone():
+                return
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning("legacy_usage_stats_unreadable", error=str(e))
+                return
+            
+            day = data.get("period_start", datetime.utcnow().isoformat())[:10]
+            for model, stats in data.get("by_model", {}).items():
+                conn.execute(
+                    "INSERT INTO usage_daily VALUES (?, ?, 'legacy', ?, ?, ?, ?, ?, ?, 0)",
+                    (
+                        day, model,
+                        stats.get("requests", 0),
+                        stats.get("prompt_tokens", 0),
+                        stats.get("completion_tokens", 0),
+                        stats.get("cached_tokens", 0),
+                        stats.get("cost_usd", 0.0),
+                        stats.get("cache_savings_usd", 0.0),
+                    ),
+                )
+        logger.info("legacy_usage_stats_imported", path=str(path))
     
     def _calculate_cost(
         self,
@@ -176,9 +262,11 @@ class UsageTracker:
         completion_tokens: int,
         cached_tokens: int = 0,
         cost_usd: Optional[float] = None,
+        purpose: str = "chat",
+        latency_ms: float = 0.0,
     ):
         """
-        Track a single LLM request.
+        Track a single LLM request (buffered; flushed by the background writer).
         
         Args:
             model: Model name
@@ -186,8 +274,9 @@ class UsageTracker:
             completion_tokens: Number of completion tokens
             cached_tokens: Number of cached tokens
             cost_usd: Actual cost (if provided by API)
+            purpose: Caller tag (chat, routing, scam_analysis, caption, ...)
+            latency_ms: Request latency
         """
-        # Calculate cost
         calculated_cost, cache_savings = self._calculate_cost(
             model=model,
             prompt_tokens=prompt_tokens,
@@ -198,97 +287,212 @@ class UsageTracker:
         # Use provided cost if available, otherwise use calculated
         final_cost = cost_usd if cost_usd is not None else calculated_cost
         
-        # Update all-time stats
-        self.all_time_stats.total_requests += 1
-        self.all_time_stats.total_prompt_tokens += prompt_tokens
-        self.all_time_stats.total_completion_tokens += completion_tokens
-        self.all_time_stats.total_cached_tokens += cached_tokens
-        self.all_time_stats.total_cost_usd += final_cost
-        self.all_time_stats.cache_savings_usd += cache_savings
-        self.all_time_stats.period_end = datetime.utcnow()
-        
-        # Update per-model stats
-        if model not in self.all_time_stats.by_model:
-            self.all_time_stats.by_model[model] = {
-                "requests": 0,
-                "prompt_tokens": 0,
-                "completion_tokens": 0,
-                "cached_tokens": 0,
-                "cost_usd": 0.0,
-                "cache_savings_usd": 0.0,
-            }
-        
-        model_stats = self.all_time_stats.by_model[model]
-        model_stats["requests"] += 1
-        model_stats["prompt_tokens"] += prompt_tokens
-        model_stats["completion_tokens"] += completion_tokens
-        model_stats["cached_tokens"] += cached_tokens
-        model_stats["cost_usd"] += final_cost
-        model_stats["cache_savings_usd"] += cache_savings
-        
-        # Update daily stats
-        today = datetime.utcnow().date().isoformat()
-        if today not in self.daily_stats:
-            self.daily_stats[today] = UsageStats()
-        
-        daily = self.daily_stats[today]
-        daily.total_requests += 1
-        daily.total_prompt_tokens += prompt_tokens
-        daily.total_completion_tokens += completion_tokens
-        daily.total_cached_tokens += cached_tokens
-        daily.total_cost_usd += final_cost
-        daily.cache_savings_usd += cache_savings
+        self._buffer.append((
+            time.time(), model, purpose,
+            prompt_tokens, completion_tokens, cached_tokens,
+            final_cost, cache_savings, latency_ms,
+        ))
+        self._ensure_writer()
+        if self._wake and len(self._buffer) >= self.max_buffer:
+            self._wake.set()
+    
+    # ─────────────────────────────────────────────────────────────────────
+    # Writer
+    # ─────────────────────────────────────────────────────────────────────
+    
+    def _ensure_writer(self):
+        """Start the background writer on first use inside a running loop."""
+        if self._writer_task is not None and not self._writer_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (scripts): rows stay buffered until flush()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer_task = loop.create_task(self._writer_loop())
+    
+    async def _writer_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("usage_ledger_flush_failed", error=str(e), buffered=len(self._buffer))
+    
+    async def flush(self):
+        """Write buffered rows to the ledger."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            try:
+                await asyncio.to_thread(self._write_rows, rows)
+            except Exception:
+                self._buffer[:0] = rows  # Keep for the next attempt
+                raise
+    
+    def _write_rows(self, rows: List[LedgerRow]):
+        """Insert rows and update daily rollups in one transaction."""
+        with self._get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO usage_ledger (
+                    ts, model, purpose, prompt_tokens, completion_tokens,
+                    cached_tokens, cost_usd, cache_savings_usd, latency_ms
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            conn.executemany(
+                """
+                INSERT INTO usage_daily VALUES (
+                    date(?, 'unixepoch'), ?, ?, 1, ?, ?, ?, ?, ?, ?
+                )
+                ON CONFLICT (day, model, purpose) DO UPDATE SET
+                    requests = requests + 1,
+                    prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                    completion_tokens = completion_tokens + excluded.completion_tokens,
+                    cached_tokens = cached_tokens + excluded.cached_tokens,
+                    cost_usd = cost_usd + excluded.cost_usd,
+                    cache_savings_usd = cache_savings_usd + excluded.cache_savings_usd,
+                    latency_ms = latency_ms + excluded.latency_ms
+                """,
+                rows,
+            )
+    
+    async def close(self):
+        """Stop the writer and flush remaining rows."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        await self.flush()
+    
+    def _flush_at_exit(self):
+        """Write whatever is still buffered when the interpreter exits."""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        try:
+            self._write_rows(rows)
+        except Exception as e:
+            logger.error("usage_ledger_exit_flush_failed", error=str(e), rows=len(rows))
+    
+    # ─────────────────────────────────────────────────────────────────────
+    # Queries
+    # ─────────────────────────────────────────────────────────────────────
+    
+    async def get_stats(self, window: Optional[timedelta] = timedelta(days=30)) -> UsageStats:
+        """
+        Get usage statistics for a time window.
         
-        # Save to disk
-        self._save_stats()
+        Args:
+            window: Time window ending now (None = all time, incl. imported legacy totals)
         
-        logger.debug(
-            "usage_tracked",
-            model=model,
-            prompt_tokens=prompt_tokens,
-            completion_tokens=completion_tokens,
-            cached_tokens=cached_tokens,
-            cost_usd=round(final_cost, 6),
-            cache_savings_usd=round(cache_savings, 6),
-        )
+        Returns:
+            UsageStats object with per-model and per-purpose breakdowns
+        """
+        await self.flush()
+        return await asyncio.to_thread(self._query_stats, window)
     
-    def get_stats(self, days: int = 30) -> UsageStats:
+    async def get_breakdown(
+        self,
+        by: str = "purpose",
+        window: Optional[timedelta] = timedelta(days=30),
+    ) -> Dict[str, Dict]:
         """
-        Get usage statistics for the last N days.
+        Get usage grouped by purpose, model or day.
         
         Args:
-            days: Number of days to include (0 = all time)
+            by: "purpose", "model" or "day"
+            window: Time window ending now (None = all time)
         
         Returns:
-            UsageStats object
+            {group: {requests, prompt_tokens, ..., cost_usd}} sorted by cost
         """
-        if days == 0:
-            return self.all_time_stats
+        if by not in BREAKDOWNS:
+            raise ValueError(f"Unknown breakdown: {by}")
+        await self.flush()
+        return await asyncio.to_thread(self._query_breakdown, by, window)
+    
+    def _source(self, window: Optional[timedelta], by: Optional[str] = None) -> Tuple[str, str, tuple]:
+        """(FROM/WHERE clause, request count expression, params) for a window."""
+        if window is None or by == "day":
+            # Rollups: all time, or whole days for the daily series
+            if window is None:
+                return "usage_daily", "SUM(requests)", ()
+            since = (datetime.utcnow() - window).date().isoformat()
+            return "usage_daily WHERE day >= ?", "SUM(requests)", (since,)
+        return "usage_ledger WHERE ts >= ?", "COUNT(*)", (time.time() - window.total_seconds(),)
+    
+    def _query_breakdown(self, by: str, window: Optional[timedelta]) -> Dict[str, Dict]:
+        source, requests, params = self._source(window, by)
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT {by} AS grp,
+                       {requests} AS requests,
+                       SUM(prompt_tokens) AS prompt_tokens,
+                       SUM(completion_tokens) AS completion_tokens,
+                       SUM(cached_tokens) AS cached_tokens,
+                       SUM(cost_usd) AS cost_usd,
+                       SUM(cache_savings_usd) AS cache_savings_usd,
+                       SUM(latency_ms) AS latency_ms
+                FROM {source}
+                GROUP BY grp
+                ORDER BY {"grp DESC" if by == "day" else "cost_usd DESC, requests DESC"}
+                """,
+                params,
+            ).fetchall()
         
-        # Aggregate daily stats for the period
-        cutoff_date = (datetime.utcnow() - timedelta(days=days)).date()
-        period_stats = UsageStats()
-        period_stats.period_start = datetime.combine(cutoff_date, datetime.min.time())
-        period_stats.period_end = datetime.utcnow()
+        breakdown = {}
+        for row in rows:
+            values = dict(row)
+            group = values.pop("grp")
+            latency_total = values.pop("latency_ms") or 0.0
+            values["avg_latency_ms"] = latency_total / values["requests"] if values["requests"] else 0.0
+            breakdown[group] = values
+        return breakdown
+    
+    def _query_stats(self, window: Optional[timedelta]) -> UsageStats:
+        stats = UsageStats()
+        stats.by_model = self._query_breakdown("model", window)
+        stats.by_purpose = self._query_breakdown("purpose", window)
         
-        for date_str, stats in self.daily_stats.items():
-            date = datetime.fromisoformat(date_str).date()
-            if date >= cutoff_date:
-                period_stats.total_requests += stats.total_requests
-                period_stats.total_prompt_tokens += stats.total_prompt_tokens
-                period_stats.total_completion_tokens += stats.total_completion_tokens
-                period_stats.total_cached_tokens += stats.total_cached_tokens
-                period_stats.total_cost_usd += stats.total_cost_usd
-                period_stats.cache_savings_usd += stats.cache_savings_usd
+        for values in stats.by_model.values():
+            stats.total_requests += values["requests"]
+            stats.total_prompt_tokens += values["prompt_tokens"]
+            stats.total_completion_tokens += values["completion_tokens"]
+            stats.total_cached_tokens += values["cached_tokens"]
+            stats.total_cost_usd += values["cost_usd"]
+            stats.cache_savings_usd += values["cache_savings_usd"]
         
-        return period_stats
-    
-    def reset_stats(self):
-        """Reset all statistics."""
-        self.all_time_stats = UsageStats()
-        self.daily_stats = {}
-        self._save_stats()
-        logger.info("usage_stats_reset")
+        # Imported legacy totals carry no latency
+        latency_total = 0.0
+        latency_requests = 0
+        for purpose, values in stats.by_purpose.items():
+            if purpose == "legacy":
+                continue
+            latency_total += values["avg_latency_ms"] * values["requests"]
+            latency_requests += values["requests"]
+        if latency_requests:
+            stats.avg_latency_ms = latency_total / latency_requests
+        
+        stats.period_end = datetime.utcnow()
+        if window is not None:
+            stats.period_start = stats.period_end - window
+        else:
+            with self._get_connection() as conn:
+                first_day = conn.execute("SELECT MIN(day) FROM usage_daily").fetchone()[0]
+            if first_day:
+                stats.period_start = datetime.fromisoformat(first_day)
+        return stats
 
 
 # Global singleton
@@ -301,3 +505,9 @@ def get_usage_tracker() -> UsageTracker:
     if _usage_tracker is None:
         _usage_tracker = UsageTracker()
     return _usage_tracker
+
+
+async def flush_usage_tracker():
+    """Flush buffered ledger rows if the tracker was ever created."""
+    if _usage_tracker is not None:
+        await _usage_tracker.flush()
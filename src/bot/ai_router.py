@@ -85,6 +85,7 @@ Analyze the user's query and route to general_agent."""
                 messages=messages,
                 response_model=AgentRoute,
                 temperature=0.1,  # Low temperature for consistent routing
+                purpose="routing",
             )
             
             logger.info(
@@ -0,0 +1,257 @@
+"""
+Rate-limit-aware bulk executor for Discord actions.
+
+Bulk operations (react to 1000 messages, ban across guilds, DM inactive
+users) used to await one API call at a time, paying a full round-trip per
+call and running far below what Discord allows. The executor groups
+actions by rate-limit bucket and runs each bucket with its own
+concurrency, so independent buckets (different channels/guilds) proceed
+in parallel and each bucket stays saturated without overrunning it.
+
+- Buckets: "reactions:<channel_id>", "bans:<guild_id>", "dm", ...
+  Concurrency is looked up by bucket prefix ("reactions", "bans", "dm")
+- 429s: discord.py already sleeps and retries rate-limited requests itself;
+  only a 429 it gives up on reaches the executor, which then pauses the
+  whole bucket for Retry-After and retries the action
+- Progress: optional async callback, throttled
+- Resume/cancel: completed action keys are returned and can be passed back
+  as `skip_keys`; cancel() stops scheduling new actions
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import discord
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Concurrent requests per bucket, by bucket prefix
+DEFAULT_BUCKET_CONCURRENCY = {
+    "reactions": 4,  # Per channel
+    "bans": 4,  # Per guild
+    "dm": 2,  # DM channel creation is globally limited
+}
+
+
+@dataclass
+class BulkAction:
+    """Single Discord API operation."""
+    bucket: str
+    run: Callable[[], Awaitable[Any]]
+    key: str = ""  # Stable ID for resume (e.g. message ID)
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk run."""
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    rate_limited: int = 0
+    cancelled: bool = False
+    completed_keys: Set[str] = field(default_factory=set)
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+ProgressCallback = Callable[[BulkResult], Awaitable[None]]
+
+
+class _Bucket:
+    """Per-bucket queue, concurrency and rate-limit pause."""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue: List[BulkAction] = []
+        self.paused_until = 0.0
+
+
+class BulkActionExecutor:
+    """
+    Executes Discord actions grouped by rate-limit bucket.
+
+    Usage:
+        executor = BulkActionExecutor()
+        actions = [BulkAction(f"reactions:{ch.id}", partial(msg.add_reaction, "✅"), str(msg.id))]
+        result = await executor.run(actions, progress_callback=on_progress)
+    """
+
+    def __init__(
+        self,
+        bucket_concurrency: Optional[Dict[str, int]] = None,
+        default_concurrency: int = 1,
+        max_retries: int = 3,
+        progress_interval: float = 2.0,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            bucket_concurrency: Concurrency per bucket prefix
+            default_concurrency: Concurrency for unknown buckets
+            max_retries: Retries per action after a 429
+            progress_interval: Min seconds between progress callbacks
+        """
+        self.bucket_concurrency = {**DEFAULT_BUCKET_CONCURRENCY, **(bucket_concurrency or {})}
+        self.default_concurrency = default_concurrency
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+
+        self._cancelled = False
+
+    def cancel(self):
+        """Stop scheduling new actions (in-flight ones finish)."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    async def run(
+        self,
+        actions: Iterable[BulkAction],
+        skip_keys: Optional[Set[str]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> BulkResult:
+        """
+        Run actions, each bucket at its own concurrency.
+
+        Args:
+            actions: Actions to run (order is kept within a bucket)
+            skip_keys: Keys completed by a previous run (resume)
+            progress_callback: Awaited periodically with the running result
+
+        Returns:
+            BulkResult
+        """
+        self._cancelled = False
+        skip_keys = skip_keys or set()
+        result = BulkResult(completed_keys=set(skip_keys))
+        started = time.monotonic()
+
+        buckets: Dict[str, _Bucket] = {}
+        for action in actions:
+            result.total += 1
+            if action.key and action.key in skip_keys:
+                result.skipped += 1
+                continue
+
+            bucket = buckets.get(action.bucket)
+            if bucket is None:
+                prefix = action.bucket.split(":", 1)[0]
+                bucket = _Bucket(
+                    action.bucket,
+                    self.bucket_concurrency.get(prefix, self.default_concurrency),
+                )
+                buckets[action.bucket] = bucket
+            bucket.queue.append(action)
+
+        last_progress = 0.0
+
+        async def report_progress(force: bool = False):
+            nonlocal last_progress
+            if not progress_callback:
+                return
+            now = time.monotonic()
+            if not force and now - last_progress < self.progress_interval:
+                return
+            last_progress = now
+            result.elapsed = now - started
+            try:
+                await progress_callback(result)
+            except Exception as e:
+                logger.debug("bulk_progress_callback_failed", error=str(e))
+
+        async def worker(bucket: _Bucket):
+            while bucket.queue and not self._cancelled:
+                action = bucket.queue.pop(0)
+                await self._execute(bucket, action, result)
+                await report_progress()
+
+        workers = [
+            worker(bucket)
+            for bucket in buckets.values()
+            for _ in range(min(bucket.concurrency, len(bucket.queue)))
+        ]
+        await asyncio.gather(*workers)
+
+        result.cancelled = self._cancelled
+        result.elapsed = time.monotonic() - started
+        await report_progress(force=True)
+
+        logger.info(
+            "bulk_actions_completed",
+            buckets=len(buckets),
+            total=result.total,
+            succeeded=result.succeeded,
+            failed=result.failed,
+            skipped=result.skipped,
+            rate_limited=result.rate_limited,
+            cancelled=result.cancelled,
+            per_second=round(result.per_second, 2),
+        )
+        return result
+
+    async def _execute(self, bucket: _Bucket, action: BulkAction, result: BulkResult):
+        """Run one action, pausing the bucket on 429s."""
+        for attempt in range(self.max_retries + 1):
+            # Respect bucket pause set by another worker's 429
+            wait = bucket.paused_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            try:
+                await action.run()
+                result.succeeded += 1
+                if action.key:
+                    result.completed_keys.add(action.key)
+                return
+
+            except discord.HTTPException as e:
+                if e.status == 429 and attempt < self.max_retries:
+                    retry_after = _retry_after(e)
+                    bucket.paused_until = max(bucket.paused_until, time.monotonic() + retry_after)
+                    result.rate_limited += 1
+                    logger.warning(
+                        "bulk_bucket_rate_limited",
+                        bucket=bucket.name,
+                        retry_after=retry_after,
+                    )
+                    continue
+
+                result.failed += 1
+                result.errors.append(f"{action.bucket} {action.key}: {e}")
+                return
+
+            except Exception as e:
+                result.failed += 1
+                result.errors.append(f"{action.bucket} {action.key}: {e}")
+                return
+
+
+def _retry_after(error: discord.HTTPException) -> float:
+    """Extract Retry-After (seconds) from a 429 response."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        return float(retry_after)
+
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1.0))
+    except (TypeError, ValueError):
+        return 1.0
@@ -15,7 +15,8 @@ from typing import Optional
 import discord
 from discord.ext import commands
 
-from src.agents import AgentFactory
+from src.agents import AgentFactory, get_prompt_prefix_cache
+from src.bot.conversation_memory import get_conversation_memory
 from src.bot.ai_router import AIRouter
 from src.bot.about_command import AboutCommand, AboutView, PingsCommand
 try:
@@ -34,9 +35,9 @@ from src.bot.handlers.scraper_handler import ScraperHandler
 from src.bot.handlers.scheduler_handler import SchedulerHandler
 from src.bot.filters.gliquid_filter import get_gliquid_filter
 
-from src.llm import OpenRouterClient
+from src.llm import OpenRouterClient, get_llm_scheduler
 from src.rag import HybridRetriever, MultimodalEmbedder, MultimodalIndexer
-from src.rag import get_message_storage
+from src.rag import get_answer_cache, get_message_storage, get_recent_message_store
 from src.moderation import (
     ScamDetector, 
     ImpersonationChecker, 
@@ -46,13 +47,19 @@ from src.moderation import (
 )
 from src.rag.announcement_indexer import get_announcement_indexer
 from src.analytics import DailyReportGenerator
+from src.analytics.openrouter_usage import get_openrouter_usage
+from src.analytics.usage_tracker import get_usage_tracker
 from src.utils import (
     get_config, 
     get_logger, 
+    get_channel_index,
     PRODUCTION_MODE, 
     console_print, 
-    ScraperProgress
+    ScraperProgress,
+    get_rate_limiter,
 )
+from src.utils.loop_watchdog import LoopWatchdog, get_loop_watchdog
+from src.utils.metrics import MetricsServer, get_metrics, get_rate_limit_handler
 
 logger = get_logger(__name__)
 
@@ -103,6 +110,7 @@ class DiscordBot(commands.Bot):
         # Moderation components
         self.scam_detector: Optional[ScamDetector] = None
         self.impersonation_checker: Optional[ImpersonationChecker] = None
+        self.impersonation_sweep = None
         self.promotion_notifier: Optional[PromotionNotifier] = None
         self.submission_handler: Optional[SubmissionHandler] = None
         
@@ -124,6 +132,8 @@ class DiscordBot(commands.Bot):
         self.activity_checker = None
         self.content_filter = None
         self.announcement_indexer = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.loop_watchdog: Optional[LoopWatchdog] = None
     
     async def setup_hook(self):
         """Setup bot components."""
@@ -193,8 +203,55 @@ class DiscordBot(commands.Bot):
                 config=self.config.content_submissions.model_dump(),
             )
         
+        await self._start_metrics()
+        
+        watchdog_settings = self.config.monitoring.loop_watchdog
+        if watchdog_settings.get("enabled", False):
+            self.loop_watchdog = get_loop_watchdog(watchdog_settings)
+            self.loop_watchdog.start()
+        
+        # OpenRouter credits/analytics snapshot for /usage
+        get_openrouter_usage().start()
+        
         # Components initialized silently
     
+    async def _start_metrics(self):
+        """Serve /metrics and export component snapshots (monitoring.metrics)."""
+        settings = self.config.monitoring.metrics
+        if not settings.get("enabled", False):
+            return
+        
+        metrics = get_metrics()
+        metrics.register_snapshot("llm_scheduler", get_llm_scheduler().snapshot, label="priority")
+        metrics.register_snapshot("answer_cache", get_answer_cache().snapshot)
+        metrics.register_snapshot("prompt_prefix", lambda: get_prompt_prefix_cache().stats)
+        metrics.register_snapshot("channel_index", get_channel_index().snapshot)
+        metrics.register_snapshot("conversation_memory", get_conversation_memory().snapshot)
+        metrics.register_snapshot("openrouter_usage", get_openrouter_usage().snapshot)
+        metrics.register_snapshot("intent", lambda: (
+            self.message_handler.intent_classifier.stats
+            if self.message_handler and self.message_handler.intent_classifier else {}
+        ))
+        if self.config.rate_limit.enabled:
+            metrics.register_snapshot("mention_rate_limit", get_rate_limiter().snapshot)
+        
+        analyzer = getattr(self.scam_detector, "ai_analyzer", None)
+        if analyzer is not None and hasattr(analyzer, "_queued_count"):
+            metrics.register_snapshot("moderation_batch", lambda: {"queued": analyzer._queued_count()})
+        
+        get_rate_limit_handler()  # Counts discord.py 429s
+        
+        self.metrics_server = MetricsServer(
+            port=settings.get("port", 8080),
+            path=settings.get("path", "/metrics"),
+            host=settings.get("host", "127.0.0.1"),
+        )
+        try:
+            await self.metrics_server.start()
+        except OSError as e:
+            logger.error("metrics_server_failed", port=self.metrics_server.port, error=str(e))
+            self.metrics_server = None
+    
     def _init_moderation(self):
         """Initialize moderation components."""
         if self.config.moderation.enabled:
@@ -208,6 +265,13 @@ class DiscordBot(commands.Bot):
             self.impersonation_checker = ImpersonationChecker(
                 message_storage=self.message_storage
             )
+            
+            sweep_config = self.config.member_update.anti_impersonation.sweep
+            if sweep_config.get("enabled", False):
+                from src.moderation.impersonation_sweep import ImpersonationSweep
+                self.impersonation_sweep = ImpersonationSweep(
+                    self.impersonation_checker, sweep_config
+                )
         
         if self.config.member_update.promotions.enabled:
             self.promotion_notifier = PromotionNotifier()
@@ -262,6 +326,7 @@ class DiscordBot(commands.Bot):
             config=self.config,
             report_generator=self.report_generator,
             activity_checker=self.activity_checker,
+            impersonation_sweep=self.impersonation_sweep,
         )
     
     async def _set_avatar(self):
@@ -419,6 +484,14 @@ class DiscordBot(commands.Bot):
             from src.bot.commands.check_activity_command import setup_check_activity_command
             setup_check_activity_command(self, self.config.activity_checker.model_dump())
         
+        if self.loop_watchdog:
+            from src.bot.commands.loop_lag_command import setup_loop_lag_command
+            setup_loop_lag_command(self, self.loop_watchdog)
+        
+        if self.impersonation_sweep:
+            from src.bot.commands.impersonation_sweep_command import setup_impersonation_sweep_command
+            setup_impersonation_sweep_command(self, self.impersonation_sweep)
+        
         if self.submission_handler:
             setup_submission_commands(self, self.submission_handler)
         
@@ -509,6 +582,9 @@ class DiscordBot(commands.Bot):
     
     async def on_message(self, message: discord.Message):
         """Handle incoming messages."""
+        # Keep the local recent-message buffer current (serves reply/channel context)
+        get_recent_message_store().record(message)
+        
         # Handle prefix commands first
         if self.about_command and message.content.strip().startswith("!about"):
             if await self.about_command.handle_command(message):
@@ -549,27 +625,80 @@ class DiscordBot(commands.Bot):
             await self.submission_handler.handle_reaction_remove(payload)
     
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
-        """Handle edited messages."""
-        if before.content == after.content:
-            return
+        """Handle edited messages (only the parts that actually changed)."""
+        get_recent_message_store().update(after)
+        
         if after.author.bot or not after.guild:
             return
         
-        # Scam detection
+        # Scam detection (skips unfurl-only edits, reuses cached verdicts)
         if self.scam_detector and self.config.moderation.enabled:
-            result = await self.scam_detector.analyze_message(after)
+            result = await self.scam_detector.analyze_edit(before, after)
             if result and result.is_scam:
-                try:
-                    await after.delete()
-                    logger.info(f"🗑️ Deleted edited scam message from @{after.author.name}")
-                except:
-                    pass
+                if result.action != "already_deleted":
+                    try:
+                        await after.delete()
+                        logger.info(f"🗑️ Deleted edited scam message from @{after.author.name}")
+                    except:
+                        pass
                 return
         
-        # Gliquid filter
+        # Gliquid filter only looks at content
+        if before.content == after.content:
+            return
+        
         gliquid_filter = get_gliquid_filter()
         await gliquid_filter.filter_message(after, log_prefix="_edit")
     
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Drop deleted messages from the recent-message buffer."""
+        get_recent_message_store().remove(payload.channel_id, payload.message_id)
+    
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        """Refresh the guild's channel index and prompt prefix."""
+        get_channel_index().refresh(channel.guild)
+        get_prompt_prefix_cache().invalidate(channel.guild.id)
+    
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        """Refresh the guild's channel index and prompt prefix."""
+        get_channel_index().refresh(channel.guild)
+        get_prompt_prefix_cache().invalidate(channel.guild.id)
+    
+    async def on_guild_channel_update(
+        self,
+        before: discord.abc.GuildChannel,
+        after: discord.abc.GuildChannel,
+    ):
+        """Refresh the channel index and, if order/visibility changed, the prompt prefix."""
+        layout_changed = (
+            before.position != after.position
+            or before.overwrites != after.overwrites
+            or before.category_id != after.category_id
+        )
+        if layout_changed or before.name != after.name:
+            get_channel_index().refresh(after.guild)
+        if layout_changed:
+            get_prompt_prefix_cache().invalidate(after.guild.id)
+    
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """Refresh the channel index and prompt prefix if the bot's visible channels may have changed."""
+        me = after.guild.me
+        if before.permissions != after.permissions and (
+            after.is_default() or (me is not None and after in me.roles)
+        ):
+            get_channel_index().refresh(after.guild)
+            get_prompt_prefix_cache().invalidate(after.guild.id)
+    
+    async def on_guild_role_delete(self, role: discord.Role):
+        """Refresh the channel index and prompt prefix (the bot may have lost the role)."""
+        get_channel_index().refresh(role.guild)
+        get_prompt_prefix_cache().invalidate(role.guild.id)
+    
+    async def on_guild_remove(self, guild: discord.Guild):
+        """Drop cached channel data for a guild the bot left."""
+        get_channel_index().remove_guild(guild.id)
+        get_prompt_prefix_cache().invalidate(guild.id)
+    
     async def on_member_join(self, member: discord.Member):
         """Handle new member joins."""
         if self.member_handler:
@@ -577,6 +706,11 @@ class DiscordBot(commands.Bot):
     
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         """Handle member updates."""
+        # The bot's own roles decide which channels the prompt lists
+        if after.id == self.user.id and before.roles != after.roles:
+            get_channel_index().refresh(after.guild)
+            get_prompt_prefix_cache().invalidate(after.guild.id)
+        
         if self.member_handler:
             await self.member_handler.handle_member_update(before, after)
     
@@ -595,6 +729,16 @@ class DiscordBot(commands.Bot):
         if self.llm_client:
             await self.llm_client.close()
         
+        # Flush buffered usage ledger rows
+        await get_usage_tracker().close()
+        await get_openrouter_usage().stop()
+        
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        
+        if self.loop_watchdog:
+            self.loop_watchdog.stop()
+        
         await super().close()
         logger.info("bot_closed")
 
@@ -0,0 +1,172 @@
+"""
+Impersonation Sweep command for admins.
+
+Features:
+- Screen every member of the guild against protected names
+- Resumes from checkpoint if a previous sweep was interrupted
+- Progress feedback
+- Admin-only command
+"""
+
+import time
+
+import discord
+from discord import app_commands
+
+from src.moderation.impersonation_sweep import ImpersonationSweep, SweepAlreadyRunning, SweepResult
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Min seconds between progress message edits
+PROGRESS_EDIT_INTERVAL = 3.0
+
+
+class ImpersonationSweepCommand:
+    """
+    Handle /impersonation_sweep command.
+    """
+
+    def __init__(self, bot: discord.Client, sweep: ImpersonationSweep):
+        """
+        Initialize impersonation sweep command.
+
+        Args:
+            bot: Discord bot instance
+            sweep: Impersonation sweep runner
+        """
+        self.bot = bot
+        self.sweep = sweep
+
+    async def run_sweep(
+        self,
+        interaction: discord.Interaction,
+        reset_nicknames: bool = True,
+        restart: bool = False,
+    ):
+        """
+        Sweep all guild members for impersonation.
+
+        Args:
+            interaction: Discord interaction
+            reset_nicknames: Reset nicknames of high-confidence matches
+            restart: Ignore checkpoint and start from the first member
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.followup.send(
+                "You don't have permission to use this command.",
+                ephemeral=True,
+            )
+            return
+
+        guild = interaction.guild
+        if self.sweep.is_running(guild.id):
+            await interaction.followup.send("⏳ a sweep is already running.", ephemeral=True)
+            return
+
+        logger.info(
+            "impersonation_sweep_manual",
+            admin_id=str(interaction.user.id),
+            reset_nicknames=reset_nicknames,
+            restart=restart,
+        )
+
+        status = await interaction.followup.send(
+            f"🔍 sweeping **{guild.member_count}** members...",
+            ephemeral=True,
+            wait=True,
+        )
+        last_edit = 0.0
+
+        async def on_progress(result: SweepResult):
+            nonlocal last_edit
+            now = time.monotonic()
+            if now - last_edit < PROGRESS_EDIT_INTERVAL:
+                return
+            last_edit = now
+            await status.edit(content=(
+                f"🔍 sweeping... **{result.screened}/{result.total_members}** screened | "
+                f"**{len(result.flagged)}** flagged | **{result.nicknames_reset}** reset"
+            ))
+
+        try:
+            result = await self.sweep.run(
+                guild,
+                reset_nicknames=reset_nicknames,
+                restart=restart,
+                progress_callback=on_progress,
+            )
+        except SweepAlreadyRunning:
+            # Lost the race with another invocation after the is_running check
+            await self._report(interaction, status, "⏳ a sweep is already running.")
+            return
+        except Exception as e:
+            logger.error("impersonation_sweep_failed", error=str(e), exc_info=True)
+            await self._report(interaction, status, "❌ sweep failed - progress is saved, run again to resume.")
+            return
+
+        resumed = " (resumed from checkpoint)" if result.resumed else ""
+        await self._report(interaction, status, (
+            f"✅ sweep complete{resumed}\n"
+            f"• screened: **{result.screened}**\n"
+            f"• flagged: **{len(result.flagged)}**\n"
+            f"• nicknames reset: **{result.nicknames_reset}**"
+        ))
+
+    async def _report(self, interaction: discord.Interaction, status: discord.WebhookMessage, content: str):
+        """
+        Edit the status message, falling back to a DM.
+
+        The interaction token expires after 15 minutes, long before a sweep
+        of a large guild finishes.
+        """
+        try:
+            await status.edit(content=content)
+            return
+        except discord.HTTPException as e:
+            logger.info("impersonation_sweep_status_edit_failed", error=str(e))
+
+        try:
+            await interaction.user.send(f"**impersonation sweep ({interaction.guild.name})**\n{content}")
+        except discord.HTTPException as e:
+            logger.warning("impersonation_sweep_report_failed", error=str(e))
+
+
+def setup_impersonation_sweep_command(
+    bot: discord.Client,
+    sweep: ImpersonationSweep,
+) -> ImpersonationSweepCommand:
+    """
+    Setup and register /impersonation_sweep command.
+
+    Args:
+        bot: Discord bot instance
+        sweep: Impersonation sweep runner
+
+    Returns:
+        ImpersonationSweepCommand instance
+    """
+    sweep_cmd = ImpersonationSweepCommand(bot, sweep)
+
+    @app_commands.command(
+        name="impersonation_sweep",
+        description="Screen all members for impersonation (Admin only)",
+    )
+    @app_commands.describe(
+        reset_nicknames="Reset nicknames of high-confidence matches (default: true)",
+        restart="Ignore saved progress and start over (default: false)",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def impersonation_sweep_slash(
+        interaction: discord.Interaction,
+        reset_nicknames: bool = True,
+        restart: bool = False,
+    ):
+        await sweep_cmd.run_sweep(interaction, reset_nicknames, restart)
+
+    bot.tree.add_command(impersonation_sweep_slash)
+
+    return sweep_cmd
@@ -0,0 +1,146 @@
+"""
+Loop lag command for admins.
+
+Features:
+- Current event-loop lag stats (max lag, stalls)
+- Top blocking call sites from stack samples taken during stalls
+- Optional reset of the aggregated samples
+- Admin-only command
+"""
+
+import time
+
+import discord
+from discord import app_commands
+
+from src.utils import get_logger
+from src.utils.loop_watchdog import LoopWatchdog
+
+logger = get_logger(__name__)
+
+# Discord message limit minus code block fences
+MAX_REPORT_CHARS = 1900
+
+
+class LoopLagCommand:
+    """
+    Handle /loop_lag command.
+    """
+
+    def __init__(self, bot: discord.Client, watchdog: LoopWatchdog):
+        """
+        Initialize loop lag command.
+
+        Args:
+            bot: Discord bot instance
+            watchdog: Running loop watchdog
+        """
+        self.bot = bot
+        self.watchdog = watchdog
+
+    def format_report(self, top: int = 8, show_stack: bool = False) -> str:
+        """
+        Format the blocking-site report.
+
+        Args:
+            top: Number of sites to show
+            show_stack: Include the sampled repo frames for each site
+        """
+        watchdog = self.watchdog
+        since = int(time.time() - watchdog.started_at)
+        header = (
+            f"**loop lag** (last {since // 3600}h {since % 3600 // 60}m)\n"
+            f"• max lag: **{watchdog.max_lag_ms:.0f}ms** | "
+            f"stalls > {watchdog.threshold * 1000:.0f}ms: **{watchdog.stalls}**"
+        )
+
+        sites = watchdog.top_sites(top)
+        if not sites:
+            return header + "\n\n✅ no blocking calls sampled."
+
+        lines = []
+        for i, site in enumerate(sites, 1):
+            lines.append(
+                f"#{i} {site.blocked_s:.2f}s blocked | {site.stalls} stalls | max {site.max_stall_ms:.0f}ms"
+            )
+            lines.append(f"   {site.caller}")
+            if site.leaf != site.caller:
+                lines.append(f"   -> {site.leaf}")
+            if show_stack:
+                lines.extend(f"      {frame}" for frame in site.stack[:-1])
+
+        body = "\n".join(lines)
+        if len(body) > MAX_REPORT_CHARS - len(header):
+            body = body[:MAX_REPORT_CHARS - len(header)].rsplit("\n", 1)[0] + "\n..."
+        return f"{header}\n```\n{body}\n```"
+
+    async def show(
+        self,
+        interaction: discord.Interaction,
+        top: int = 8,
+        show_stack: bool = False,
+        reset: bool = False,
+    ):
+        """
+        Show the loop lag report.
+
+        Args:
+            interaction: Discord interaction
+            top: Number of sites to show
+            show_stack: Include sampled stacks
+            reset: Clear samples after showing them
+        """
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "You don't have permission to use this command.",
+                ephemeral=True,
+            )
+            return
+
+        report = self.format_report(top, show_stack)
+        if reset:
+            self.watchdog.reset()
+            report += "\n🔄 samples reset."
+            logger.info("loop_lag_reset", admin_id=str(interaction.user.id))
+
+        await interaction.response.send_message(report, ephemeral=True)
+
+
+def setup_loop_lag_command(
+    bot: discord.Client,
+    watchdog: LoopWatchdog,
+) -> LoopLagCommand:
+    """
+    Setup and register /loop_lag command.
+
+    Args:
+        bot: Discord bot instance
+        watchdog: Running loop watchdog
+
+    Returns:
+        LoopLagCommand instance
+    """
+    lag_cmd = LoopLagCommand(bot, watchdog)
+
+    @app_commands.command(
+        name="loop_lag",
+        description="Show event-loop lag and blocking call sites (Admin only)",
+    )
+    @app_commands.describe(
+        top="Number of blocking sites to show (default: 8)",
+        show_stack="Include sampled stacks (default: false)",
+        reset="Clear samples after showing them (default: false)",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def loop_lag_slash(
+        interaction: discord.Interaction,
+        top: app_commands.Range[int, 1, 20] = 8,
+        show_stack: bool = False,
+        reset: bool = False,
+    ):
+        await lag_cmd.show(interaction, top, show_stack, reset)
+
+    bot.tree.add_command(loop_lag_slash)
+
+    return lag_cmd
@@ -6,13 +6,16 @@ Features:
 - Admin-only command
 - Configurable reactions
 - Progress feedback
+- Runs per-channel reaction bucket at full concurrency (BulkActionExecutor)
+- Resume and cancel
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 import discord
 from discord import app_commands
 
+from src.bot.bulk_actions import BulkAction, BulkActionExecutor, BulkResult
 from src.utils import get_logger
 
 logger = get_logger(__name__)
@@ -34,8 +37,25 @@ class ReactAllCommand:
         self.bot = bot
         self.config = config
         
+        # Running executors and completed message IDs of interrupted runs (per channel)
+        self._running: Dict[int, BulkActionExecutor] = {}
+        self._completed: Dict[int, Set[str]] = {}
+        
         # Silent init
     
+    def _has_access(self, user: discord.Member) -> bool:
+        """Check if user is an admin or has an allowed role."""
+        allowed_role_ids = {1436799852171235472, 1436767320239243519}  # Staff, Mish
+        config_role_ids = set(int(r) for r in self.config.get("required_roles", []) if r)
+        all_allowed = allowed_role_ids | config_role_ids
+        
+        user_role_ids = {role.id for role in user.roles}
+        
+        return (
+            user.guild_permissions.administrator or
+            bool(user_role_ids & all_allowed)
+        )
+    
     async def react_all(
         self,
         interaction: discord.Interaction,
@@ -47,6 +67,7 @@ class ReactAllCommand:
         emoji3: str = None,
         emoji4: str = None,
         emoji5: str = None,
+        resume: bool = False,
     ):
         """
         Add reactions to all messages in a channel.
@@ -57,6 +78,7 @@ class ReactAllCommand:
             message_limit: Number of messages to react to
             clear_existing: Whether to clear existing reactions first
             emoji1-5: Optional custom emojis to add
+            resume: Skip messages completed by an interrupted/cancelled run
         """
         # Defer response since this will take time
         await interaction.response.defer(ephemeral=True)
@@ -68,18 +90,7 @@ class ReactAllCommand:
                 return
             
             # Check if user has access (admin permission OR allowed role)
-            allowed_role_ids = {1436799852171235472, 1436767320239243519}  # Staff, Mish
-            config_role_ids = set(int(r) for r in self.config.get("required_roles", []) if r)
-            all_allowed = allowed_role_ids | config_role_ids
-            
-            user_role_ids = {role.id for role in interaction.user.roles}
-            
-            has_access = (
-                interaction.user.guild_permissions.administrator or
-                bool(user_role_ids & all_allowed)
-            )
-            
-            if not has_access:
+            if not self._has_access(interaction.user):
                 await interaction.followup.send(
                     "you don't have permission to use this command.",
                     ephemeral=True,
@@ -107,84 +118,102 @@ class ReactAllCommand:
                 reactions=reactions,
             )
             
-            # Send initial progress message
-            await interaction.followup.send(
-                f"🔄 starting to add reactions to all messages in {channel.mention}...",
-                ephemeral=True,
-            )
-            
-            # Fetch and react to messages
-            success_count = 0
-            error_count = 0
-            total_processed = 0
-            
-            # Get message limit from param or config
-            limit = message_limit or self.config.get("message_limit", 100)
+            if channel.id in self._running:
+                await interaction.followup.send(
+                    f"⏳ already adding reactions in {channel.mention}. use /react_all_cancel to stop it.",
+                    ephemeral=True,
+                )
+                return
             
-            async for message in channel.history(limit=limit):
-                try:
-                    total_processed += 1
-                    
-                    # Skip bot messages if configured
-                    if self.config.get("skip_bot_messages", True) and message.author.bot:
+            # Reserve the channel before the first await, so a concurrent
+            # call can't pass the check above while this one is starting
+            executor = BulkActionExecutor(
+                bucket_concurrency=self.config.get("bucket_concurrency"),
+            )
+            self._running[channel.id] = executor
+            try:
+                # Send initial progress message
+                status = await interaction.followup.send(
+                    f"🔄 starting to add reactions to all messages in {channel.mention}...",
+                    ephemeral=True,
+                    wait=True,
+                )
+                
+                # Get message limit from param or config
+                limit = message_limit or self.config.get("message_limit", 100)
+                skip_bots = self.config.get("skip_bot_messages", True)
+                
+                # One action per message (keeps reaction order within a message),
+                # messages run concurrently within the channel's reaction bucket.
+                # Individual reaction failures are collected, not fatal to the message.
+                actions = []
+                reaction_errors: List[str] = []
+                async for message in channel.history(limit=limit):
+                    if executor.cancelled:
+                        break
+                    if skip_bots and message.author.bot:
                         continue
-                    
-                    # Clear existing reactions if requested
-                    if clear_existing:
-                        try:
-                            await message.clear_reactions()
-                        except discord.Forbidden:
-                            pass  # No permission to clear
-                        except discord.NotFound:
-                            continue  # Message deleted
-                    
-                    # Add each reaction
-                    for reaction in reactions:
-                        try:
-                            await message.add_reaction(reaction)
-                        except discord.HTTPException as e:
-                            logger.warning(
-                                "failed_to_add_reaction",
-                                message_id=str(message.id),
-                                reaction=reaction,
-                                error=str(e),
-                            )
-                    
-                    success_count += 1
-                    
-                    # Send progress update every N messages
-                    if total_processed % 10 == 0:
-                        logger.debug(
-                            "react_all_progress",
-                            processed=total_processed,
-                            success=success_count,
-                        )
+                    actions.append(BulkAction(
+                        bucket=f"reactions:{channel.id}",
+                        run=self._make_react_action(message, reactions, clear_existing, reaction_errors),
+                        key=str(message.id),
+                    ))
                 
-                except discord.Forbidden:
-                    error_count += 1
-                    logger.error(
-                        "missing_permissions_to_react",
-                        message_id=str(message.id),
-                        channel_id=str(channel.id),
-                    )
+                async def on_progress(progress: BulkResult):
+                    await status.edit(content=(
+                        f"🔄 adding reactions in {channel.mention}... "
+                        f"**{progress.processed + progress.skipped}/{progress.total}** "
+                        f"({progress.per_second:.1f} msg/s)"
+                    ))
                 
-                except Exception as e:
-                    error_count += 1
-                    logger.error(
-                        "failed_to_react_to_message",
-                        error=str(e),
-                        message_id=str(message.id),
+                if executor.cancelled:
+                    # Cancelled while collecting messages (run() would reset it)
+                    await interaction.followup.send(
+                        f"⏹️ cancelled adding reactions to {channel.mention} before it started.",
+                        ephemeral=True,
                     )
+                    return
+                
+                result = await executor.run(
+                    actions,
+                    skip_keys=self._completed.get(channel.id) if resume else None,
+                    progress_callback=on_progress,
+                )
+            finally:
+                self._running.pop(channel.id, None)
+            
+            # Remember progress of interrupted runs for resume
+            if result.cancelled or result.failed:
+                self._completed[channel.id] = result.completed_keys
+            else:
+                self._completed.pop(channel.id, None)
+            
+            total_processed = result.total
+            success_count = result.succeeded
+            error_count = result.failed
+            
+            for error in result.errors[:5]:
+                logger.warning("react_all_action_failed", error=error)
+            for error in reaction_errors[:5]:
+                logger.warning("react_all_reaction_failed", error=error)
             
             # Send completion message
+            headline = (
+                f"⏹️ cancelled adding reactions to {channel.mention}. run again with resume to continue."
+                if result.cancelled else
+                f"✅ completed adding reactions to {channel.mention}!"
+            )
             completion_message = (
-                f"✅ completed adding reactions to {channel.mention}!\n\n"
+                f"{headline}\n\n"
                 f"**results:**\n"
                 f"• total messages processed: {total_processed}\n"
                 f"• successfully reacted: {success_count}\n"
                 f"• errors: {error_count}\n"
                 f"• reactions used: {', '.join(reactions)}"
+                + (f"\n• reactions failed: {len(reaction_errors)}" if reaction_errors else "")
                 + (f"\n• cleared existing: yes" if clear_existing else "")
+                + (f"\n• skipped (resumed): {result.skipped}" if result.skipped else "")
+                + f"\n• speed: {result.per_second:.1f} msg/s"
             )
             
             await interaction.followup.send(completion_message, ephemeral=True)
@@ -196,6 +225,7 @@ class ReactAllCommand:
                 total_processed=total_processed,
                 success_count=success_count,
                 error_count=error_count,
+                reaction_errors=len(reaction_errors),
             )
         
         except Exception as e:
@@ -210,6 +240,89 @@ class ReactAllCommand:
                 ephemeral=True,
             )
 
+    
+    def _make_react_action(
+        self,
+        message: discord.Message,
+        reactions: List[str],
+        clear_existing: bool,
+        errors: List[str],
+    ):
+        """
+        Build the bulk action coroutine for one message.
+        
+        A failing reaction (unknown emoji, Forbidden) is recorded in `errors`
+        and the remaining reactions are still added; the message only fails
+        if no reaction could be added. 429s propagate so the executor pauses
+        the bucket, and the retry skips the steps already done.
+        """
+        done: Set[str] = set()
+        
+        async def react():
+            # Clear existing reactions if requested
+            if clear_existing and "clear" not in done:
+                try:
+                    await message.clear_reactions()
+                except discord.Forbidden:
+                    pass  # No permission to clear
+                done.add("clear")
+            
+            # Add each reaction (in order)
+            failed = 0
+            for reaction in reactions:
+                if reaction in done:
+                    continue
+                try:
+                    await message.add_reaction(reaction)
+                    done.add(reaction)
+                except discord.NotFound:
+                    raise  # Message deleted: nothing else will succeed
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        raise
+                    failed += 1
+                    done.add(reaction)  # Don't retry a reaction that was rejected
+                    errors.append(f"{message.id} {reaction}: {e}")
+            
+            if failed and failed == len(reactions):
+                raise RuntimeError(f"all {failed} reactions failed")
+        
+        return react
+    
+    async def cancel(self, interaction: discord.Interaction, channel: discord.TextChannel):
+        """
+        Cancel a running react_all in a channel.
+        
+        Args:
+            interaction: Discord interaction
+            channel: Channel with the running react_all
+        """
+        if not self._has_access(interaction.user):
+            await interaction.response.send_message(
+                "you don't have permission to use this command.",
+                ephemeral=True,
+            )
+            return
+        
+        executor = self._running.get(channel.id)
+        if not executor:
+            await interaction.response.send_message(
+                f"nothing running in {channel.mention}.",
+                ephemeral=True,
+            )
+            return
+        
+        executor.cancel()
+        logger.info(
+            "react_all_cancelled",
+            admin_id=str(interaction.user.id),
+            channel_id=str(channel.id),
+        )
+        await interaction.response.send_message(
+            f"⏹️ stopping reactions in {channel.mention}...",
+            ephemeral=True,
+        )
+
 
 def setup_react_all_command(bot: discord.Client, config: dict) -> ReactAllCommand:
     """
@@ -237,6 +350,7 @@ def setup_react_all_command(bot: discord.Client, config: dict) -> ReactAllComman
         emoji3="third emoji to add (optional)",
         emoji4="fourth emoji to add (optional)",
         emoji5="fifth emoji to add (optional)",
+        resume="skip messages done by a cancelled/interrupted run",
     )
     async def react_all_slash(
         interaction: discord.Interaction,
@@ -248,11 +362,24 @@ def setup_react_all_command(bot: discord.Client, config: dict) -> ReactAllComman
         emoji3: str = None,
         emoji4: str = None,
         emoji5: str = None,
+        resume: bool = False,
+    ):
+        await react_all_cmd.react_all(interaction, channel, message_limit, clear_existing, emoji1, emoji2, emoji3, emoji4, emoji5, resume)
+    
+    @app_commands.command(
+        name="react_all_cancel",
+        description="stop a running react_all in a channel (admin only)",
+    )
+    @app_commands.describe(channel="the channel where react_all is running")
+    async def react_all_cancel_slash(
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
     ):
-        await react_all_cmd.react_all(interaction, channel, message_limit, clear_existing, emoji1, emoji2, emoji3, emoji4, emoji5)
+        await react_all_cmd.cancel(interaction, channel)
     
-    # Add command to bot's tree
+    # Add commands to bot's tree
     bot.tree.add_command(react_all_slash)
+    bot.tree.add_command(react_all_cancel_slash)
     
     # Registered
     
@@ -1,28 +1,66 @@
 """
 Usage statistics slash command for administrators.
 
-Displays LLM API usage statistics from OpenRouter Analytics API.
+Displays LLM API usage statistics from OpenRouter Analytics API, with the
+local usage ledger for arbitrary windows and per-purpose breakdowns.
+OpenRouter data comes from a periodically refreshed local snapshot.
 """
 
+import re
+from typing import Optional
+
 import discord
 from discord import app_commands
 from datetime import datetime, timedelta
-import httpx
 
+from src.analytics.openrouter_usage import get_openrouter_usage
 from src.analytics.usage_tracker import get_usage_tracker
-from src.utils import get_logger, get_config
+from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+_WINDOW_RE = re.compile(r"^(\d+)\s*([hdw])$")
+_WINDOW_HOURS = {"h": 1, "d": 24, "w": 24 * 7}
+
+
+def parse_window(value: str) -> Optional[timedelta]:
+    """
+    Parse a window like "6h", "3d", "2w" or "all".
+
+    Returns:
+        timedelta, or None for all time
+
+    Raises:
+        ValueError: Unrecognized window
+    """
+    value = value.strip().lower()
+    if value in ("all", "0", "0d"):
+        return None
+    match = _WINDOW_RE.match(value)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window: {value}")
+    return timedelta(hours=int(match.group(1)) * _WINDOW_HOURS[match.group(2)])
+
+
+def format_window(window: Optional[timedelta]) -> str:
+    """Human-readable window name."""
+    if window is None:
+        return "All time"
+    hours = int(window.total_seconds() // 3600)
+    if hours <= 24 or hours % 24:
+        return f"Last {hours} hours"
+    return f"Last {hours // 24} days"
+
 
 class UsageCommand:
     """
     /usage slash command for viewing API usage statistics.
     
     Features:
-    - Shows real usage from OpenRouter Analytics API
+    - Shows real usage from OpenRouter Analytics API (cached snapshot, optional refresh)
     - Displays costs and token usage
     - Shows per-model breakdown
+    - Arbitrary windows and per-purpose/model/day breakdowns from the local ledger
     - Admin-only access
     """
     
@@ -35,137 +73,10 @@ class UsageCommand:
         """
         self.bot = bot
         self.tracker = get_usage_tracker()
-        self.config = get_config()
+        self.openrouter = get_openrouter_usage()
         
         # Silent init
     
-    async def _fetch_openrouter_credits(self):
-        """
-        Fetch remaining credits from OpenRouter API.
-        
-        Returns:
-            Dict with credit info or None if error
-        """
-        try:
-            url = "https://openrouter.ai/api/v1/credits"
-            headers = {
-                "Authorization": f"Bearer {self.config.llm.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-            
-            return {
-                "total_credits": data.get("total_credits", 0),
-                "credits_used": data.get("credits_used", 0),
-                "credits_remaining": data.get("credits_remaining", 0),
-            }
-            
-        except Exception as e:
-            logger.error(
-                "openrouter_credits_fetch_failed",
-                error=str(e),
-                exc_info=True,
-            )
-            return None
-    
-    async def _fetch_openrouter_analytics(self, days: int = 30):
-        """
-        Fetch usage statistics from OpenRouter Analytics API.
-        
-        NOTE: This requires a provisioning key, not a regular API key.
-        
-        Args:
-            days: Number of days to fetch (max 30)
-        
-        Returns:
-            Dict with aggregated statistics or None if error
-        """
-        # Check if we have provisioning key
-        if not self.config.llm.provisioning_key:
-            logger.debug(
-                "openrouter_analytics_skipped",
-                reason="no_provisioning_key"
-            )
-            return None
-        
-        try:
-            url = "https://openrouter.ai/api/v1/activity"
-            headers = {
-                "Authorization": f"Bearer {self.config.llm.provisioning_key}",
-                "Content-Type": "application/json"
-            }
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
-            
-            # Aggregate data
-            total_requests = 0
-            total_prompt_tokens = 0
-            total_completion_tokens = 0
-            total_reasoning_tokens = 0
-            total_cost = 0.0
-            by_model = {}
-            
-            # Filter by date range
-            cutoff_date = (datetime.utcnow() - timedelta(days=days)).date()
-            
-            for item in data.get("data", []):
-                # Parse date (handle both "YYYY-MM-DD" and "YYYY-MM-DD HH:MM:SS" formats)
-                date_str = item["date"].split()[0] if " " in item["date"] else item["date"]
-                item_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                
-                # Skip if outside date range
-                if days > 0 and item_date < cutoff_date:
-                    continue
-                
-                # Aggregate totals
-                total_requests += int(item.get("requests", 0))
-                total_prompt_tokens += int(item.get("prompt_tokens", 0))
-                total_completion_tokens += int(item.get("completion_tokens", 0))
-                total_reasoning_tokens += int(item.get("reasoning_tokens", 0))
-                total_cost += float(item.get("usage", 0))  # usage is already in USD
-                
-                # Per-model breakdown
-                model = item.get("model", "unknown")
-                if model not in by_model:
-                    by_model[model] = {
-                        "requests": 0,
-                        "prompt_tokens": 0,
-                        "completion_tokens": 0,
-                        "cost_usd": 0.0,
-                    }
-                
-                by_model[model]["requests"] += int(item.get("requests", 0))
-                by_model[model]["prompt_tokens"] += int(item.get("prompt_tokens", 0))
-                by_model[model]["completion_tokens"] += int(item.get("completion_tokens", 0))
-                by_model[model]["cost_usd"] += float(item.get("usage", 0))
-            
-            # Usage is already in USD, no conversion needed
-            total_cost_usd = total_cost
-            
-            return {
-                "total_requests": total_requests,
-                "total_prompt_tokens": total_prompt_tokens,
-                "total_completion_tokens": total_completion_tokens,
-                "total_reasoning_tokens": total_reasoning_tokens,
-                "total_cost_usd": total_cost_usd,
-                "by_model": by_model,
-            }
-            
-        except Exception as e:
-            logger.error(
-                "openrouter_analytics_fetch_failed",
-                error=str(e),
-                exc_info=True,
-            )
-            return None
-    
     def create_command(self) -> app_commands.Command:
         """
         Create the /usage slash command.
@@ -178,16 +89,20 @@ class UsageCommand:
             description="View LLM API usage statistics (Admin only)"
         )
         @app_commands.describe(
-            period="Time period for statistics (default: 30 days)"
+            window="Time window, e.g. 6h, 3d, 2w or all (default: 30d)",
+            breakdown="Local ledger breakdown (default: purpose)",
+            refresh="Re-fetch OpenRouter credits/analytics first (default: false)",
         )
-        @app_commands.choices(period=[
-            app_commands.Choice(name="Last 24 hours", value=1),
-            app_commands.Choice(name="Last 7 days", value=7),
-            app_commands.Choice(name="Last 30 days", value=30),
+        @app_commands.choices(breakdown=[
+            app_commands.Choice(name="By purpose", value="purpose"),
+            app_commands.Choice(name="By model", value="model"),
+            app_commands.Choice(name="By day", value="day"),
         ])
         async def usage_command(
             interaction: discord.Interaction,
-            period: app_commands.Choice[int] = None
+            window: str = "30d",
+            breakdown: app_commands.Choice[str] = None,
+            refresh: bool = False
         ):
             """Display API usage statistics."""
             try:
@@ -207,35 +122,56 @@ class UsageCommand:
                     )
                     return
                 
+                try:
+                    period = parse_window(window)
+                except ValueError:
+                    await interaction.response.send_message(
+                        "❌ Invalid window. Use e.g. `6h`, `3d`, `2w` or `all`.",
+                        ephemeral=True
+                    )
+                    return
+                
                 # Defer response as it might take a moment
                 await interaction.response.defer(ephemeral=True)
                 
-                # Get period (default 30 days)
-                days = period.value if period else 30
-                period_name = period.name if period else "Last 30 days"
+                period_name = format_window(period)
+                group_by = breakdown.value if breakdown else "purpose"
+                
+                if refresh:
+                    await self.openrouter.refresh(force=True)
                 
-                # Try to get analytics from OpenRouter API (if provisioning key available)
-                api_stats = await self._fetch_openrouter_analytics(days=days if days > 0 else 30)
+                # OpenRouter analytics are daily (last 30 days max); sub-day windows use the ledger
+                api_stats = None
+                if period is None or (period.total_seconds() % 86400 == 0 and period.days <= 30):
+                    api_stats = self.openrouter.get_analytics(days=period.days if period else 30)
                 
                 if api_stats:
                     # Use API data (most accurate)
                     embed = self._create_api_stats_embed(api_stats, period_name)
                 else:
                     # Fallback to local tracker
-                    stats = self.tracker.get_stats(days=days)
+                    stats = await self.tracker.get_stats(window=period)
                     
-                    # Try to get credits info from OpenRouter
-                    credits_info = await self._fetch_openrouter_credits()
-                    
-                    # Create embed with local stats + credits info
-                    embed = self._create_stats_embed(stats, period_name, credits_info)
+                    # Create embed with local stats + credits info from the snapshot
+                    embed = self._create_stats_embed(stats, period_name, self.openrouter.credits)
+                
+                # Purpose/model/day split (OpenRouter has no notion of purpose)
+                groups = await self.tracker.get_breakdown(by=group_by, window=period)
+                if groups:
+                    embed.add_field(
+                        name=f"🎯 by {group_by} (local ledger)",
+                        value=self._format_breakdown(groups),
+                        inline=False
+                    )
                 
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 
                 logger.info(
                     "usage_command_executed",
                     user_id=str(interaction.user.id),
-                    period=days,
+                    window=window,
+                    breakdown=group_by,
+                    refresh=refresh,
                 )
                 
             except Exception as e:
@@ -254,6 +190,43 @@ class UsageCommand:
         
         return usage_command
     
+    def _format_age(self) -> str:
+        """How long ago the OpenRouter snapshot was refreshed."""
+        age = self.openrouter.age
+        if age is None:
+            return "never"
+        if age < 60:
+            return "just now"
+        if age < 3600:
+            return f"{age // 60:.0f}m ago"
+        return f"{age // 3600:.0f}h ago"
+    
+    def _format_breakdown(self, groups: dict, limit: int = 8) -> str:
+        """
+        Format ledger breakdown rows for an embed field.
+        
+        Args:
+            groups: {group: stats} from UsageTracker.get_breakdown
+            limit: Max rows shown
+        
+        Returns:
+            Field text (under the 1024-char embed field limit)
+        """
+        lines = []
+        for group, values in list(groups.items())[:limit]:
+            tokens = values["prompt_tokens"] + values["completion_tokens"]
+            line = (
+                f"**{group}:** {values['requests']:,} reqs, ${values['cost_usd']:.4f}, "
+                f"{tokens / 1000:,.1f}k tok"
+            )
+            if values["avg_latency_ms"]:
+                line += f", {values['avg_latency_ms']:.0f}ms avg"
+            lines.append(line)
+        
+        if len(groups) > limit:
+            lines.append(f"... and {len(groups) - limit} more")
+        return "\n".join(lines)[:1024]
+    
     def _create_stats_embed(self, stats, period_name: str, credits_info: dict = None) -> discord.Embed:
         """
         Create embed with usage statistics.
@@ -349,7 +322,7 @@ class UsageCommand:
             credits_remaining_usd = credits_info["credits_remaining"] / 1_000_000
             
             embed.add_field(
-                name="💳 openrouter credits",
+                name=f"💳 openrouter credits (updated {self._format_age()})",
                 value=(
                     f"**used:** ${credits_used_usd:.4f}\n"
                     f"**remaining:** ${credits_remaining_usd:.4f}"
@@ -498,7 +471,7 @@ class UsageCommand:
         
         # Footer
         embed.set_footer(
-            text=f"Live data from OpenRouter Analytics API • {period_name}"
+            text=f"OpenRouter Analytics API • {period_name} • updated {self._format_age()}"
         )
         
         return embed
@@ -0,0 +1,452 @@
+"""
+Bounded, persistent conversation memory.
+
+Per-user chat turns used as LLM history. Bounds:
+- per-user byte budget and turn limit (older turns are dropped, or rolled
+  into a short summary when summarization is enabled)
+- global LRU over users and a global byte cap for what is kept in memory
+- idle TTL: users who haven't talked to the bot for a while are forgotten
+
+Memory is write-through to a SQLite table (one row per user, turns stored
+as zlib-compressed JSON), so history survives restarts and users evicted
+from memory are reloaded on demand. SQLite reads/writes run in a worker
+thread (asyncio.to_thread); writes are serialized so they land in order.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.utils import get_config, get_logger
+
+if TYPE_CHECKING:
+    from src.llm import OpenRouterClient
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path("data/messages.db")
+
+# Injected blocks that are never stored (re-fetched on demand)
+STRIPPED_MARKERS = ("\n\n[CHANNEL CONTENT]",)
+
+SUMMARY_PROMPT = """Summarize this conversation between a Discord user and a bot in at most 3 short sentences.
+Keep facts the user shared and open questions; drop greetings and filler.
+
+{conversation}"""
+
+# (role, content) with role "user" or "assistant"
+Turn = Tuple[str, str]
+
+
+class _UserMemory:
+    __slots__ = ("turns", "summary", "last_active", "size")
+
+    def __init__(self, turns: List[Turn], summary: str, last_active: float):
+        self.turns = turns
+        self.summary = summary
+        self.last_active = last_active
+        self.size = 0
+        self.recount()
+
+    def recount(self):
+        self.size = len(self.summary.encode("utf-8")) + sum(
+            len(content.encode("utf-8")) for _, content in self.turns
+        )
+
+
+class ConversationMemory:
+    """
+    Conversation history per user.
+
+    Usage:
+        memory = get_conversation_memory()
+        history = await memory.get_history(user_id)
+        ...
+        await memory.add_turn(user_id, query, response, max_pairs=agent.config.max_history)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_users: int = 5000,
+        max_total_bytes: int = 32 * 1024 * 1024,
+        user_byte_budget: int = 16 * 1024,
+        max_turn_chars: int = 1500,
+        idle_ttl: float = 24 * 3600,
+        summarize: bool = False,
+        summary_max_chars: int = 600,
+        llm_client: Optional["OpenRouterClient"] = None,
+        sweep_interval: float = 300.0,
+    ):
+        """
+        Initialize conversation memory.
+
+        Args:
+            db_path: SQLite database file
+            max_users: Users kept in memory (least recently active are evicted)
+            max_total_bytes: Cap on history text kept in memory
+            user_byte_budget: Max history bytes per user
+            max_turn_chars: Each stored query/response is truncated to this
+            idle_ttl: Seconds of inactivity before a user's history is forgotten
+            summarize: Roll dropped turns into a summary (needs llm_client)
+            summary_max_chars: Max summary length
+            llm_client: LLM client used for summaries
+            sweep_interval: Seconds between idle sweeps
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_users = max_users
+        self.max_total_bytes = max_total_bytes
+        self.user_byte_budget = user_byte_budget
+        self.max_turn_chars = max_turn_chars
+        self.idle_ttl = idle_ttl
+        self.summarize = summarize
+        self.summary_max_chars = summary_max_chars
+        self.llm_client = llm_client
+        self.sweep_interval = sweep_interval
+
+        self._users: "OrderedDict[str, _UserMemory]" = OrderedDict()
+        self._total_bytes = 0
+        self._last_sweep = time.time()
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
+        self._write_lock = asyncio.Lock()  # FIFO: keeps per-user writes in order
+
+        self.stats = {"loads": 0, "evictions": 0, "expired": 0, "summaries": 0}
+
+        self._init_table()
+
+    @contextmanager
+    def _get_connection(self):
+        """Get database connection with context manager."""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_table(self):
+        """Create memory table."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_memory (
+                    user_id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL DEFAULT '',
+                    turns BLOB NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_conversation_memory_updated "
+                "ON conversation_memory(updated_at)"
+            )
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Public API
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def get_history(self, user_id: str) -> List[Dict[str, str]]:
+        """
+        Get the user's history as LLM messages (oldest first).
+
+        A summary of older turns, if any, comes first as a system message.
+        """
+        await self._maybe_sweep()
+        memory = await self._get(user_id)
+        if not memory:
+            return []
+
+        messages = []
+        if memory.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of your earlier conversation with this user: {memory.summary}",
+            })
+        messages.extend({"role": role, "content": content} for role, content in memory.turns)
+        return messages
+
+    async def add_turn(self, user_id: str, query: str, response: str, max_pairs: int):
+        """
+        Record a query/response pair.
+
+        Args:
+            user_id: Discord user ID
+            query: User query (injected channel content is stripped)
+            response: Bot response
+            max_pairs: Max query/response pairs kept (agent max_history)
+        """
+        memory = await self._get(user_id)
+        if memory is None:
+            # A concurrent add_turn may have created the user while _get awaited
+            memory = self._users.setdefault(user_id, _UserMemory([], "", time.time()))
+        # Re-added below after the bounds are applied (0 for a new user)
+        self._total_bytes -= memory.size
+
+        memory.turns.append(("user", self._compact(query)))
+        memory.turns.append(("assistant", self._compact(response)))
+        memory.last_active = time.time()
+
+        # Per-user bounds: turn count, then byte budget (always keep the latest pair)
+        dropped: List[Turn] = []
+        memory.recount()
+        while len(memory.turns) > 2 and (
+            len(memory.turns) > max(1, max_pairs) * 2 or memory.size > self.user_byte_budget
+        ):
+            dropped.extend(memory.turns[:2])
+            del memory.turns[:2]
+            memory.recount()
+
+        self._total_bytes += memory.size
+        self._users.move_to_end(user_id)
+        self._enforce_global_limits()
+
+        if dropped and self.summarize and self.llm_client:
+            self._schedule_summary(user_id, dropped)
+
+        logger.debug(
+            "conversation_history_updated",
+            user_id=user_id,
+            history_length=len(memory.turns) // 2,
+            bytes=memory.size,
+        )
+        await self._save(user_id, memory)
+
+    async def clear(self, user_id: str):
+        """Forget a user's history."""
+        memory = self._users.pop(user_id, None)
+        if memory:
+            self._total_bytes -= memory.size
+        await self._write(self._delete_row, user_id)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Memory counters and current size."""
+        return {
+            **self.stats,
+            "users_in_memory": len(self._users),
+            "bytes_in_memory": self._total_bytes,
+        }
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _compact(self, text: str) -> str:
+        for marker in STRIPPED_MARKERS:
+            index = text.find(marker)
+            if index != -1:
+                text = text[:index]
+        text = text.strip()
+        if len(text) > self.max_turn_chars:
+            text = text[:self.max_turn_chars] + "…"
+        return text
+
+    async def _get(self, user_id: str) -> Optional[_UserMemory]:
+        memory = self._users.get(user_id)
+        if memory is None:
+            loaded = await asyncio.to_thread(self._load, user_id)
+            # Another call may have loaded or created the user meanwhile
+            memory = self._users.get(user_id)
+            if memory is None:
+                if loaded is None:
+                    return None
+                memory = loaded
+                self._users[user_id] = memory
+                self._total_bytes += memory.size
+                self._enforce_global_limits(keep=user_id)
+        if time.time() - memory.last_active > self.idle_ttl:
+            await self.clear(user_id)
+            self.stats["expired"] += 1
+            return None
+
+        self._users.move_to_end(user_id)
+        return memory
+
+    def _enforce_global_limits(self, keep: Optional[str] = None):
+        """Evict least recently active users from memory (rows stay in SQLite)."""
+        while self._users and (
+            len(self._users) > self.max_users or self._total_bytes > self.max_total_bytes
+        ):
+            user_id, memory = next(iter(self._users.items()))
+            if user_id == keep or user_id == next(reversed(self._users)):
+                break
+            del self._users[user_id]
+            self._total_bytes -= memory.size
+            self.stats["evictions"] += 1
+
+    async def _maybe_sweep(self):
+        now = time.time()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+
+        cutoff = now - self.idle_ttl
+        for user_id in [uid for uid, m in self._users.items() if m.last_active < cutoff]:
+            self._total_bytes -= self._users.pop(user_id).size
+
+        expired = await self._write(self._delete_expired_rows, cutoff)
+        if expired:
+            self.stats["expired"] += expired
+            logger.debug("conversation_memory_swept", expired=expired)
+
+    def _load(self, user_id: str) -> Optional[_UserMemory]:
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT summary, turns, updated_at FROM conversation_memory WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+
+        if not row or time.time() - row["updated_at"] > self.idle_ttl:
+            return None
+
+        try:
+            turns = [tuple(t) for t in json.loads(zlib.decompress(row["turns"]))]
+        except (zlib.error, ValueError) as e:
+            logger.warning("conversation_memory_corrupt", user_id=user_id, error=str(e))
+            return None
+
+        self.stats["loads"] += 1
+        return _UserMemory(turns, row["summary"], row["updated_at"])
+
+    async def _write(self, func, *args):
+        """Run a write in a worker thread, one at a time (in call order)."""
+        async with self._write_lock:
+            return await asyncio.to_thread(func, *args)
+
+    async def _save(self, user_id: str, memory: _UserMemory):
+        # Snapshot now; the row is written in a worker thread
+        row = (user_id, memory.summary, list(memory.turns), memory.last_active)
+        try:
+            await self._write(self._save_row, *row)
+        except sqlite3.Error as e:
+            logger.error("conversation_memory_save_failed", user_id=user_id, error=str(e))
+
+    def _save_row(self, user_id: str, summary: str, turns: List[Turn], updated_at: float):
+        blob = zlib.compress(json.dumps(turns, ensure_ascii=False).encode("utf-8"))
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO conversation_memory (user_id, summary, turns, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    summary = excluded.summary,
+                    turns = excluded.turns,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, summary, blob, updated_at),
+            )
+
+    def _save_summary_row(self, user_id: str, summary: str):
+        with self._get_connection() as conn:
+            conn.execute(
+                "UPDATE conversation_memory SET summary = ? WHERE user_id = ?", (summary, user_id)
+            )
+
+    def _delete_row(self, user_id: str):
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM conversation_memory WHERE user_id = ?", (user_id,))
+
+    def _delete_expired_rows(self, cutoff: float) -> int:
+        with self._get_connection() as conn:
+            return conn.execute(
+                "DELETE FROM conversation_memory WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+
+    def _schedule_summary(self, user_id: str, dropped: List[Turn]):
+        """Roll dropped turns into the user's summary in the background."""
+        previous = self._summary_tasks.get(user_id)
+        task = asyncio.create_task(self._summarize(user_id, dropped, previous))
+        self._summary_tasks[user_id] = task
+        task.add_done_callback(
+            lambda t: self._summary_tasks.pop(user_id, None)
+            if self._summary_tasks.get(user_id) is t else None
+        )
+
+    async def _summarize(
+        self,
+        user_id: str,
+        dropped: List[Turn],
+        previous: Optional[asyncio.Task],
+    ):
+        # Summaries for one user are applied in order
+        if previous:
+            try:
+                await previous
+            except Exception:
+                pass
+
+        memory = await self._get(user_id)
+        if not memory:
+            return
+
+        lines = [f"Earlier summary: {memory.summary}"] if memory.summary else []
+        lines.extend(f"{role}: {content}" for role, content in dropped)
+
+        try:
+            from src.llm import BACKGROUND
+            response = await self.llm_client.chat_completion(
+                messages=[{"role": "user", "content": SUMMARY_PROMPT.format(conversation="\n".join(lines))}],
+                max_tokens=150,
+                temperature=0.2,
+                priority=BACKGROUND,
+                purpose="summary",
+            )
+        except Exception as e:
+            logger.debug("conversation_summary_failed", user_id=user_id, error=str(e))
+            return
+
+        summary = response.content.strip()[:self.summary_max_chars]
+        self.stats["summaries"] += 1
+
+        # The user may have been evicted, expired or reloaded during the call
+        if self._users.get(user_id) is not memory:
+            if user_id not in self._users:
+                try:
+                    await self._write(self._save_summary_row, user_id, summary)
+                except sqlite3.Error as e:
+                    logger.error("conversation_memory_save_failed", user_id=user_id, error=str(e))
+            return
+
+        self._total_bytes -= memory.size
+        memory.summary = summary
+        memory.recount()
+        self._total_bytes += memory.size
+        await self._save(user_id, memory)
+
+
+# Singleton instance
+_memory: Optional[ConversationMemory] = None
+
+
+def get_conversation_memory(llm_client: Optional["OpenRouterClient"] = None) -> ConversationMemory:
+    """
+    Get singleton conversation memory (configured from conversation_memory).
+
+    Args:
+        llm_client: LLM client for summaries (attached on first call that passes one)
+    """
+    global _memory
+    if _memory is None:
+        settings = get_config().conversation_memory
+        _memory = ConversationMemory(
+            max_users=settings.max_users,
+            max_total_bytes=settings.max_total_mb * 1024 * 1024,
+            user_byte_budget=settings.user_byte_budget,
+            max_turn_chars=settings.max_turn_chars,
+            idle_ttl=settings.idle_ttl_hours * 3600,
+            summarize=settings.summarize,
+            summary_max_chars=settings.summary_max_chars,
+        )
+    if llm_client and _memory.llm_client is None:
+        _memory.llm_client = llm_client
+    return _memory
@@ -7,6 +7,8 @@ Provides common interface for all content filters.
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+from src.moderation.filter_outcome import FilterOutcome
+
 if TYPE_CHECKING:
     from discord import Message
 
@@ -15,7 +17,7 @@ class BaseFilter(ABC):
     """Abstract base class for message filters."""
     
     @abstractmethod
-    async def filter_message(self, message: "Message") -> bool:
+    async def filter_message(self, message: "Message") -> FilterOutcome:
         """
         Filter a message.
         
@@ -23,7 +25,7 @@ class BaseFilter(ABC):
             message: Discord message to filter
             
         Returns:
-            True if message was filtered (deleted), False otherwise
+            What the filter did with the message (kept/deleted/warned)
         """
         pass
     
@@ -3,6 +3,9 @@ Gliquid channel filter - consolidated logic for the gliquid gm channel.
 
 This filter ensures only valid "gliquid" messages are allowed in the gm channel.
 Previously this logic was duplicated 3 times in client.py.
+
+The channel and bypass roles come from the "gliquid_only" channel rule
+(see ChannelRuleEngine / features.yaml -> channel_rules).
 """
 
 import re
@@ -10,10 +13,12 @@ from typing import Set, Optional, TYPE_CHECKING
 
 import discord
 
+from src.moderation.channel_rules import ChannelRule, get_channel_rule_engine
+from src.moderation.filter_outcome import FilterOutcome
 from src.utils import get_logger
 
 if TYPE_CHECKING:
-    from discord import Message, Member
+    from discord import Message
 
 logger = get_logger(__name__)
 
@@ -28,16 +33,8 @@ class GliquidFilter:
     - User mentions
     """
     
-    # Channel ID for gliquid channel
-    GLIQUID_CHANNEL_ID = 1436228451676848129
-    
-    # Trusted role IDs that bypass the filter
-    TRUSTED_ROLE_IDS: Set[int] = {
-        1436799852171235472,  # Staff
-        1436767320239243519,  # Mish
-        1436233268134678600,  # Automata
-        1436217207825629277,  # Moderator
-    }
+    # Rule type handled by this filter
+    RULE_TYPE = "gliquid_only"
     
     # Allowed words in gliquid messages
     ALLOWED_WORDS: Set[str] = {
@@ -52,30 +49,13 @@ class GliquidFilter:
         """Initialize gliquid filter."""
         pass
     
-    def is_gliquid_channel(self, channel_id: int) -> bool:
-        """Check if channel is the gliquid channel."""
-        return channel_id == self.GLIQUID_CHANNEL_ID
+    def get_rule(self, channel_id: int) -> Optional[ChannelRule]:
+        """Get the gliquid rule for a channel (None if not a gliquid channel)."""
+        return get_channel_rule_engine().find_rule(channel_id, self.RULE_TYPE)
     
-    def is_trusted_user(self, member: "Member") -> bool:
-        """
-        Check if user is trusted (has admin or trusted role).
-        
-        Args:
-            member: Discord member to check
-            
-        Returns:
-            True if user is trusted and bypasses filter
-        """
-        if not isinstance(member, discord.Member):
-            return False
-        
-        # Check for admin permissions
-        if member.guild_permissions.administrator:
-            return True
-        
-        # Check for trusted roles
-        user_role_ids = {role.id for role in member.roles}
-        return bool(user_role_ids & self.TRUSTED_ROLE_IDS)
+    def is_gliquid_channel(self, channel_id: int) -> bool:
+        """Check if channel is a gliquid channel."""
+        return self.get_rule(channel_id) is not None
     
     def clean_message_content(self, content: str) -> str:
         """
@@ -159,7 +139,7 @@ class GliquidFilter:
         self, 
         message: "Message",
         log_prefix: str = ""
-    ) -> bool:
+    ) -> FilterOutcome:
         """
         Filter a message in the gliquid channel.
         
@@ -168,16 +148,36 @@ class GliquidFilter:
             log_prefix: Prefix for log messages (e.g., "EDIT", "")
             
         Returns:
-            True if message was deleted (invalid), False if valid
+            FilterOutcome.DELETED if message was deleted (invalid), KEPT otherwise
         """
+        rule = self.get_rule(message.channel.id)
+        
         # Not gliquid channel - no filtering
-        if not self.is_gliquid_channel(message.channel.id):
-            return False
+        if rule is None:
+            return FilterOutcome.KEPT
         
-        # Trusted users bypass filter
-        if self.is_trusted_user(message.author):
-            return False
+        return await self.apply_rule(message, rule, log_prefix=log_prefix)
+    
+    async def apply_rule(
+        self,
+        message: "Message",
+        rule: ChannelRule,
+        log_prefix: str = ""
+    ) -> FilterOutcome:
+        """
+        Apply the gliquid rule to a message.
         
+        Valid messages get the gliquid reaction (trusted users included),
+        invalid messages from users without a bypass role are deleted.
+        
+        Args:
+            message: Discord message to filter
+            rule: Compiled gliquid channel rule
+            log_prefix: Prefix for log messages (e.g., "EDIT", "")
+            
+        Returns:
+            FilterOutcome.DELETED if message was deleted (invalid), KEPT otherwise
+        """
         # Check if valid
         if self.is_valid_message(message.content):
             # Valid message - add reaction
@@ -185,7 +185,11 @@ class GliquidFilter:
                 await message.add_reaction(self.GLIQUID_EMOJI)
             except Exception:
                 pass
-            return False
+            return FilterOutcome.KEPT
+        
+        # Trusted users bypass filter
+        if rule.bypasses(message.author):
+            return FilterOutcome.KEPT
         
         # Invalid message - delete
         try:
@@ -195,15 +199,15 @@ class GliquidFilter:
                 f"🗑️ {log_type} | deleted | @{message.author.name} | "
                 f"{message.content[:100]}"
             )
-            return True
+            return FilterOutcome.DELETED
         except discord.NotFound:
-            return True  # Already deleted
+            return FilterOutcome.DELETED  # Already deleted
         except discord.Forbidden:
             logger.warning(f"gliquid_filter{log_prefix}_no_permission")
-            return False
+            return FilterOutcome.KEPT
         except Exception as e:
             logger.error(f"gliquid_filter{log_prefix}_error: {e}")
-            return False
+            return FilterOutcome.KEPT
 
 
 # Singleton instance
@@ -13,6 +13,8 @@ from typing import Optional, List, Set, TYPE_CHECKING
 
 import discord
 
+from src.bot.bulk_actions import BulkAction, BulkActionExecutor
+from src.moderation.name_screening import SUSPICIOUS_RANGES, contains_suspicious_unicode
 from src.utils import get_logger
 
 if TYPE_CHECKING:
@@ -32,18 +34,8 @@ class MemberHandler:
     - Name change logging
     """
     
-    # Suspicious Unicode ranges (scam prevention)
-    SUSPICIOUS_RANGES = [
-        (0x0600, 0x06FF),  # Arabic (includes diacritics)
-        (0x0750, 0x077F),  # Arabic Supplement
-        (0x08A0, 0x08FF),  # Arabic Extended-A
-        (0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
-        (0xFE70, 0xFEFF),  # Arabic Presentation Forms-B
-        (0x200B, 0x200F),  # Zero-width spaces and direction marks
-        (0x2028, 0x202F),  # Line/paragraph separators
-        (0x2060, 0x206F),  # Word joiner, invisible operators
-        (0xFEFF, 0xFEFF),  # Zero-width no-break space (BOM)
-    ]
+    # Suspicious Unicode ranges (scam prevention, compiled in name_screening)
+    SUSPICIOUS_RANGES = SUSPICIOUS_RANGES
     
     def __init__(
         self,
@@ -78,16 +70,7 @@ class MemberHandler:
         Returns:
             True if suspicious characters found
         """
-        if not text:
-            return False
-        
-        for char in text:
-            code = ord(char)
-            for start, end in self.SUSPICIOUS_RANGES:
-                if start <= code <= end:
-                    return True
-        
-        return False
+        return contains_suspicious_unicode(text)
     
     async def ban_user_in_guilds(
         self, 
@@ -105,38 +88,55 @@ class MemberHandler:
             List of guild names where user was banned
         """
         banned_in = []
+        actions = []
         
         for guild in self.bot.guilds:
-            try:
-                member = guild.get_member(user.id)
-                if not member:
-                    continue
-                
-                # Skip bots and admins
-                if member.bot or member.guild_permissions.administrator:
-                    continue
-                
-                # Check if bot has permissions
-                if not guild.me.guild_permissions.ban_members:
-                    logger.warning(f"No ban_members permission in {guild.name}")
-                    continue
-                
-                # Ban user
-                await guild.ban(user, reason=reason, delete_message_days=1)
-                banned_in.append(guild.name)
-                
-                logger.warning(
-                    f"🔨 AUTO_BAN | @{user.name} ({user.id}) | "
-                    f"Guild: {guild.name} | Reason: {reason}"
-                )
-                
-            except discord.Forbidden:
-                logger.warning(f"Cannot ban {user.name} in {guild.name} - forbidden")
-            except Exception as e:
-                logger.error(f"Failed to ban {user.name} in {guild.name}: {e}")
+            member = guild.get_member(user.id)
+            if not member:
+                continue
+            
+            # Skip bots and admins
+            if member.bot or member.guild_permissions.administrator:
+                continue
+            
+            # Check if bot has permissions
+            if not guild.me.guild_permissions.ban_members:
+                logger.warning(f"No ban_members permission in {guild.name}")
+                continue
+            
+            actions.append(BulkAction(
+                bucket=f"bans:{guild.id}",
+                run=self._make_ban_action(guild, user, reason, banned_in),
+                key=str(guild.id),
+            ))
+        
+        # Bans in different guilds are separate rate-limit buckets - run concurrently
+        if actions:
+            result = await BulkActionExecutor().run(actions)
+            for error in result.errors:
+                logger.error(f"Failed to ban {user.name}: {error}")
         
         return banned_in
     
+    def _make_ban_action(
+        self,
+        guild: discord.Guild,
+        user: discord.User,
+        reason: str,
+        banned_in: List[str],
+    ):
+        """Build the bulk action coroutine for banning user in one guild."""
+        async def ban():
+            await guild.ban(user, reason=reason, delete_message_days=1)
+            banned_in.append(guild.name)
+            
+            logger.warning(
+                f"🔨 AUTO_BAN | @{user.name} ({user.id}) | "
+                f"Guild: {guild.name} | Reason: {reason}"
+            )
+        
+        return ban
+    
     async def handle_member_join(self, member: discord.Member):
         """
         Handle new member joins.
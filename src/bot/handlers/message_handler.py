@@ -5,6 +5,7 @@ Handles the main message flow:
 - Command processing
 - Scam detection
 - Content filtering
+- Mention rate limiting
 - Agent routing
 - Response generation
 
@@ -14,12 +15,20 @@ Extracted from client.py for better maintainability.
 import re
 import asyncio
 from datetime import timedelta
-from typing import Optional, Dict, List, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 import discord
 
+from src.bot.conversation_memory import get_conversation_memory
 from src.bot.filters.gliquid_filter import get_gliquid_filter
-from src.utils import get_logger, console_print, get_channel_purposes
+from src.bot.intent_classifier import get_intent_classifier
+from src.bot.streaming_reply import ProgressiveReply, split_response
+from src.moderation.channel_rules import get_channel_rule_engine
+from src.moderation.filter_outcome import FilterOutcome
+from src.rag import get_recent_message_store
+from src.utils import get_logger, console_print, get_rate_limiter
+from src.utils.metrics import STAGE_LATENCY
+from src.utils.stage_pipeline import Stage, StagePipeline
 
 if TYPE_CHECKING:
     from src.agents import AgentFactory
@@ -83,8 +92,31 @@ class MessageHandler:
         # Gliquid filter (singleton)
         self.gliquid_filter = get_gliquid_filter()
         
-        # Conversation history per user
-        self.conversation_history: Dict[str, List[Dict[str, str]]] = {}
+        # Per-channel rules (gliquid, content filter) - one lookup per message
+        self.channel_rules = get_channel_rule_engine()
+        self.channel_rules.register_handler(
+            self.gliquid_filter.RULE_TYPE, self.gliquid_filter.apply_rule
+        )
+        if self.content_filter:
+            self.content_filter.register_rules(self.channel_rules)
+        # Other copies of channel/role config follow the same hot-reload
+        if self.scam_detector:
+            self.channel_rules.add_reload_listener(self.scam_detector.reload_config)
+        if self.submission_handler:
+            self.channel_rules.add_reload_listener(self.submission_handler.reload_config)
+        
+        # Per-user token bucket on mentions (checked before any agent work)
+        self.rate_limiter = get_rate_limiter() if self.config.rate_limit.enabled else None
+        
+        # Local intent layer (skips the AI router and unneeded RAG)
+        intent_settings = self.agent_factory.config.get('routing', {}).get('intent_classifier', {})
+        self.intent_classifier = (
+            get_intent_classifier(intent_settings) if intent_settings.get('enabled') else None
+        )
+        self.intent_agents = intent_settings.get('agents') or {}
+        
+        # Conversation history per user (bounded, persisted in SQLite)
+        self.conversation_memory = get_conversation_memory(getattr(bot, "llm_client", None))
     
     async def handle_message(self, message: discord.Message) -> bool:
         """
@@ -117,32 +149,17 @@ class MessageHandler:
             if is_submission:
                 return True
         
-        # Scam detection
-        if await self._handle_scam_detection(message):
+        # Moderation filters - each reports what it did, so a removed or
+        # flagged message short-circuits without re-fetching it from Discord
+        outcome = await self._handle_scam_detection(message)
+        if outcome.stops_pipeline:
             return True
         
-        # Gliquid channel filter
-        if await self.gliquid_filter.filter_message(message):
+        # Channel rules (gliquid, content filter)
+        outcome = await self.channel_rules.apply(message)
+        if outcome.stops_pipeline:
             return True
         
-        # Content filter
-        if self.content_filter:
-            await self.content_filter.filter_message(message)
-            try:
-                await message.channel.fetch_message(message.id)
-            except discord.NotFound:
-                return True
-            except:
-                pass
-        
-        # Valid gliquid message - add reaction
-        if self.gliquid_filter.is_gliquid_channel(message.channel.id):
-            if self.gliquid_filter.is_valid_message(message.content):
-                try:
-                    await message.add_reaction(self.gliquid_filter.GLIQUID_EMOJI)
-                except:
-                    pass
-        
         # Ignore messages without direct bot mention
         if self.bot.user not in message.mentions:
             return False  # Not handled - allow other processing
@@ -158,24 +175,65 @@ class MessageHandler:
             if await self.mod_handler.handle_command(message):
                 return True
         
+        # Rate limit mentions before any RAG/LLM work
+        if not await self._check_rate_limit(message):
+            return True
+        
         # Process with agent
-        await self._process_with_agent(message)
+        with STAGE_LATENCY.time(pipeline="message_handler", stage="mention_total"):
+            await self._process_with_agent(message)
         return True
     
-    async def _handle_scam_detection(self, message: discord.Message) -> bool:
+    async def _check_rate_limit(self, message: discord.Message) -> bool:
+        """
+        Take a token from the author's bucket.
+        
+        Limited users get one short local reply (no LLM call) per limited
+        streak; further mentions are ignored until tokens refill.
+        
+        Returns:
+            True if the message may be processed
+        """
+        if not self.rate_limiter:
+            return True
+        
+        result = self.rate_limiter.check(message.author.id, message.channel.id)
+        if result.allowed:
+            return True
+        
+        if result.first_denial:
+            logger.info(
+                "user_rate_limited",
+                user_id=message.author.id,
+                channel_id=message.channel.id,
+                retry_after=round(result.retry_after, 1),
+            )
+            try:
+                await message.reply(
+                    f"slow down a bit 🐢 try again in {max(1, round(result.retry_after))}s",
+                    delete_after=10,
+                )
+            except discord.HTTPException:
+                pass
+        
+        return False
+    
+    async def _handle_scam_detection(self, message: discord.Message) -> FilterOutcome:
         """
         Handle scam detection for message.
         
         Returns:
-            True if message was deleted (scam), False otherwise
+            DELETED if the message was removed, WARNED if it was flagged as
+            a scam but left in place, KEPT otherwise
         """
         if not self.scam_detector or not self.config.moderation.enabled:
-            return False
+            return FilterOutcome.KEPT
         
         # Pre-filter gliquid channel (faster than AI)
         pre_deleted = False
-        if self.gliquid_filter.is_gliquid_channel(message.channel.id):
-            if not self.gliquid_filter.is_trusted_user(message.author):
+        gliquid_rule = self.gliquid_filter.get_rule(message.channel.id)
+        if gliquid_rule:
+            if not gliquid_rule.bypasses(message.author):
                 if not self.gliquid_filter.is_valid_message(message.content):
                     try:
                         await message.delete()
@@ -203,12 +261,14 @@ class MessageHandler:
             )
             
             # Delete if not already pre-deleted
+            deleted = pre_deleted
             if detection_result.action in ["delete", "ban"] and not pre_deleted:
                 try:
                     await message.delete()
+                    deleted = True
                     logger.info("scam_message_deleted", message_id=message.id)
                 except discord.NotFound:
-                    pass
+                    deleted = True
                 except discord.Forbidden:
                     logger.warning("no_permission_to_delete_scam")
                 except Exception as e:
@@ -229,13 +289,13 @@ class MessageHandler:
                 except Exception as e:
                     logger.error(f"timeout_error: {e}")
             
-            return True
+            return FilterOutcome.DELETED if deleted else FilterOutcome.WARNED
         
         # Pre-deleted but not scam - still blocked
         if pre_deleted:
-            return True
+            return FilterOutcome.DELETED
         
-        return False
+        return FilterOutcome.KEPT
     
     async def _process_with_agent(self, message: discord.Message):
         """Process message with appropriate agent."""
@@ -248,15 +308,48 @@ class MessageHandler:
         console_print(f"  Channel: #{channel_name} ({channel_id})")
         console_print(f"  Length: {len(message.content)} chars")
         
+        reply: Optional[ProgressiveReply] = None
         try:
             # Extract query
-            query = message.content.replace(f"<@{self.bot.user.id}>", "").strip()
+            user_query = message.content.replace(f"<@{self.bot.user.id}>", "").strip()
+            
+            if not user_query and not message.reference and not (message.attachments or message.stickers):
+                await message.reply("yo what's good? drop your question 👀")
+                return
             
-            # Add reply context
-            query = await self._add_reply_context(message, query)
+            # Reply context, mentioned channel and routing are independent
+            # lookups - run them concurrently (routing only waits for the
+            # reply context when the mention has no text of its own)
+            timeouts = self.config.performance.stage_timeouts
+            stages = await StagePipeline("pre_agent", [
+                Stage(
+                    "reply_context",
+                    lambda _: self._add_reply_context(message, ""),
+                    timeout=timeouts.get("reply_context"),
+                    optional=True,
+                    default="",
+                ),
+                Stage(
+                    "channel_content",
+                    lambda _: self._fetch_mentioned_channel_content(message, user_query),
+                    timeout=timeouts.get("channel_content"),
+                    optional=True,
+                ),
+                Stage(
+                    "routing",
+                    lambda inputs: self._get_agent(
+                        user_query or inputs.get("reply_context", ""), channel_name, channel_id
+                    ),
+                    depends_on=() if user_query else ("reply_context",),
+                    timeout=timeouts.get("routing"),
+                    optional=True,
+                ),
+            ]).run()
+            
+            query = stages["reply_context"] + user_query
             
             # Add channel content if mentioned
-            channel_context = await self._fetch_mentioned_channel_content(message, query)
+            channel_context = stages["channel_content"]
             if channel_context:
                 query = f"{query}\n\n[CHANNEL CONTENT]\n{channel_context}"
                 console_print(f"  📺 Added channel context: {len(channel_context)} chars")
@@ -269,23 +362,11 @@ class MessageHandler:
                 await message.reply("yo what's good? drop your question 👀")
                 return
             
-            # Get agent
-            agent = await self._get_agent(query, channel_name, channel_id)
+            # Routing degrades to the default agent
+            agent, intent = stages["routing"] or (self._get_default_agent(), None)
             
             logger.info(f"💬 @{message.author.name}: {query[:60]}{'...' if len(query) > 60 else ''}")
             
-            # Update agent with guild context
-            if message.guild:
-                channel_list = ", ".join([
-                    f"<#{ch.id}>" for ch in message.guild.text_channels
-                    if ch.permissions_for(message.guild.me).view_channel
-                ][:30])
-                agent.set_guild_channels(channel_list)
-                
-                channel_purposes = get_channel_purposes()
-                if channel_purposes:
-                    agent.set_channel_purposes(channel_purposes)
-            
             # Process with typing indicator
             async with message.channel.typing():
                 console_print(f"\n⚙️  PROCESSING")
@@ -294,22 +375,39 @@ class MessageHandler:
                 
                 # Get conversation history
                 user_id = str(message.author.id)
-                conversation_history = self.conversation_history.get(user_id, [])
+                conversation_history = await self.conversation_memory.get_history(user_id)
                 
                 if conversation_history:
                     console_print(f"  Memory: {len(conversation_history) // 2} previous messages")
                 
-                # Generate response
-                full_response = await agent.process_message(message, query, conversation_history)
-                
-                # Post-process response
-                full_response = self._post_process_response(full_response)
-                
-                # Send response
-                await self._send_response(message, full_response)
+                if self.config.llm.streaming:
+                    # Reply after the first sentence, then edit as tokens arrive
+                    reply = ProgressiveReply(message)
+                    
+                    async def on_partial(text: str):
+                        await reply.update(self._post_process_response(text))
+                    
+                    full_response = await agent.process_message(
+                        message, query, conversation_history, on_partial=on_partial, intent=intent
+                    )
+                    full_response = self._post_process_response(full_response)
+                    await reply.finish(full_response)
+                else:
+                    # Generate response
+                    full_response = await agent.process_message(
+                        message, query, conversation_history, intent=intent
+                    )
+                    
+                    # Post-process response
+                    full_response = self._post_process_response(full_response)
+                    
+                    # Send response
+                    await self._send_response(message, full_response)
                 
-                # Update conversation history
-                self._update_history(user_id, query, full_response, agent.config.max_history)
+                # Update conversation history (channel content is not stored)
+                await self.conversation_memory.add_turn(
+                    user_id, query, full_response, agent.config.max_history
+                )
                 
                 console_print(f"\n✅ RESPONSE SENT")
                 console_print(f"  Response Length: {len(full_response)} chars")
@@ -320,23 +418,34 @@ class MessageHandler:
         
         except Exception as e:
             logger.error("message_handling_error", error=str(e), exc_info=True)
-            await message.reply("bruh something broke on my end 💀 try again in a sec")
+            error_text = "bruh something broke on my end 💀 try again in a sec"
+            # Don't leave a half-written streamed reply up
+            if not (reply and await reply.fail(error_text)):
+                await message.reply(error_text)
     
     async def _add_reply_context(self, message: discord.Message, query: str) -> str:
-        """Add context from replied message."""
+        """Add context from replied message (served locally when possible)."""
         if message.reference and message.reference.message_id:
             try:
-                referenced_msg = await message.channel.fetch_message(
-                    message.reference.message_id
-                )
-                if referenced_msg and referenced_msg.content:
+                referenced_msg = message.reference.resolved
+                if isinstance(referenced_msg, discord.Message):
+                    author_name, content = referenced_msg.author.name, referenced_msg.content
+                else:
+                    recent = await get_recent_message_store().get_message(
+                        message.channel, message.reference.message_id
+                    )
+                    if not recent:
+                        return query
+                    author_name, content = recent.author_name, recent.content
+                
+                if content:
                     reply_context = (
-                        f"[replying to @{referenced_msg.author.name}: "
-                        f"\"{referenced_msg.content[:500]}\"]\n\n"
+                        f"[replying to @{author_name}: "
+                        f"\"{content[:500]}\"]\n\n"
                     )
                     console_print(
-                        f"  📎 Reply context: @{referenced_msg.author.name}: "
-                        f"{referenced_msg.content[:60]}..."
+                        f"  📎 Reply context: @{author_name}: "
+                        f"{content[:60]}..."
                     )
                     return reply_context + query
             except Exception as e:
@@ -365,18 +474,16 @@ class MessageHandler:
             return None
         
         try:
-            messages_content = []
-            async for msg in target_channel.history(limit=max_messages):
-                if msg.content:
-                    timestamp = msg.created_at.strftime("%Y-%m-%d %H:%M")
-                    messages_content.append(
-                        f"[{timestamp}] @{msg.author.name}: {msg.content[:500]}"
-                    )
+            recent = await get_recent_message_store().get_recent(target_channel, limit=max_messages)
+            messages_content = [
+                f"[{msg.created_at.strftime('%Y-%m-%d %H:%M')}] @{msg.author_name}: {msg.content[:500]}"
+                for msg in recent
+                if msg.content
+            ]
             
             if not messages_content:
                 return None
             
-            messages_content.reverse()
             logger.info(f"📺 Fetched {len(messages_content)} messages from #{target_channel.name}")
             
             return f"Recent messages from #{target_channel.name}:\n\n" + "\n\n".join(messages_content)
@@ -386,7 +493,23 @@ class MessageHandler:
             return None
     
     async def _get_agent(self, query: str, channel_name: str, channel_id: int):
-        """Get appropriate agent for the query."""
+        """
+        Get appropriate agent for the query.
+        
+        Returns:
+            (agent, intent) - intent is the local decision when confident, else None
+        """
+        # Confident local decision - no LLM routing call
+        if self.intent_classifier:
+            decision = self.intent_classifier.classify(query)
+            if decision.confidence >= self.intent_classifier.min_confidence:
+                agent_id = self.intent_agents.get(decision.intent)
+                agent = (agent_id and self.agent_factory.get_agent(agent_id)) or self._get_default_agent()
+                
+                console_print("\n⚡ INTENT ROUTING")
+                console_print(f"  Agent: {agent.get_name()} | {decision.intent} ({decision.source}, {decision.confidence:.2f})")
+                return agent, decision
+        
         use_ai_routing = self.agent_factory.config.get('routing', {}).get('use_ai_routing', False)
         
         if use_ai_routing and self.ai_router:
@@ -405,15 +528,19 @@ class MessageHandler:
             console_print(f"  Agent: {agent.get_name()} ({routing_decision.agent})")
             console_print(f"  Confidence: {routing_decision.confidence:.2f}")
         else:
-            default_agent_id = self.agent_factory.config.get('routing', {}).get(
-                'default_agent', 'general_agent'
-            )
-            agent = self.agent_factory.get_agent(default_agent_id)
+            agent = self._get_default_agent()
             
             console_print(f"\n⚡ DIRECT ROUTING")
-            console_print(f"  Agent: {agent.get_name()} ({default_agent_id})")
+            console_print(f"  Agent: {agent.get_name()}")
         
-        return agent
+        return agent, None
+    
+    def _get_default_agent(self):
+        """Get the configured default agent."""
+        default_agent_id = self.agent_factory.config.get('routing', {}).get(
+            'default_agent', 'general_agent'
+        )
+        return self.agent_factory.get_agent(default_agent_id)
     
     def _post_process_response(self, response: str) -> str:
         """Post-process response (lowercase, dashes)."""
@@ -423,70 +550,10 @@ class MessageHandler:
     
     async def _send_response(self, message: discord.Message, response: str):
         """Send response, splitting if too long."""
-        max_length = 1950
-        
-        if len(response) <= max_length:
-            await message.reply(response)
-            return
-        
-        parts = []
-        remaining = response
-        
-        while remaining:
-            if len(remaining) <= max_length:
-                parts.append(remaining)
-                break
-            
-            split_pos = max_length
-            
-            # Try paragraph split
-            para_split = remaining.rfind("\n\n", 0, max_length)
-            if para_split > max_length * 0.5:
-                split_pos = para_split + 2
-            else:
-                # Try sentence split
-                sent_split = max(
-                    remaining.rfind(". ", 0, max_length),
-                    remaining.rfind("! ", 0, max_length),
-                    remaining.rfind("? ", 0, max_length),
-                )
-                if sent_split > max_length * 0.5:
-                    split_pos = sent_split + 2
-                else:
-                    # Word boundary
-                    space_split = remaining.rfind(" ", 0, max_length)
-                    if space_split > 0:
-                        split_pos = space_split + 1
-            
-            parts.append(remaining[:split_pos])
-            remaining = remaining[split_pos:]
+        parts = split_response(response)
         
         for i, part in enumerate(parts):
             if i == 0:
                 await message.reply(part)
             else:
                 await message.channel.send(part)
-    
-    def _update_history(
-        self, 
-        user_id: str, 
-        query: str, 
-        response: str, 
-        max_pairs: int
-    ):
-        """Update conversation history for user."""
-        if user_id not in self.conversation_history:
-            self.conversation_history[user_id] = []
-        
-        self.conversation_history[user_id].append({"role": "user", "content": query})
-        self.conversation_history[user_id].append({"role": "assistant", "content": response})
-        
-        # Trim to max pairs
-        if len(self.conversation_history[user_id]) > max_pairs * 2:
-            self.conversation_history[user_id] = self.conversation_history[user_id][-(max_pairs * 2):]
-        
-        logger.debug(
-            "conversation_history_updated",
-            user_id=user_id,
-            history_length=len(self.conversation_history[user_id]) // 2,
-        )
@@ -254,6 +254,7 @@ response:"""
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=40,
                 temperature=0.85,
+                purpose="mod_response",
             )
             result = response.content.strip().lower()
             
@@ -4,6 +4,8 @@ Scheduler handler for periodic tasks.
 Handles scheduled tasks:
 - Daily reports
 - Activity checks
+- Impersonation sweeps
+- User activity counter refresh (rows written by other processes)
 
 Extracted from client.py for better maintainability.
 """
@@ -19,6 +21,7 @@ from src.utils import get_logger
 if TYPE_CHECKING:
     from src.analytics import DailyReportGenerator
     from src.analytics.activity_checker import ActivityChecker
+    from src.moderation.impersonation_sweep import ImpersonationSweep
 
 logger = get_logger(__name__)
 
@@ -39,6 +42,7 @@ class SchedulerHandler:
         config,
         report_generator: Optional["DailyReportGenerator"] = None,
         activity_checker: Optional["ActivityChecker"] = None,
+        impersonation_sweep: Optional["ImpersonationSweep"] = None,
     ):
         """
         Initialize scheduler handler.
@@ -48,15 +52,19 @@ class SchedulerHandler:
             config: Bot configuration
             report_generator: Daily report generator
             activity_checker: Activity checker instance
+            impersonation_sweep: Full-guild impersonation sweep
         """
         self.bot = bot
         self.config = config
         self.report_generator = report_generator
         self.activity_checker = activity_checker
+        self.impersonation_sweep = impersonation_sweep
         
         # Task references
         self.daily_report_task: Optional[asyncio.Task] = None
         self.activity_check_task: Optional[asyncio.Task] = None
+        self.impersonation_sweep_task: Optional[asyncio.Task] = None
+        self.user_activity_refresh_task: Optional[asyncio.Task] = None
     
     def start_all(self):
         """Start all scheduled tasks."""
@@ -71,6 +79,16 @@ class SchedulerHandler:
             self.activity_check_task = asyncio.create_task(
                 self._activity_check_scheduler()
             )
+        
+        if self.impersonation_sweep:
+            self.impersonation_sweep_task = asyncio.create_task(
+                self._impersonation_sweep_scheduler()
+            )
+        
+        if self.config.auto_indexing.user_activity_refresh_interval > 0:
+            self.user_activity_refresh_task = asyncio.create_task(
+                self._user_activity_refresh_scheduler()
+            )
     
     def cancel_all(self):
         """Cancel all scheduled tasks."""
@@ -79,6 +97,12 @@ class SchedulerHandler:
         
         if self.activity_check_task:
             self.activity_check_task.cancel()
+        
+        if self.impersonation_sweep_task:
+            self.impersonation_sweep_task.cancel()
+        
+        if self.user_activity_refresh_task:
+            self.user_activity_refresh_task.cancel()
     
     async def _daily_report_scheduler(self):
         """Background task to send daily reports at scheduled time."""
@@ -234,3 +258,74 @@ class SchedulerHandler:
             
         except Exception as e:
             logger.error("activity_report_send_failed", error=str(e), exc_info=True)
+    
+    async def _user_activity_refresh_scheduler(self):
+        """Background task to reload per-user message counts from SQLite."""
+        await self.bot.wait_until_ready()
+        from src.rag import get_message_storage
+        
+        interval = self.config.auto_indexing.user_activity_refresh_interval
+        storage = get_message_storage()
+        
+        while not self.bot.is_closed():
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(storage.refresh_user_activity)
+            except Exception as e:
+                logger.error("user_activity_refresh_error", error=str(e))
+    
+    async def _impersonation_sweep_scheduler(self):
+        """Background task to sweep all guilds for impersonation at scheduled time."""
+        await self.bot.wait_until_ready()
+        
+        while not self.bot.is_closed():
+            try:
+                now = datetime.utcnow()
+                schedule = self.impersonation_sweep.config.get("schedule", {})
+                
+                target_time = now.replace(
+                    hour=schedule.get("hour", 4),
+                    minute=schedule.get("minute", 30),
+                    second=0,
+                    microsecond=0
+                )
+                
+                if now >= target_time:
+                    target_time += timedelta(days=1)
+                
+                sleep_seconds = (target_time - now).total_seconds()
+                
+                await asyncio.sleep(sleep_seconds)
+                await self._run_impersonation_sweeps()
+                
+            except asyncio.CancelledError:
+                logger.info("impersonation_sweep_scheduler_cancelled")
+                break
+            except Exception as e:
+                logger.error("impersonation_sweep_scheduler_error", error=str(e), exc_info=True)
+                await asyncio.sleep(3600)
+    
+    async def _run_impersonation_sweeps(self):
+        """Sweep every guild (resumes interrupted sweeps from checkpoint)."""
+        from src.moderation.impersonation_sweep import SweepAlreadyRunning
+        
+        allowed_guilds = self.config.discord.allowed_guilds
+        
+        for guild in self.bot.guilds:
+            if allowed_guilds and guild.id not in allowed_guilds:
+                continue
+            
+            if self.impersonation_sweep.is_running(guild.id):
+                continue
+            
+            try:
+                await self.impersonation_sweep.run(guild)
+            except SweepAlreadyRunning:
+                continue  # Started manually in the meantime
+            except Exception as e:
+                logger.error(
+                    "scheduled_impersonation_sweep_failed",
+                    guild_id=guild.id,
+                    error=str(e),
+                    exc_info=True,
+                )
@@ -10,11 +10,19 @@ Extracted from client.py for better maintainability.
 """
 
 import asyncio
-from typing import Dict, Set, Any, Optional, TYPE_CHECKING
+from typing import Callable, Dict, Set, Any, Optional, TYPE_CHECKING
 
 import discord
 
-from src.utils import get_logger, console_print, ScraperProgress
+from src.utils import get_logger, console_print, ScraperProgress, AdaptiveConcurrency, ThroughputMeter
+from src.utils.metrics import SCRAPED_MESSAGES
+from src.utils.adaptive_concurrency import (
+    estimate_channel_size,
+    install_rate_limit_listener,
+    prioritize_channels,
+    remove_rate_limit_listener,
+    timed_history,
+)
 from src.rag import get_message_storage, StoredMessage
 
 if TYPE_CHECKING:
@@ -23,14 +31,19 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Seconds between scraper throughput reports
+PROGRESS_REPORT_INTERVAL = 15
+
 
 class ScraperHandler:
     """
     Handler for background message scraping.
     
     Features:
-    - Incremental scraping (resume from last message)
-    - Parallel channel scraping
+    - Incremental scraping (catch-up after newest, backfill below oldest)
+    - Mid-channel checkpoints (resume after crash/restart)
+    - Adaptive parallel channel scraping (AIMD on 429s / latency)
+    - Recently active and largest channels first
     - Batch indexing to SQLite
     - Progress tracking
     """
@@ -65,6 +78,10 @@ class ScraperHandler:
             "channels_scraped": 0,
             "users_tracked": set(),
         }
+        
+        # Set per scraper run
+        self.concurrency: Optional[AdaptiveConcurrency] = None
+        self.throughput: Optional[ThroughputMeter] = None
     
     async def start_background_scraper(self):
         """
@@ -106,14 +123,28 @@ class ScraperHandler:
             
             self.scraping_enabled = True
             
-            # Get all guilds (only allowed ones)
-            allowed_guilds = self.config.discord.allowed_guilds
-            for guild in self.bot.guilds:
-                if allowed_guilds and guild.id not in allowed_guilds:
-                    logger.debug(f"skipped_guild: {guild.name}")
-                    continue
-                
-                await self._scrape_guild(guild)
+            auto_indexing = self.config.auto_indexing
+            self.concurrency = AdaptiveConcurrency(
+                initial=auto_indexing.parallel_channels,
+                maximum=auto_indexing.max_parallel_channels,
+                latency_backoff_ratio=auto_indexing.latency_backoff_ratio,
+            )
+            self.throughput = ThroughputMeter()
+            rate_limit_listener = install_rate_limit_listener(self.concurrency)
+            reporter = asyncio.create_task(self._report_progress())
+            
+            try:
+                # Get all guilds (only allowed ones)
+                allowed_guilds = self.config.discord.allowed_guilds
+                for guild in self.bot.guilds:
+                    if allowed_guilds and guild.id not in allowed_guilds:
+                        logger.debug(f"skipped_guild: {guild.name}")
+                        continue
+                    
+                    await self._scrape_guild(guild)
+            finally:
+                reporter.cancel()
+                remove_rate_limit_listener(rate_limit_listener)
             
             # Print final statistics
             self._log_final_stats()
@@ -145,18 +176,26 @@ class ScraperHandler:
             
             valid_channels.append(channel)
         
-        # Parallel scraping
+        # Adaptive parallel scraping
         if valid_channels:
-            max_parallel = self.config.auto_indexing.parallel_channels
+            if self.concurrency is None:
+                self.concurrency = AdaptiveConcurrency(
+                    initial=self.config.auto_indexing.parallel_channels,
+                    maximum=self.config.auto_indexing.max_parallel_channels,
+                    latency_backoff_ratio=self.config.auto_indexing.latency_backoff_ratio,
+                )
+            if self.throughput is None:
+                self.throughput = ThroughputMeter()
+            
+            ordered = prioritize_channels(valid_channels, size_of=self._remaining_work)
             console_print(
-                f"   🚀 Scraping {len(valid_channels)} channels "
-                f"(max {max_parallel} concurrent)..."
+                f"   🚀 Scraping {len(ordered)} channels "
+                f"({self.concurrency.limit} concurrent, adaptive up to "
+                f"{self.concurrency.maximum})..."
             )
             
-            semaphore = asyncio.Semaphore(max_parallel)
-            
             async def scrape_with_limit(channel):
-                async with semaphore:
+                async with self.concurrency.slot():
                     try:
                         await self._scrape_channel(
                             channel,
@@ -167,7 +206,42 @@ class ScraperHandler:
                     except Exception as e:
                         logger.error(f"channel_scraping_error: {channel.name}: {e}")
             
-            await asyncio.gather(*[scrape_with_limit(ch) for ch in valid_channels])
+            # Tasks queue on the limiter in priority order
+            await asyncio.gather(*[scrape_with_limit(ch) for ch in ordered])
+    
+    def _remaining_work(self, channel: discord.TextChannel) -> float:
+        """Estimate how much history is left to scrape in a channel."""
+        channel_id = str(channel.id)
+        
+        if not self.scraper_progress.is_backfill_complete(channel_id):
+            oldest = self.scraper_progress.get_oldest_message_id(channel_id)
+            return estimate_channel_size(channel, before_id=int(oldest) if oldest else None)
+        
+        # Only catch-up left: time since the newest scraped message
+        newest = self.scraper_progress.get_last_message_id(channel_id)
+        if not newest or not channel.last_message_id:
+            return 0.0
+        span = (
+            discord.utils.snowflake_time(channel.last_message_id)
+            - discord.utils.snowflake_time(int(newest))
+        )
+        return max(0.0, span.total_seconds())
+    
+    def _on_history_page(self, latency: float):
+        """Feed history request latency to the concurrency controller."""
+        if self.concurrency:
+            self.concurrency.record_success(latency)
+    
+    async def _report_progress(self):
+        """Periodically print scraper throughput."""
+        while True:
+            await asyncio.sleep(PROGRESS_REPORT_INTERVAL)
+            console_print(
+                f"   📈 {self.throughput.count} msgs | "
+                f"{self.throughput.per_second:.1f} msg/s | "
+                f"{self.concurrency.in_flight}/{self.concurrency.limit} channels active | "
+                f"{self.concurrency.rate_limits} rate limits"
+            )
     
     async def _initialize_progress_tracking(self):
         """Initialize progress tracking without scraping."""
@@ -208,11 +282,12 @@ class ScraperHandler:
                         break
                     
                     if latest_message:
-                        self.scraper_progress.update_progress(
+                        # History before this point is intentionally skipped
+                        self.scraper_progress.checkpoint(
                             channel_id=channel_id,
                             channel_name=channel.name,
-                            last_message_id=str(latest_message.id),
-                            messages_scraped=0,
+                            newest_message_id=str(latest_message.id),
+                            backfill_complete=True,
                         )
                         console_print(
                             f"   📌 #{channel.name} - Tracking from "
@@ -237,7 +312,12 @@ class ScraperHandler:
         """
         Scrape historical messages from a channel.
         
-        Uses incremental scraping - only new messages since last run.
+        Runs two passes with separate cursors:
+        - catch-up: messages newer than the newest scraped one (oldest first)
+        - backfill: older history below the oldest-seen message, until done
+        
+        Both passes checkpoint every N batches, so a restart mid-channel
+        resumes from the last checkpoint instead of re-walking history.
         """
         channel_name = channel.name
         channel_id = str(channel.id)
@@ -252,94 +332,210 @@ class ScraperHandler:
                 )
                 return
         
-        # Check if channel was scraped before
-        last_message_id = self.scraper_progress.get_last_message_id(channel_id)
+        counts = {"scraped": 0, "indexed": 0, "bots": 0, "empty": 0, "duplicates": 0}
+        
+        try:
+            newest_message_id = self.scraper_progress.get_last_message_id(channel_id)
+            if newest_message_id:
+                await self._catch_up_channel(channel, newest_message_id, counts)
+            
+            if not self.scraper_progress.is_backfill_complete(channel_id):
+                await self._backfill_channel(channel, limit, counts)
+        
+        except Exception as e:
+            logger.error(f"channel_scraping_error: {channel_name}: {e}", exc_info=True)
+        
+        # Update statistics
+        self.stats["messages_scraped"] += counts["scraped"]
+        self.stats["messages_indexed"] += counts["indexed"]
+        self.stats["channels_scraped"] += 1
+        
+        # Log
+        total_skipped = counts["bots"] + counts["empty"] + counts["duplicates"]
+        if total_skipped > 0 or counts["indexed"] > 0:
+            console_print(
+                f"   ✅ #{channel_name}: {counts['indexed']} indexed | "
+                f"skipped: {counts['bots']} bots, {counts['duplicates']} dupes, "
+                f"{counts['empty']} empty"
+            )
+    
+    async def _catch_up_channel(
+        self,
+        channel: discord.TextChannel,
+        newest_message_id: str,
+        counts: Dict[str, int],
+    ):
+        """Scrape messages newer than the newest scraped one."""
+        channel_id = str(channel.id)
+        
+        def save(first_id: str, last_id: str, indexed: int, scanned: int):
+            # Oldest-first walk: the last message seen is the newest
+            self.scraper_progress.checkpoint(
+                channel_id=channel_id,
+                channel_name=channel.name,
+                newest_message_id=last_id,
+                messages_scraped=indexed,
+            )
+        
+        history = channel.history(
+            limit=None,
+            after=discord.Object(id=int(newest_message_id)),
+            oldest_first=True,
+        )
+        await self._process_history(channel, history, counts, save)
+    
+    async def _backfill_channel(
+        self,
+        channel: discord.TextChannel,
+        limit: Optional[int],
+        counts: Dict[str, int],
+    ):
+        """
+        Scrape older history, resuming below the oldest-seen message.
+        
+        `limit` caps the whole backfill, not each run: messages scanned by
+        earlier (interrupted) runs are subtracted on resume.
+        """
+        channel_id = str(channel.id)
+        oldest_message_id = self.scraper_progress.get_oldest_message_id(channel_id)
+        has_newest = self.scraper_progress.get_last_message_id(channel_id) is not None
+        
+        if limit is not None:
+            limit -= self.scraper_progress.get_backfill_scanned(channel_id)
+            if limit <= 0:
+                self.scraper_progress.checkpoint(
+                    channel_id=channel_id,
+                    channel_name=channel.name,
+                    backfill_complete=True,
+                )
+                return
+        
+        if oldest_message_id:
+            console_print(f"   ↩️  #{channel.name}: resuming backfill from {oldest_message_id[-8:]}")
+        
+        def save(first_id: str, last_id: str, indexed: int, scanned: int):
+            # Newest-first walk: the first message seen is the newest
+            # (only recorded if catch-up has no cursor yet)
+            nonlocal has_newest
+            self.scraper_progress.checkpoint(
+                channel_id=channel_id,
+                channel_name=channel.name,
+                newest_message_id=None if has_newest else first_id,
+                oldest_message_id=last_id,
+                messages_scraped=indexed,
+                backfill_scanned=scanned,
+            )
+            has_newest = True
         
-        messages_count = 0
-        indexed_count = 0
-        batch_count = 0
-        latest_message_id = None
+        history = channel.history(
+            limit=limit,
+            before=discord.Object(id=int(oldest_message_id)) if oldest_message_id else None,
+            oldest_first=False,
+        )
+        await self._process_history(channel, history, counts, save)
+        
+        # History exhausted (or limit reached) - backfill done
+        self.scraper_progress.checkpoint(
+            channel_id=channel_id,
+            channel_name=channel.name,
+            backfill_complete=True,
+        )
+    
+    async def _process_history(
+        self,
+        channel: discord.TextChannel,
+        history,
+        counts: Dict[str, int],
+        save: Callable[[str, str, int, int], None],
+    ):
+        """
+        Filter, deduplicate and index messages from a history iterator.
+        
+        Every `checkpoint_every_batches` batches the pending batch is
+        flushed and `save(first_id, last_id, indexed, scanned)` is called, so a
+        checkpoint never gets ahead of what is stored.
+        
+        Args:
+            channel: Channel being scraped
+            history: channel.history() iterator
+            counts: Running counters (updated in place)
+            save: Checkpoint callback
+        """
+        channel_name = channel.name
+        channel_id = str(channel.id)
+        batch_size = self.config.auto_indexing.batch_size
+        checkpoint_every = batch_size * max(1, self.config.auto_indexing.checkpoint_every_batches)
+        
+        first_id: Optional[str] = None
+        last_id: Optional[str] = None
+        seen_since_checkpoint = 0
+        indexed_since_checkpoint = 0
+        progress_count = 0
         message_batch = []
-        BATCH_SIZE = self.config.auto_indexing.batch_size
         
-        # Skip counters
-        skipped_bots = 0
-        skipped_empty = 0
-        skipped_duplicates = 0
+        async def flush():
+            nonlocal message_batch, indexed_since_checkpoint
+            if message_batch:
+                indexed = await self._index_batch(message_batch, channel_id, channel_name)
+                counts["indexed"] += indexed
+                indexed_since_checkpoint += indexed
+                message_batch = []
         
-        try:
-            after = discord.Object(id=int(last_message_id)) if last_message_id else None
+        async for message in timed_history(history, self._on_history_page):
+            if self.throughput:
+                self.throughput.add()
+            SCRAPED_MESSAGES.inc()
             
-            async for message in channel.history(limit=limit, oldest_first=False, after=after):
-                # Skip bot messages
-                if message.author.bot and self.config.auto_indexing.exclude_bots:
-                    skipped_bots += 1
-                    continue
-                
-                # Skip empty messages
-                if not self._has_content(message):
-                    skipped_empty += 1
-                    continue
-                
-                messages_count += 1
-                batch_count += 1
-                
-                if latest_message_id is None:
-                    latest_message_id = str(message.id)
-                
-                # Progress indicator
-                if batch_count >= 100:
-                    console_print(
-                        f"     📦 #{channel_name}: {messages_count} processed, "
-                        f"{indexed_count} indexed..."
-                    )
-                    batch_count = 0
-                
-                # Check for duplicate
-                if self.message_storage.message_exists(str(message.id)):
-                    skipped_duplicates += 1
-                    continue
-                
-                message_batch.append(message)
-                
-                # Process batch
-                if len(message_batch) >= BATCH_SIZE:
-                    indexed_count += await self._index_batch(
-                        message_batch, channel_id, channel_name
-                    )
-                    message_batch = []
-            
-            # Process remaining
-            if message_batch:
-                indexed_count += await self._index_batch(
-                    message_batch, channel_id, channel_name
-                )
+            # Checkpoint up to the previous message (fully handled)
+            if seen_since_checkpoint >= checkpoint_every:
+                await flush()
+                save(first_id, last_id, indexed_since_checkpoint, seen_since_checkpoint)
+                seen_since_checkpoint = 0
+                indexed_since_checkpoint = 0
             
-            # Update statistics
-            self.stats["messages_scraped"] += messages_count
-            self.stats["messages_indexed"] += indexed_count
-            self.stats["channels_scraped"] += 1
+            if first_id is None:
+                first_id = str(message.id)
+            last_id = str(message.id)
+            seen_since_checkpoint += 1
             
-            # Save progress
-            if latest_message_id:
-                self.scraper_progress.update_progress(
-                    channel_id=channel_id,
-                    channel_name=channel_name,
-                    last_message_id=latest_message_id,
-                    messages_scraped=indexed_count,
-                )
+            # Skip bot messages
+            if message.author.bot and self.config.auto_indexing.exclude_bots:
+                counts["bots"] += 1
+                continue
+            
+            # Skip empty messages
+            if not self._has_content(message):
+                counts["empty"] += 1
+                continue
+            
+            counts["scraped"] += 1
+            progress_count += 1
             
-            # Log
-            total_skipped = skipped_bots + skipped_empty + skipped_duplicates
-            if total_skipped > 0 or indexed_count > 0:
+            # Progress indicator
+            if progress_count >= 100:
                 console_print(
-                    f"   ✅ #{channel_name}: {indexed_count} indexed | "
-                    f"skipped: {skipped_bots} bots, {skipped_duplicates} dupes, "
-                    f"{skipped_empty} empty"
+                    f"     📦 #{channel_name}: {counts['scraped']} processed, "
+                    f"{counts['indexed']} indexed"
+                    + (f" ({self.throughput.per_second:.1f} msg/s overall)" if self.throughput else "")
+                    + "..."
                 )
+                progress_count = 0
+            
+            # Check for duplicate
+            if self.message_storage.message_exists(str(message.id)):
+                counts["duplicates"] += 1
+                continue
+            
+            message_batch.append(message)
+            
+            # Process batch
+            if len(message_batch) >= batch_size:
+                await flush()
         
-        except Exception as e:
-            logger.error(f"channel_scraping_error: {channel_name}: {e}", exc_info=True)
+        # Process remaining and save final position
+        await flush()
+        if last_id is not None:
+            save(first_id, last_id, indexed_since_checkpoint, seen_since_checkpoint)
     
     def _has_content(self, message: discord.Message) -> bool:
         """Check if message has any content."""
@@ -435,6 +631,8 @@ class ScraperHandler:
             total_indexed=self.stats["messages_indexed"],
             total_channels=self.stats["channels_scraped"],
             total_users=len(self.stats["users_tracked"]),
+            messages_per_second=round(self.throughput.per_second, 1) if self.throughput else None,
+            rate_limits=self.concurrency.rate_limits if self.concurrency else 0,
         )
         
         console_print(f"\n{'='*80}")
@@ -448,6 +646,13 @@ class ScraperHandler:
         )
         console_print(f"  Channels Scraped: {self.stats['channels_scraped']}")
         console_print(f"  Users Tracked: {len(self.stats['users_tracked'])}")
+        if self.throughput:
+            console_print(f"  Throughput: {self.throughput.per_second:.1f} msg/s")
+        if self.concurrency:
+            console_print(
+                f"  Concurrency: {self.concurrency.limit} channels "
+                f"({self.concurrency.rate_limits} rate limits)"
+            )
         console_print(f"{'='*80}\n")
     
     async def auto_index_message(self, message: discord.Message):
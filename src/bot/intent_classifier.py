@@ -0,0 +1,363 @@
+"""
+Local intent classification for incoming mentions.
+
+Decides, without an LLM call, what a message needs:
+- smalltalk - greetings/reactions: no RAG, no tools
+- question  - informational: RAG (agent tools still run)
+- tool      - channel reads/lists, web search: tools first, RAG only if no
+                tool returned output
+
+Keyword/regex rules handle the obvious cases; everything else goes through
+a logistic regression over hashed word and character n-grams trained from
+logged queries (scripts/train_intent_classifier.py). Low-confidence
+decisions fall back to the LLM router / full pipeline. The model mostly
+learns from rule-labeled queries but only sees the ones no rule matched,
+so its decisions never skip RAG.
+"""
+
+import asyncio
+import json
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+SMALLTALK = "smalltalk"
+QUESTION = "question"
+TOOL = "tool"
+INTENTS = (SMALLTALK, QUESTION, TOOL)
+
+# What each intent needs up front: (rag, tools). TOOL falls back to RAG when
+# no tool returns output (BaseAgent).
+INTENT_NEEDS = {
+    SMALLTALK: (False, False),
+    QUESTION: (True, True),
+    TOOL: (False, True),
+}
+
+DEFAULT_MODEL_PATH = Path("data/intent_model.npz")
+DEFAULT_SAMPLE_LOG = Path("data/intent_samples.jsonl")
+
+# Hashed feature space (2^14 weights per intent)
+N_FEATURES = 1 << 14
+
+# Sample logging stops once the log reaches this size
+MAX_SAMPLE_LOG_BYTES = 5 * 1024 * 1024
+
+# Greetings and reactions (whole message)
+_SMALLTALK_WORDS = {
+    "gm", "gn", "gliquid", "hi", "hey", "hello", "sup", "yo", "wsg", "wassup",
+    "привет", "пока", "ку", "здарова",
+    "lmao", "lol", "kek", "nice", "cool", "bruh", "based", "fr", "true",
+    "thanks", "thank you", "ty", "thx", "ok", "okay", "np",
+    "how are you", "wbu", "good bot", "gm gm",
+}
+_SMALLTALK_TOKENS = {w for w in _SMALLTALK_WORDS if " " not in w}
+
+_EMOJI_ONLY_RE = re.compile(r"^[\W_]+$")
+
+# User mentions are not a tool signal: "@user how do I set TP/SL?" is a question
+_TOOL_RE = re.compile(
+    r"<#\d+>"
+    r"|\b(list|show|all|what|available) channels\b"
+    r"|\b(read|check|прочитай)\s+#?[\w-]+"
+    r"|\bwhat.*(in|happening).*#[\w-]+"
+    r"|\b(search|look up|latest news|найди|поиск)\b"
+    r"|(список|покажи|какие|все) каналы",
+    re.IGNORECASE,
+)
+
+_QUESTION_RE = re.compile(
+    r"\?\s*$"
+    r"|^(what|how|why|when|where|who|which|is|are|can|does|do|wen|explain|что|как|почему|когда|где)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class IntentDecision:
+    """Local routing decision for one message."""
+    intent: str
+    confidence: float
+    source: str  # rules | model | default
+
+    @property
+    def needs_rag(self) -> bool:
+        # The model is trained on a different distribution than it predicts on
+        if self.source == "model":
+            return True
+        return INTENT_NEEDS[self.intent][0]
+
+    @property
+    def needs_tools(self) -> bool:
+        return INTENT_NEEDS[self.intent][1]
+
+
+def hashed_features(text: str) -> np.ndarray:
+    """Indices of word 1-2 grams and character 3-grams (stable across processes)."""
+    text = " ".join(text.lower().split())
+    words = re.findall(r"\w+|[^\w\s]", text)
+
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {text} "
+    grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+    return np.unique(np.fromiter(
+        (zlib.crc32(g.encode("utf-8")) % N_FEATURES for g in grams),
+        dtype=np.int64,
+        count=len(grams),
+    ))
+
+
+class HashedLogisticRegression:
+    """Multinomial logistic regression over binary hashed n-gram features."""
+
+    def __init__(self, labels: Sequence[str] = INTENTS):
+        self.labels = list(labels)
+        self.weights = np.zeros((len(self.labels), N_FEATURES), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+    def predict_proba(self, text: str) -> np.ndarray:
+        idx = hashed_features(text)
+        scale = 1.0 / np.sqrt(max(1, len(idx)))
+        return _softmax(self.weights[:, idx].sum(axis=1) * scale + self.bias)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        probs = self.predict_proba(text)
+        best = int(np.argmax(probs))
+        return self.labels[best], float(probs[best])
+
+    def fit(
+        self,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        epochs: int = 15,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ):
+        """Train with plain SGD (sparse updates)."""
+        features = [hashed_features(t) for t in texts]
+        targets = np.array([self.labels.index(label) for label in labels])
+        rng = np.random.default_rng(seed)
+
+        for _ in range(epochs):
+            for i in rng.permutation(len(features)):
+                idx = features[i]
+                scale = 1.0 / np.sqrt(max(1, len(idx)))
+                probs = _softmax(self.weights[:, idx].sum(axis=1) * scale + self.bias)
+                grad = probs
+                grad[targets[i]] -= 1.0
+
+                self.weights[:, idx] -= learning_rate * (
+                    np.outer(grad, np.full(len(idx), scale)) + l2 * self.weights[:, idx]
+                )
+                self.bias -= learning_rate * grad
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, labels=np.array(self.labels))
+
+    @classmethod
+    def load(cls, path: Path) -> "HashedLogisticRegression":
+        data = np.load(path)
+        model = cls(labels=[str(label) for label in data["labels"]])
+        if data["weights"].shape != model.weights.shape:
+            raise ValueError(f"Feature size mismatch: {data['weights'].shape}")
+        model.weights = data["weights"].astype(np.float32)
+        model.bias = data["bias"].astype(np.float32)
+        return model
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp = np.exp(scores - scores.max())
+    return exp / exp.sum()
+
+
+def rule_intent(query: str) -> Optional[str]:
+    """Intent from keyword/regex rules (None if no rule applies)."""
+    text = query.strip()
+    if not text or _EMOJI_ONLY_RE.match(text):
+        return SMALLTALK
+
+    # Mentions are not part of the question ("<@123> how do I ...")
+    stripped = re.sub(r"<@[!&]?\d+>", " ", text).strip()
+    normalized = " ".join(re.sub(r"[^\w\s]", " ", stripped.lower()).split())
+    words = normalized.split()
+
+    # Questions keep RAG (and tools) even when they contain tool keywords:
+    # "how do I search for a market?" needs docs, not a web search
+    if len(words) >= 3 and _QUESTION_RE.search(stripped):
+        return QUESTION
+
+    if _TOOL_RE.search(text):
+        return TOOL
+
+    if not words:
+        return SMALLTALK
+    if normalized in _SMALLTALK_WORDS:
+        return SMALLTALK
+    # "hey vault fees" is a question with a greeting in front: every word
+    # has to be smalltalk
+    if all(word in _SMALLTALK_TOKENS for word in words) and "?" not in text:
+        return SMALLTALK
+
+    return None
+
+
+class IntentClassifier:
+    """
+    Rules + hashed n-gram model.
+
+    Usage:
+        classifier = get_intent_classifier(settings)
+        decision = classifier.classify(query)
+        if decision.confidence >= classifier.min_confidence:
+            ...
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[Path] = DEFAULT_MODEL_PATH,
+        sample_log: Optional[Path] = DEFAULT_SAMPLE_LOG,
+        min_confidence: float = 0.7,
+    ):
+        """
+        Initialize classifier.
+
+        Args:
+            model_path: Trained model file (rules only if missing)
+            sample_log: JSONL file queries and decisions are appended to (None = off)
+            min_confidence: Below this the caller should fall back
+        """
+        self.min_confidence = min_confidence
+        self.sample_log = sample_log
+        self.model: Optional[HashedLogisticRegression] = None
+
+        # Samples are appended in batches from a worker thread
+        self._pending_samples: List[str] = []
+        self._sample_task: Optional[asyncio.Task] = None
+
+        if model_path and model_path.exists():
+            try:
+                self.model = HashedLogisticRegression.load(model_path)
+                logger.info("intent_model_loaded", path=str(model_path))
+            except Exception as e:
+                logger.warning("intent_model_load_failed", path=str(model_path), error=str(e))
+
+        self.stats: Dict[str, int] = {"rules": 0, "model": 0, "default": 0, "low_confidence": 0}
+
+    def classify(self, query: str) -> IntentDecision:
+        """Classify a query (rules first, then the model)."""
+        started = time.perf_counter()
+
+        intent = rule_intent(query)
+        if intent:
+            decision = IntentDecision(intent, 1.0, "rules")
+        elif self.model:
+            intent, confidence = self.model.predict(query)
+            decision = IntentDecision(intent, confidence, "model")
+        else:
+            decision = IntentDecision(QUESTION, 0.0, "default")
+
+        self.stats[decision.source] += 1
+        if decision.confidence < self.min_confidence:
+            self.stats["low_confidence"] += 1
+
+        logger.debug(
+            "intent_classified",
+            intent=decision.intent,
+            confidence=round(decision.confidence, 3),
+            source=decision.source,
+            latency_us=round((time.perf_counter() - started) * 1e6),
+        )
+        self._log_sample(query, decision)
+        return decision
+
+    def _log_sample(self, query: str, decision: IntentDecision):
+        """Queue the query for later training (written off the event loop)."""
+        if not self.sample_log or not query.strip():
+            return
+        self._pending_samples.append(json.dumps({
+            "query": query[:500],
+            "intent": decision.intent,
+            "source": decision.source,
+            "confidence": round(decision.confidence, 3),
+        }, ensure_ascii=False) + "\n")
+
+        if self._sample_task is not None and not self._sample_task.done():
+            return  # The running flush picks this line up
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_samples(self._take_samples())  # No loop (scripts)
+            return
+        self._sample_task = loop.create_task(self._flush_samples())
+
+    def _take_samples(self) -> List[str]:
+        lines, self._pending_samples = self._pending_samples, []
+        return lines
+
+    async def _flush_samples(self):
+        while self._pending_samples:
+            await asyncio.to_thread(self._write_samples, self._take_samples())
+
+    def _write_samples(self, lines: List[str]):
+        try:
+            if self.sample_log.exists() and self.sample_log.stat().st_size >= MAX_SAMPLE_LOG_BYTES:
+                return
+            self.sample_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.sample_log, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError as e:
+            logger.debug("intent_sample_log_failed", error=str(e))
+
+def load_samples(path: Path, sources: Sequence[str] = ("rules", "manual")) -> List[Tuple[str, str]]:
+    """
+    Read labeled queries from a sample log.
+
+    Only rule-labeled lines and hand-labeled lines (source "manual") are used;
+    the last label wins for repeated queries.
+    """
+    samples: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if row.get("source") in sources and row.get("intent") in INTENTS:
+                samples[row["query"]] = row["intent"]
+    return list(samples.items())
+
+
+# Singleton instance
+_classifier: Optional[IntentClassifier] = None
+
+
+def get_intent_classifier(settings: Optional[dict] = None) -> IntentClassifier:
+    """
+    Get singleton intent classifier.
+
+    Args:
+        settings: routing.intent_classifier section of agents.yaml (first call)
+    """
+    global _classifier
+    if _classifier is None:
+        settings = settings or {}
+        sample_log = settings.get("sample_log", str(DEFAULT_SAMPLE_LOG))
+        _classifier = IntentClassifier(
+            model_path=Path(settings.get("model_path", str(DEFAULT_MODEL_PATH))),
+            sample_log=Path(sample_log) if sample_log else None,
+            min_confidence=settings.get("min_confidence", 0.7),
+        )
+    return _classifier
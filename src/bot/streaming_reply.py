@@ -0,0 +1,192 @@
+"""
+Progressive Discord replies for streamed LLM responses.
+
+The first reply is posted as soon as the first sentence is complete; after
+that the reply is edited at most once per `edit_interval` (message edits
+share a per-channel rate limit), and text past the 2000-char message limit
+continues in follow-up messages using the same split rules as regular
+replies.
+"""
+
+import asyncio
+import re
+import time
+from typing import List, Optional
+
+import discord
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Max characters per Discord message (below the 2000 limit)
+MAX_MESSAGE_LENGTH = 1950
+
+# First reply waits for a sentence end or this many characters
+FIRST_REPLY_MIN_CHARS = 160
+
+# Sentence end followed by whitespace (a trailing "1." may still become "1.5")
+_SENTENCE_END_RE = re.compile(r"[.!?…]\s|\n")
+
+
+def split_response(response: str, max_length: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """
+    Split a response into Discord-sized parts.
+
+    Prefers paragraph breaks, then sentence ends, then word boundaries.
+    A part only depends on the text up to its end, so splitting a growing
+    (streamed) text keeps earlier parts stable.
+    """
+    if len(response) <= max_length:
+        return [response]
+
+    parts = []
+    remaining = response
+
+    while remaining:
+        if len(remaining) <= max_length:
+            parts.append(remaining)
+            break
+
+        split_pos = max_length
+
+        # Try paragraph split
+        para_split = remaining.rfind("\n\n", 0, max_length)
+        if para_split > max_length * 0.5:
+            split_pos = para_split + 2
+        else:
+            # Try sentence split
+            sent_split = max(
+                remaining.rfind(". ", 0, max_length),
+                remaining.rfind("! ", 0, max_length),
+                remaining.rfind("? ", 0, max_length),
+            )
+            if sent_split > max_length * 0.5:
+                split_pos = sent_split + 2
+            else:
+                # Word boundary
+                space_split = remaining.rfind(" ", 0, max_length)
+                if space_split > 0:
+                    split_pos = space_split + 1
+
+        parts.append(remaining[:split_pos])
+        remaining = remaining[split_pos:]
+
+    return parts
+
+
+class ProgressiveReply:
+    """
+    Reply that grows while the LLM streams.
+
+    Usage:
+        reply = ProgressiveReply(message)
+        ... await reply.update(text_so_far)  # per delta
+        await reply.finish(final_text)  # or: await reply.fail(error_text)
+    """
+
+    def __init__(self, message: discord.Message, edit_interval: float = 1.2):
+        """
+        Initialize progressive reply.
+
+        Args:
+            message: Message being replied to
+            edit_interval: Min seconds between edits
+        """
+        self.message = message
+        self.edit_interval = edit_interval
+
+        self._sent: List[discord.Message] = []
+        self._sent_content: List[str] = []
+        self._latest = ""
+        self._last_flush = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self.first_reply_at: Optional[float] = None  # monotonic time of first visible text
+
+    @property
+    def started(self) -> bool:
+        """Whether any part of the reply is visible."""
+        return bool(self._sent)
+
+    async def update(self, text: str):
+        """
+        Offer the accumulated text; flushes when due.
+
+        Never blocks on Discord: flushes run in the background, one at a time.
+        """
+        self._latest = text
+
+        if self._flush_task and not self._flush_task.done():
+            return
+
+        if not self._sent:
+            if not _first_sentence_ready(text):
+                return
+        elif time.monotonic() - self._last_flush < self.edit_interval:
+            return
+
+        self._flush_task = asyncio.create_task(self._flush())
+
+    async def finish(self, text: str):
+        """Publish the final text (edits/sends whatever is still missing)."""
+        if self._flush_task:
+            try:
+                await self._flush_task
+            except Exception:
+                pass
+
+        self._latest = text
+        await self._flush()
+
+    async def fail(self, text: str) -> bool:
+        """
+        Replace a partially streamed reply with an error message.
+
+        Returns:
+            False if nothing was visible yet (caller should reply normally)
+        """
+        await self.finish(text)
+        return self.started
+
+    async def _flush(self):
+        text = self._latest
+        if not text.strip():
+            return
+
+        self._last_flush = time.monotonic()
+        parts = split_response(text)
+
+        try:
+            for i, part in enumerate(parts):
+                if i < len(self._sent):
+                    if self._sent_content[i] != part:
+                        await self._sent[i].edit(content=part)
+                        self._sent_content[i] = part
+                    continue
+
+                if i == 0:
+                    sent = await self.message.reply(part)
+                    self.first_reply_at = time.monotonic()
+                else:
+                    sent = await self.message.channel.send(part)
+                self._sent.append(sent)
+                self._sent_content.append(part)
+
+            # Final formatting can shorten the text into fewer parts
+            while len(self._sent) > len(parts):
+                try:
+                    await self._sent[-1].delete()
+                except discord.NotFound:
+                    pass
+                self._sent.pop()
+                self._sent_content.pop()
+
+        except discord.HTTPException as e:
+            logger.warning("progressive_reply_flush_failed", error=str(e))
+
+
+def _first_sentence_ready(text: str) -> bool:
+    stripped = text.lstrip()
+    if not stripped:
+        return False
+    return len(stripped) >= FIRST_REPLY_MIN_CHARS or _SENTENCE_END_RE.search(stripped) is not None
@@ -1,9 +1,24 @@
 """LLM client modules."""
 
-from .openrouter_client import ChatResponse, OpenRouterClient, Usage
+from .openrouter_client import ChatResponse, ChatStream, OpenRouterClient, Usage
+from .scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    MODERATION,
+    LLMRequestRejected,
+    LLMScheduler,
+    get_llm_scheduler,
+)
 
 __all__ = [
     "OpenRouterClient",
     "ChatResponse",
+    "ChatStream",
     "Usage",
+    "LLMScheduler",
+    "LLMRequestRejected",
+    "get_llm_scheduler",
+    "MODERATION",
+    "INTERACTIVE",
+    "BACKGROUND",
 ]
@@ -7,11 +7,13 @@ Features:
 - Retry logic with exponential backoff
 - Async support
 - Structured output support
+- SSE streaming (async iterator of content deltas)
+- Priority scheduling (global concurrency cap, see scheduler.py)
 """
 
 import json
 import time
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, TypeVar
 
 import httpx
 from pydantic import BaseModel
@@ -23,6 +25,9 @@ from tenacity import (
 )
 
 from src.utils import get_logger, log_llm_request
+from src.utils.metrics import LLM_COST, LLM_LATENCY, LLM_QUEUE_WAIT, LLM_TOKENS
+
+from .scheduler import INTERACTIVE, LLMScheduler, get_llm_scheduler
 
 logger = get_logger(__name__)
 
@@ -40,6 +45,11 @@ class Usage(BaseModel):
     completion_cost: float = 0.0
     total_cost: float = 0.0
     cache_discount: float = 0.0
+    
+    @property
+    def cached_ratio(self) -> float:
+        """Share of prompt tokens served from the provider's prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
 
 
 class ChatResponse(BaseModel):
@@ -49,6 +59,106 @@ class ChatResponse(BaseModel):
     usage: Usage
     latency_ms: float = 0.0
     finish_reason: Optional[str] = None
+    first_token_ms: Optional[float] = None  # Streaming only
+    priority: str = INTERACTIVE
+    purpose: str = "chat"  # Caller tag for usage accounting (chat, routing, scam_analysis, ...)
+    queue_wait_ms: float = 0.0  # Time spent waiting for a scheduler slot
+
+
+class ChatStream:
+    """
+    Streaming chat completion.
+
+    Iterate for content deltas; once exhausted, `response` holds the full
+    ChatResponse with usage (sent by OpenRouter in the final SSE chunk).
+
+    Usage:
+        stream = client.stream_completion(messages)
+        async for delta in stream:
+            ...
+        print(stream.response.usage.total_tokens)
+    """
+
+    def __init__(
+        self,
+        client: "OpenRouterClient",
+        payload: Dict[str, Any],
+        priority: str = INTERACTIVE,
+        purpose: str = "chat",
+    ):
+        self._client = client
+        self._payload = payload
+        self._priority = priority
+        self._purpose = purpose
+        self.response: Optional[ChatResponse] = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        # The slot is held until the stream ends (or the consumer stops iterating)
+        async with self._client.scheduler.slot(self._priority) as queue_wait:
+            async for delta in self._iterate_stream(queue_wait):
+                yield delta
+
+    async def _iterate_stream(self, queue_wait: float) -> AsyncIterator[str]:
+        start_time = time.time()
+        first_token_ms = None
+        parts: List[str] = []
+        usage_data: Dict[str, Any] = {}
+        finish_reason = None
+        model = self._payload["model"]
+
+        try:
+            async with self._client.client.stream(
+                "POST",
+                f"{self._client.base_url}/chat/completions",
+                json={**self._payload, "stream": True},
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    # SSE: "data: {...}"; lines starting with ":" are keep-alive comments
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+
+                    chunk = json.loads(data)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"].get("message", "stream error"))
+                    if chunk.get("usage"):
+                        usage_data = chunk["usage"]
+                    model = chunk.get("model", model)
+
+                    for choice in chunk.get("choices", []):
+                        finish_reason = choice.get("finish_reason") or finish_reason
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            if first_token_ms is None:
+                                first_token_ms = (time.time() - start_time) * 1000
+                            parts.append(delta)
+                            yield delta
+
+        except httpx.HTTPStatusError as e:
+            logger.error("openrouter_stream_http_error", status=e.response.status_code, error=e.response.text[:200])
+            raise
+
+        self.response = ChatResponse(
+            content="".join(parts),
+            model=model,
+            usage=self._client._parse_usage(usage_data),
+            latency_ms=(time.time() - start_time) * 1000,
+            finish_reason=finish_reason,
+            first_token_ms=first_token_ms,
+            priority=self._priority,
+            purpose=self._purpose,
+            queue_wait_ms=queue_wait * 1000,
+        )
+        self._client._log_usage(self.response)
 
 
 class OpenRouterClient:
@@ -65,6 +175,7 @@ class OpenRouterClient:
         model: str = "x-ai/grok-beta",
         base_url: str = "https://openrouter.ai/api/v1",
         timeout: int = 30,
+        scheduler: Optional[LLMScheduler] = None,
     ):
         """
         Initialize OpenRouter client.
@@ -74,11 +185,13 @@ class OpenRouterClient:
             model: Model identifier (default: x-ai/grok-beta)
             base_url: API base URL
             timeout: Request timeout in seconds
+            scheduler: LLM request scheduler (default: shared global scheduler)
         """
         self.api_key = api_key
         self.model = model
         self.base_url = base_url
         self.timeout = timeout
+        self.scheduler = scheduler or get_llm_scheduler()
         
         self.client = httpx.AsyncClient(
             headers={
@@ -109,6 +222,8 @@ class OpenRouterClient:
         temperature: float = 0.7,
         max_tokens: int = 2000,
         stream: bool = False,
+        priority: str = INTERACTIVE,
+        purpose: str = "chat",
         **kwargs
     ) -> ChatResponse:
         """
@@ -122,32 +237,38 @@ class OpenRouterClient:
             system_prompt: Optional system prompt (will be cached)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
-            stream: Enable streaming (not yet implemented)
+            stream: Receive the completion over SSE (collected into one response)
+            priority: Scheduler class (moderation, interactive, background)
+            purpose: Usage accounting tag (chat, routing, scam_analysis, caption, ...)
             **kwargs: Additional model parameters
         
         Returns:
             ChatResponse with content and usage metrics
+        
+        Raises:
+            LLMRequestRejected: Request was shed or timed out in the queue
         """
-        start_time = time.time()
+        payload = self._build_payload(messages, system_prompt, temperature, max_tokens, **kwargs)
         
-        # Prepend system prompt if provided (automatically cached)
-        if system_prompt:
-            messages = [
-                {"role": "system", "content": system_prompt},
-                *messages
-            ]
+        if stream:
+            # Collect the stream (use stream_completion() for incremental output)
+            chat_stream = ChatStream(self, payload, priority, purpose)
+            async for _ in chat_stream:
+                pass
+            return chat_stream.response
         
-        # Build request payload with usage tracking
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "usage": {
-                "include": True  # Enable detailed usage tracking
-            },
-            **kwargs
-        }
+        async with self.scheduler.slot(priority) as queue_wait:
+            return await self._post_completion(payload, priority, purpose, queue_wait)
+    
+    async def _post_completion(
+        self,
+        payload: Dict[str, Any],
+        priority: str,
+        purpose: str,
+        queue_wait: float,
+    ) -> ChatResponse:
+        """Send a non-streaming completion request (caller holds a scheduler slot)."""
+        start_time = time.time()
         
         # Removed verbose request logging
         
@@ -167,28 +288,7 @@ class OpenRouterClient:
             finish_reason = choice.get("finish_reason")
             
             # Parse usage metrics from OpenRouter
-            usage_data = data.get("usage", {})
-            prompt_details = usage_data.get("prompt_tokens_details", {})
-            completion_details = usage_data.get("completion_tokens_details", {})
-            cost_details = usage_data.get("cost_details", {})
-            
-            usage = Usage(
-                prompt_tokens=usage_data.get("prompt_tokens", 0),
-                completion_tokens=usage_data.get("completion_tokens", 0),
-                total_tokens=usage_data.get("total_tokens", 0),
-                cached_tokens=prompt_details.get("cached_tokens", 0),
-            )
-            
-            # Parse cost information (OpenRouter provides cost in credits)
-            # 1 credit = $0.000001 USD
-            cost_in_credits = usage_data.get("cost")
-            if cost_in_credits is not None:
-                usage.total_cost = cost_in_credits / 1_000_000  # Convert to USD
-            
-            # Upstream cost (for BYOK)
-            upstream_cost = cost_details.get("upstream_inference_cost")
-            if upstream_cost is not None:
-                usage.prompt_cost = upstream_cost / 1_000_000  # Convert to USD
+            usage = self._parse_usage(data.get("usage", {}))
             
             # Calculate latency
             latency_ms = (time.time() - start_time) * 1000
@@ -200,6 +300,9 @@ class OpenRouterClient:
                 usage=usage,
                 latency_ms=latency_ms,
                 finish_reason=finish_reason,
+                priority=priority,
+                purpose=purpose,
+                queue_wait_ms=queue_wait * 1000,
             )
             
             # Log usage metrics
@@ -229,6 +332,88 @@ class OpenRouterClient:
             )
             raise
     
+    def stream_completion(
+        self,
+        messages: List[Dict[str, any]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        priority: str = INTERACTIVE,
+        purpose: str = "chat",
+        **kwargs
+    ) -> ChatStream:
+        """
+        Streaming chat completion (SSE).
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: Optional system prompt (will be cached)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            priority: Scheduler class (moderation, interactive, background)
+            purpose: Usage accounting tag
+            **kwargs: Additional model parameters
+        
+        Returns:
+            ChatStream - async iterator of content deltas; `.response`
+            has the full ChatResponse with usage after iteration
+        """
+        payload = self._build_payload(messages, system_prompt, temperature, max_tokens, **kwargs)
+        return ChatStream(self, payload, priority, purpose)
+    
+    def _build_payload(
+        self,
+        messages: List[Dict[str, any]],
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat completion request payload."""
+        # Prepend system prompt if provided (automatically cached)
+        if system_prompt:
+            messages = [
+                {"role": "system", "content": system_prompt},
+                *messages
+            ]
+        
+        # Build request payload with usage tracking
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "usage": {
+                "include": True  # Enable detailed usage tracking
+            },
+            **kwargs
+        }
+    
+    def _parse_usage(self, usage_data: Dict[str, Any]) -> Usage:
+        """Parse OpenRouter usage block into Usage."""
+        prompt_details = usage_data.get("prompt_tokens_details") or {}
+        cost_details = usage_data.get("cost_details") or {}
+        
+        usage = Usage(
+            prompt_tokens=usage_data.get("prompt_tokens", 0),
+            completion_tokens=usage_data.get("completion_tokens", 0),
+            total_tokens=usage_data.get("total_tokens", 0),
+            cached_tokens=prompt_details.get("cached_tokens", 0),
+        )
+        
+        # Parse cost information (OpenRouter provides cost in credits)
+        # 1 credit = $0.000001 USD
+        cost_in_credits = usage_data.get("cost")
+        if cost_in_credits is not None:
+            usage.total_cost = cost_in_credits / 1_000_000  # Convert to USD
+        
+        # Upstream cost (for BYOK)
+        upstream_cost = cost_details.get("upstream_inference_cost")
+        if upstream_cost is not None:
+            usage.prompt_cost = upstream_cost / 1_000_000  # Convert to USD
+        
+        return usage
+    
     def _log_usage(self, response: ChatResponse) -> None:
         """Log token usage and costs with structured logging."""
         log_llm_request(
@@ -241,9 +426,22 @@ class OpenRouterClient:
             cost_usd=response.usage.total_cost,
             cache_discount_usd=response.usage.cache_discount,
             latency_ms=response.latency_ms,  # Fixed: latency_ms is in ChatResponse, not Usage
+            priority=response.priority,
+            purpose=response.purpose,
+            queue_wait_ms=round(response.queue_wait_ms, 1),
+            cached_ratio=round(response.usage.cached_ratio, 3),
         )
         
-        # Track usage statistics (lazy import to avoid circular dependency)
+        # Metrics
+        labels = {"model": response.model, "purpose": response.purpose}
+        LLM_LATENCY.observe(response.latency_ms / 1000, **labels)
+        LLM_QUEUE_WAIT.observe(response.queue_wait_ms / 1000, priority=response.priority)
+        LLM_TOKENS.inc(response.usage.prompt_tokens, kind="prompt", **labels)
+        LLM_TOKENS.inc(response.usage.completion_tokens, kind="completion", **labels)
+        LLM_TOKENS.inc(response.usage.cached_tokens, kind="cached", **labels)
+        LLM_COST.inc(response.usage.total_cost, **labels)
+        
+        # Append to the usage ledger (buffered, no disk I/O here; lazy import to avoid circular dependency)
         try:
             from src.analytics.usage_tracker import get_usage_tracker
             tracker = get_usage_tracker()
@@ -253,6 +451,8 @@ class OpenRouterClient:
                 completion_tokens=response.usage.completion_tokens,
                 cached_tokens=response.usage.cached_tokens,
                 cost_usd=response.usage.total_cost,
+                purpose=response.purpose,
+                latency_ms=response.latency_ms,
             )
         except ImportError:
             pass  # Usage tracker not available yet (circular import)
@@ -273,7 +473,7 @@ class OpenRouterClient:
             response_model: Pydantic model class for structured output
             temperature: Sampling temperature (default lower for consistent structured output)
             max_tokens: Maximum tokens to generate
-            **kwargs: Additional model parameters
+            **kwargs: Additional model parameters (incl. priority)
             
         Returns:
             Instance of response_model with parsed structured data
@@ -335,7 +535,13 @@ class OpenRouterClient:
             raise
     
     async def close(self) -> None:
-        """Close HTTP client."""
+        """Flush buffered usage rows and close HTTP client."""
+        from src.analytics.usage_tracker import flush_usage_tracker
+        
+        try:
+            await flush_usage_tracker()
+        except Exception as e:
+            logger.error("usage_flush_on_close_failed", error=str(e))
         await self.client.aclose()
         logger.info("openrouter_client_closed")
     
@@ -0,0 +1,316 @@
+"""
+Priority scheduler for LLM requests.
+
+All OpenRouter calls share one global concurrency cap
+(`performance.max_concurrent_requests`). Requests are tagged with a
+priority class, and a freed slot always goes to the highest class that is
+below its own cap:
+
+1. moderation  - scam checks; may use every slot
+2. interactive - user-facing answers and routing
+3. background  - captioning/indexing; small cap, shed under load
+
+Interactive and background work together never take the last
+`moderation_reserve` slots.
+
+Queued requests give up after their class deadline, and background
+requests are rejected outright while higher classes are queueing, so a raid
+can't starve scam detection and a backfill can't starve users.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+from src.utils import get_config, get_logger
+
+logger = get_logger(__name__)
+
+# Priority classes (highest first)
+MODERATION = "moderation"
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITY_CLASSES = (MODERATION, INTERACTIVE, BACKGROUND)
+
+DEFAULT_MAX_CONCURRENT = 10
+
+# Per-class concurrency caps (clamped to the global cap)
+DEFAULT_CLASS_LIMITS = {
+    MODERATION: 10,
+    INTERACTIVE: 8,
+    BACKGROUND: 3,
+}
+
+# Max seconds a request may wait in the queue
+DEFAULT_QUEUE_DEADLINES = {
+    MODERATION: 20.0,
+    INTERACTIVE: 15.0,
+    BACKGROUND: 60.0,
+}
+
+# Slots only moderation may use
+DEFAULT_MODERATION_RESERVE = 2
+
+# Background requests beyond this many queued are shed
+DEFAULT_MAX_BACKGROUND_QUEUE = 20
+
+
+class LLMRequestRejected(Exception):
+    """Request was shed or exceeded its queue deadline."""
+
+    def __init__(self, priority: str, reason: str):
+        super().__init__(f"LLM request rejected ({priority}): {reason}")
+        self.priority = priority
+        self.reason = reason
+
+
+class _ClassStats:
+    """Queue-wait statistics for one priority class."""
+
+    def __init__(self):
+        self.started = 0
+        self.queued = 0  # Requests that had to wait
+        self.shed = 0
+        self.expired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_start(self, wait: float):
+        self.started += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if wait > 0:
+            self.queued += 1
+
+
+class LLMScheduler:
+    """
+    Global LLM concurrency governor with priority classes.
+
+    Usage:
+        scheduler = get_llm_scheduler()
+        async with scheduler.slot("moderation") as wait:
+            response = await http_call()
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        class_limits: Optional[Dict[str, int]] = None,
+        queue_deadlines: Optional[Dict[str, float]] = None,
+        moderation_reserve: int = DEFAULT_MODERATION_RESERVE,
+        max_background_queue: int = DEFAULT_MAX_BACKGROUND_QUEUE,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrent: Global cap on in-flight LLM requests
+            class_limits: Per-class caps (missing classes use defaults)
+            queue_deadlines: Per-class max queue wait in seconds
+            moderation_reserve: Slots kept free for moderation
+            max_background_queue: Queued background requests before shedding
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        limits = {**DEFAULT_CLASS_LIMITS, **(class_limits or {})}
+        self.class_limits = {
+            cls: min(max(1, limits[cls]), self.max_concurrent) for cls in PRIORITY_CLASSES
+        }
+        self.queue_deadlines = {**DEFAULT_QUEUE_DEADLINES, **(queue_deadlines or {})}
+        self.moderation_reserve = min(max(0, moderation_reserve), self.max_concurrent - 1)
+        self.max_background_queue = max_background_queue
+
+        self.in_flight: Dict[str, int] = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            cls: deque() for cls in PRIORITY_CLASSES
+        }
+        self._stats: Dict[str, _ClassStats] = {cls: _ClassStats() for cls in PRIORITY_CLASSES}
+
+    @property
+    def total_in_flight(self) -> int:
+        return sum(self.in_flight.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: str = INTERACTIVE):
+        """
+        Hold one LLM request slot.
+
+        Yields:
+            Seconds spent waiting in the queue
+
+        Raises:
+            LLMRequestRejected: Shed (background) or queue deadline exceeded
+        """
+        wait = await self.acquire(priority)
+        try:
+            yield wait
+        finally:
+            self.release(priority)
+
+    async def acquire(self, priority: str) -> float:
+        """
+        Wait for a slot (pair with release()).
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        if priority not in self.class_limits:
+            raise ValueError(f"Unknown LLM priority class: {priority}")
+
+        if self._can_start_now(priority):
+            self._start(priority)
+            self._stats[priority].record_start(0.0)
+            return 0.0
+
+        if priority == BACKGROUND:
+            self._maybe_shed()
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+
+        try:
+            await asyncio.wait({future}, timeout=self.queue_deadlines.get(priority))
+        except asyncio.CancelledError:
+            self._abandon(priority, future)
+            raise
+
+        if not future.done():
+            self._abandon(priority, future)
+            self._stats[priority].expired += 1
+            logger.warning(
+                "llm_queue_deadline_exceeded",
+                priority=priority,
+                waited_s=round(time.monotonic() - started, 2),
+                queued=len(self._waiters[priority]),
+            )
+            raise LLMRequestRejected(priority, "queue deadline exceeded")
+
+        wait = time.monotonic() - started
+        self._stats[priority].record_start(wait)
+        logger.debug("llm_queue_wait", priority=priority, wait_ms=round(wait * 1000, 1))
+        return wait
+
+    def release(self, priority: str):
+        """Free a slot and hand it to the highest-priority waiter."""
+        self.in_flight[priority] -= 1
+        self._dispatch()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-class load and queue-wait stats.
+
+        Returns:
+            {class: {in_flight, queued_now, limit, started, queued, shed,
+                     expired, avg_wait_ms, max_wait_ms}}
+        """
+        result = {}
+        for cls in PRIORITY_CLASSES:
+            stats = self._stats[cls]
+            result[cls] = {
+                "in_flight": self.in_flight[cls],
+                "queued_now": sum(1 for f in self._waiters[cls] if not f.done()),
+                "limit": self.class_limits[cls],
+                "started": stats.started,
+                "queued": stats.queued,
+                "shed": stats.shed,
+                "expired": stats.expired,
+                "avg_wait_ms": round(stats.total_wait / stats.started * 1000, 1) if stats.started else 0.0,
+                "max_wait_ms": round(stats.max_wait * 1000, 1),
+            }
+        return result
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _has_capacity(self, priority: str) -> bool:
+        if self.total_in_flight >= self.max_concurrent:
+            return False
+        if self.in_flight[priority] >= self.class_limits[priority]:
+            return False
+        if priority != MODERATION:
+            shared = self.total_in_flight - self.in_flight[MODERATION]
+            return shared < self.max_concurrent - self.moderation_reserve
+        return True
+
+    def _can_start_now(self, priority: str) -> bool:
+        # Don't jump ahead of queued requests of the same class, or of a
+        # higher class that is only waiting for a global slot
+        for cls in PRIORITY_CLASSES:
+            if cls == priority:
+                if self._waiters[cls]:
+                    return False
+                break
+            if self._waiters[cls] and self.in_flight[cls] < self.class_limits[cls]:
+                return False
+        return self._has_capacity(priority)
+
+    def _start(self, priority: str):
+        self.in_flight[priority] += 1
+
+    def _dispatch(self):
+        """Grant free slots to waiters, highest class first."""
+        while self.total_in_flight < self.max_concurrent:
+            for cls in PRIORITY_CLASSES:
+                waiters = self._waiters[cls]
+                while waiters and waiters[0].done():
+                    waiters.popleft()  # Cancelled / expired
+                if waiters and self._has_capacity(cls):
+                    self._start(cls)
+                    waiters.popleft().set_result(None)
+                    break
+            else:
+                return
+
+    def _abandon(self, priority: str, future: asyncio.Future):
+        """Withdraw a waiter; a slot granted in the meantime is passed on."""
+        if future.done() and not future.cancelled():
+            self.release(priority)
+            return
+        future.cancel()
+        try:
+            self._waiters[priority].remove(future)
+        except ValueError:
+            pass
+
+    def _maybe_shed(self):
+        """Reject a background request that would have to queue under load."""
+        higher_waiting = any(self._waiters[cls] for cls in (MODERATION, INTERACTIVE))
+        backlog = len(self._waiters[BACKGROUND])
+
+        if higher_waiting or backlog >= self.max_background_queue:
+            self._stats[BACKGROUND].shed += 1
+            reason = "higher priority requests queued" if higher_waiting else "background queue full"
+            logger.info("llm_background_request_shed", reason=reason, backlog=backlog)
+            raise LLMRequestRejected(BACKGROUND, reason)
+
+
+# Singleton instance
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get singleton LLM scheduler (configured from performance settings)."""
+    global _scheduler
+    if _scheduler is None:
+        try:
+            performance = get_config().performance
+            _scheduler = LLMScheduler(
+                max_concurrent=performance.max_concurrent_requests,
+                class_limits=performance.llm_scheduler.get("class_limits"),
+                queue_deadlines=performance.llm_scheduler.get("queue_deadlines"),
+                moderation_reserve=performance.llm_scheduler.get(
+                    "moderation_reserve", DEFAULT_MODERATION_RESERVE
+                ),
+                max_background_queue=performance.llm_scheduler.get(
+                    "max_background_queue", DEFAULT_MAX_BACKGROUND_QUEUE
+                ),
+            )
+        except Exception as e:
+            # Scripts may run without the full config
+            logger.warning("llm_scheduler_config_unavailable", error=str(e))
+            _scheduler = LLMScheduler()
+    return _scheduler
@@ -7,6 +7,8 @@ from .alert_sender import AlertSender
 from .impersonation_checker import ImpersonationChecker
 from .promotion_notifier import PromotionNotifier
 from .content_filter import ContentFilter
+from .filter_outcome import FilterOutcome
+from .channel_rules import ChannelRule, ChannelRuleEngine, get_channel_rule_engine
 from .submission_storage import (
     SubmissionStorage,
     SubmissionStatus,
@@ -25,6 +27,10 @@ __all__ = [
     "ImpersonationChecker",
     "PromotionNotifier",
     "ContentFilter",
+    "FilterOutcome",
+    "ChannelRule",
+    "ChannelRuleEngine",
+    "get_channel_rule_engine",
     # Content submission system
     "SubmissionStorage",
     "SubmissionStatus",
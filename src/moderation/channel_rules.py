@@ -0,0 +1,288 @@
+"""
+Per-channel rule engine for channel filters.
+
+Channel rules (x.com-only, attachments-only, gliquid-only, ...) are compiled
+from config into a `channel_id -> ordered rule list` map with precomputed
+role-bypass sets. Each message does one dict lookup and runs only the rules
+of its channel.
+
+Rule logic lives in the filters (ContentFilter, GliquidFilter), which
+register a handler per rule type. Config files are checked for changes
+periodically and rules are recompiled without a restart; components with
+their own copy of channel/role config (content filter, strict link
+filter, submission channels) register reload listeners and are refreshed
+from the same reload.
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import discord
+
+from src.moderation.filter_outcome import FilterOutcome
+from src.utils import get_config, get_logger, load_config
+from src.utils.config import Config
+
+logger = get_logger(__name__)
+
+# Known rule types (handlers are registered by the filters)
+RULE_TYPES = {"x_links_only", "attachments_only", "links_or_images", "gliquid_only"}
+
+# Config files that affect compiled rules
+WATCHED_CONFIG_FILES = ("features.yaml", "channels.yaml", "roles.yaml", "moderation.yaml")
+
+
+@dataclass(frozen=True)
+class ChannelRule:
+    """Compiled rule for a single channel."""
+    channel_id: int
+    kind: str
+    warning: Optional[str] = None
+    bypass_role_ids: FrozenSet[int] = frozenset()
+    bypass_admins: bool = False
+
+    def bypasses(self, member: discord.abc.User) -> bool:
+        """Check if member is exempt from this rule."""
+        if not isinstance(member, discord.Member):
+            return False
+
+        if self.bypass_admins and member.guild_permissions.administrator:
+            return True
+
+        if not self.bypass_role_ids:
+            return False
+
+        return any(role.id in self.bypass_role_ids for role in member.roles)
+
+
+RuleHandler = Callable[[discord.Message, ChannelRule], Awaitable[FilterOutcome]]
+ReloadListener = Callable[[Config], None]
+
+
+def _role_ids(values: Iterable) -> FrozenSet[int]:
+    """Convert role IDs from config (strings) to a set of ints."""
+    return frozenset(int(v) for v in values or [] if str(v).strip())
+
+
+def compile_channel_rules(config: Config) -> Dict[int, Tuple[ChannelRule, ...]]:
+    """
+    Compile channel rules from config.
+
+    Args:
+        config: Loaded bot configuration
+
+    Returns:
+        Mapping of channel_id to its ordered rules
+    """
+    rules_config = config.channel_rules
+    default_bypass = _role_ids(rules_config.bypass_roles)
+
+    compiled: Dict[int, list] = {}
+
+    for entry in rules_config.rules:
+        if not entry.channel:
+            logger.warning("channel_rule_missing_channel", rule=entry.rule)
+            continue
+
+        if entry.rule not in RULE_TYPES:
+            logger.warning("unknown_channel_rule", rule=entry.rule, channel=entry.channel)
+            continue
+
+        channel_id = int(entry.channel)
+        bypass = default_bypass if entry.bypass_roles is None else _role_ids(entry.bypass_roles)
+
+        compiled.setdefault(channel_id, []).append(ChannelRule(
+            channel_id=channel_id,
+            kind=entry.rule,
+            warning=entry.warning,
+            bypass_role_ids=bypass,
+            bypass_admins=entry.bypass_admins,
+        ))
+
+    # Content filter channels without an explicit rule get the default rule
+    content_filter = config.content_filter
+    if content_filter.enabled:
+        content_bypass = _role_ids(content_filter.whitelisted_roles)
+        for channel in content_filter.filtered_channels:
+            channel_id = int(channel)
+            if channel_id in compiled:
+                continue
+            compiled[channel_id] = [ChannelRule(
+                channel_id=channel_id,
+                kind="links_or_images",
+                warning=content_filter.warning_message,
+                bypass_role_ids=content_bypass,
+            )]
+
+    return {channel_id: tuple(rules) for channel_id, rules in compiled.items()}
+
+
+class ChannelRuleEngine:
+    """
+    Dispatch engine for per-channel rules.
+
+    Usage:
+        engine = get_channel_rule_engine()
+        engine.register_handler("x_links_only", content_filter.apply_rule)
+        outcome = await engine.apply(message)
+    """
+
+    def __init__(self, config: Config, config_dir: Optional[Path] = None):
+        """
+        Initialize rule engine.
+
+        Args:
+            config: Loaded bot configuration
+            config_dir: Directory with YAML configs (for hot-reload)
+        """
+        self._rules: Dict[int, Tuple[ChannelRule, ...]] = {}
+        self._handlers: Dict[str, RuleHandler] = {}
+        self._reload_listeners: List[ReloadListener] = []
+
+        self.config_dir = config_dir or _default_config_dir()
+        self.reload_interval = config.channel_rules.reload_interval
+        self._next_reload_check = time.monotonic() + self.reload_interval
+        self._config_mtime = self._current_mtime()
+
+        self.load(config)
+
+    def load(self, config: Config):
+        """Compile and swap in rules from config."""
+        self._rules = compile_channel_rules(config)
+        self.reload_interval = config.channel_rules.reload_interval
+
+        logger.info(
+            "channel_rules_compiled",
+            channels=len(self._rules),
+            rules=sum(len(rules) for rules in self._rules.values()),
+        )
+
+    def register_handler(self, kind: str, handler: RuleHandler):
+        """
+        Register handler for a rule type.
+
+        Args:
+            kind: Rule type (e.g. "x_links_only")
+            handler: Async callable (message, rule) -> FilterOutcome
+        """
+        self._handlers[kind] = handler
+
+    def add_reload_listener(self, listener: ReloadListener):
+        """
+        Call listener with the new config after every successful reload.
+
+        Args:
+            listener: Callable (config) -> None
+        """
+        self._reload_listeners.append(listener)
+
+    def rules_for(self, channel_id: int) -> Tuple[ChannelRule, ...]:
+        """Get ordered rules for a channel (empty if unfiltered)."""
+        return self._rules.get(channel_id, ())
+
+    def find_rule(self, channel_id: int, kind: str) -> Optional[ChannelRule]:
+        """Get a channel's rule of the given type, if any."""
+        for rule in self._rules.get(channel_id, ()):
+            if rule.kind == kind:
+                return rule
+        return None
+
+    async def apply(self, message: discord.Message) -> FilterOutcome:
+        """
+        Run the message's channel rules in order.
+
+        Stops at the first rule that deletes or flags the message.
+
+        Args:
+            message: Discord message
+
+        Returns:
+            Outcome of the first stopping rule, KEPT otherwise
+        """
+        self.maybe_reload()
+
+        rules = self._rules.get(message.channel.id)
+        if not rules:
+            return FilterOutcome.KEPT
+
+        for rule in rules:
+            handler = self._handlers.get(rule.kind)
+            if handler is None:
+                continue
+
+            outcome = await handler(message, rule)
+            if outcome.stops_pipeline:
+                return outcome
+
+        return FilterOutcome.KEPT
+
+    def maybe_reload(self):
+        """Recompile rules if config files changed (checked every reload_interval)."""
+        if self.reload_interval <= 0:
+            return
+
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return
+        self._next_reload_check = now + self.reload_interval
+
+        mtime = self._current_mtime()
+        if mtime == self._config_mtime:
+            return
+        self._config_mtime = mtime
+
+        self.reload()
+
+    def reload(self) -> bool:
+        """
+        Reload config from disk and recompile rules.
+
+        Returns:
+            True if rules were reloaded, False if config failed to load
+            (previous rules are kept)
+        """
+        try:
+            config = load_config(str(self.config_dir / "config.yaml"))
+        except Exception as e:
+            logger.error("channel_rules_reload_failed", error=str(e))
+            return False
+
+        self.load(config)
+        for listener in self._reload_listeners:
+            try:
+                listener(config)
+            except Exception as e:
+                logger.error("channel_rules_reload_listener_failed", error=str(e), exc_info=True)
+        logger.info("channel_rules_reloaded")
+        return True
+
+    def _current_mtime(self) -> float:
+        """Latest modification time of the watched config files."""
+        mtimes = [
+            path.stat().st_mtime
+            for path in (self.config_dir / name for name in WATCHED_CONFIG_FILES)
+            if path.exists()
+        ]
+        return max(mtimes, default=0.0)
+
+
+def _default_config_dir() -> Path:
+    """Config directory (handles running from src/)."""
+    config_dir = Path("config")
+    if not config_dir.exists() and Path.cwd().name == "src":
+        config_dir = Path("..") / "config"
+    return config_dir
+
+
+# Singleton instance
+_engine: Optional[ChannelRuleEngine] = None
+
+
+def get_channel_rule_engine() -> ChannelRuleEngine:
+    """Get singleton channel rule engine."""
+    global _engine
+    if _engine is None:
+        _engine = ChannelRuleEngine(get_config())
+    return _engine
@@ -2,34 +2,29 @@
 Content filter for specific channels.
 
 Features:
-- Per-channel content rules
+- Per-channel content rules (compiled by ChannelRuleEngine from config)
 - Contributions channel: only x.com links allowed
 - Content channel: only attachments allowed (no links)
-- Configurable whitelist
+- Configurable role bypass
 """
 
 import re
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple, TYPE_CHECKING
 
 import discord
 
+from src.moderation.channel_rules import ChannelRule
+from src.moderation.filter_outcome import FilterOutcome
 from src.utils import get_logger
 
+if TYPE_CHECKING:
+    from src.moderation.channel_rules import ChannelRuleEngine
+    from src.utils.config import Config
+
 logger = get_logger(__name__)
 
-# Channel-specific rules
-CHANNEL_RULES = {
-    # Contributions channel: only x.com links allowed
-    "1436229572403400887": {
-        "rule": "x_links_only",
-        "warning": "{user}, only **x.com links** are allowed in this channel.",
-    },
-    # Content channel: only attachments allowed, no links
-    "1441524601187467404": {
-        "rule": "attachments_only",
-        "warning": "{user}, only **attachments (images/videos)** are allowed in this channel. no links.",
-    },
-}
+# Rule types handled by this filter
+CONTENT_RULE_TYPES = ("x_links_only", "attachments_only", "links_or_images")
 
 
 class ContentFilter:
@@ -39,7 +34,7 @@ class ContentFilter:
     Rules:
     - x_links_only: Only x.com/twitter.com links allowed
     - attachments_only: Only attachments allowed, no links
-    - default: x.com links OR images allowed
+    - links_or_images: x.com links OR images allowed
     """
     
     def __init__(self, bot: discord.Client, config: dict):
@@ -67,12 +62,27 @@ class ContentFilter:
         
         # Silent init
     
-    async def check_message(self, message: discord.Message) -> Tuple[bool, Optional[str]]:
+    def register_rules(self, engine: "ChannelRuleEngine"):
+        """Register this filter's rule handlers with the rule engine."""
+        for rule_type in CONTENT_RULE_TYPES:
+            engine.register_handler(rule_type, self.apply_rule)
+        engine.add_reload_listener(self.reload_config)
+    
+    def reload_config(self, config: "Config"):
+        """Pick up content_filter settings (enabled, warnings) after a config reload."""
+        self.config = config.content_filter.model_dump()
+    
+    def check_message(
+        self,
+        message: discord.Message,
+        rule: ChannelRule,
+    ) -> Tuple[bool, Optional[str]]:
         """
-        Check if a message should be allowed in filtered channels.
+        Check if a message satisfies its channel rule.
         
         Args:
             message: Discord message
+            rule: Compiled channel rule
         
         Returns:
             Tuple of (should_delete, warning_message)
@@ -85,33 +95,17 @@ class ContentFilter:
         if message.author.bot:
             return False, None
         
-        # Check if message is in a filtered channel
-        filtered_channels = self.config.get("filtered_channels", [])
-        channel_id_str = str(message.channel.id)
-        
-        if channel_id_str not in filtered_channels:
+        # Check if user bypasses the rule
+        if rule.bypasses(message.author):
+            logger.debug(
+                "message_allowed_whitelisted_role",
+                user_id=str(message.author.id),
+                channel_id=str(message.channel.id),
+            )
             return False, None
         
-        # Check if user has whitelisted role
-        if hasattr(message.author, 'roles'):
-            whitelisted_roles = self.config.get("whitelisted_roles", [])
-            user_role_ids = [str(role.id) for role in message.author.roles]
-            
-            if any(role_id in whitelisted_roles for role_id in user_role_ids):
-                logger.debug(
-                    "message_allowed_whitelisted_role",
-                    user_id=str(message.author.id),
-                    channel_id=str(message.channel.id),
-                )
-                return False, None
-        
-        # Get channel-specific rule
-        channel_rule = CHANNEL_RULES.get(channel_id_str, {})
-        rule_type = channel_rule.get("rule", "default")
-        custom_warning = channel_rule.get("warning")
-        
         # Check content based on rule type
-        should_delete, warning = self._check_by_rule(message, rule_type, custom_warning)
+        should_delete, warning = self._check_by_rule(message, rule.kind, rule.warning)
         
         if should_delete:
             logger.info(
@@ -120,7 +114,7 @@ class ContentFilter:
                 author_id=str(message.author.id),
                 author_name=message.author.name,
                 channel_id=str(message.channel.id),
-                rule=rule_type,
+                rule=rule.kind,
                 content_preview=message.content[:100] if message.content else "",
             )
         
@@ -183,7 +177,7 @@ class ContentFilter:
             return True, warning
         
         else:
-            # Default rule: x.com links OR images allowed
+            # links_or_images: x.com links OR images allowed
             has_embed_image = any(
                 embed.type == 'image' or embed.image or embed.thumbnail
                 for embed in message.embeds
@@ -192,40 +186,51 @@ class ContentFilter:
             if has_twitter_link or has_image or has_embed_image:
                 return False, None
             
-            return True, default_warning
+            return True, custom_warning or default_warning
     
-    async def filter_message(self, message: discord.Message):
+    async def apply_rule(self, message: discord.Message, rule: ChannelRule) -> FilterOutcome:
         """
-        Filter a message (delete if it doesn't meet criteria).
+        Apply a channel rule (delete the message if it doesn't meet criteria).
         
         Args:
             message: Discord message
+            rule: Compiled channel rule
+            
+        Returns:
+            FilterOutcome.DELETED if the message was removed, KEPT otherwise
         """
         try:
-            should_delete, warning_text = await self.check_message(message)
+            should_delete, warning_text = self.check_message(message, rule)
+            
+            if not should_delete:
+                return FilterOutcome.KEPT
             
-            if should_delete:
-                # Send warning message (optional)
-                if self.config.get("send_warning", True) and warning_text:
-                    # Replace {user} placeholder with mention
-                    warning_message = warning_text.replace("{user}", message.author.mention)
-                    
-                    warning = await message.channel.send(warning_message)
-                    
-                    # Delete warning after delay
-                    delete_after = self.config.get("warning_delete_after", 5)
-                    if delete_after > 0:
-                        await warning.delete(delay=delete_after)
+            # Send warning message (optional)
+            if self.config.get("send_warning", True) and warning_text:
+                # Replace {user} placeholder with mention
+                warning_message = warning_text.replace("{user}", message.author.mention)
                 
-                # Delete the original message
-                await message.delete()
+                warning = await message.channel.send(warning_message)
                 
-                logger.info(
-                    "message_deleted",
-                    message_id=str(message.id),
-                    author_id=str(message.author.id),
-                    channel_id=str(message.channel.id),
-                )
+                # Delete warning after delay
+                delete_after = self.config.get("warning_delete_after", 5)
+                if delete_after > 0:
+                    await warning.delete(delay=delete_after)
+            
+            # Delete the original message
+            await message.delete()
+            
+            logger.info(
+                "message_deleted",
+                message_id=str(message.id),
+                author_id=str(message.author.id),
+                channel_id=str(message.channel.id),
+            )
+            return FilterOutcome.DELETED
+        
+        except discord.NotFound:
+            # Already gone (deleted by user or another filter)
+            return FilterOutcome.DELETED
         
         except discord.Forbidden:
             logger.error(
@@ -233,6 +238,7 @@ class ContentFilter:
                 message_id=str(message.id),
                 channel_id=str(message.channel.id),
             )
+            return FilterOutcome.KEPT
         
         except Exception as e:
             logger.error(
@@ -241,3 +247,4 @@ class ContentFilter:
                 message_id=str(message.id),
                 channel_id=str(message.channel.id),
             )
+            return FilterOutcome.KEPT
@@ -0,0 +1,75 @@
+"""
+Edit-diff stage for message edits.
+
+Discord emits MESSAGE_UPDATE for embed unfurls, pins and other changes that
+don't touch what moderation looks at. This module computes what actually
+changed between two versions of a message so the edit path only
+re-evaluates the delta.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, FrozenSet, List
+
+import discord
+
+
+@dataclass
+class EditDelta:
+    """What changed between the original and edited message."""
+    content_changed: bool
+    attachments_changed: bool
+    mentions_changed: bool
+    added_urls: FrozenSet[str] = field(default_factory=frozenset)
+    added_mass_mention: bool = False
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything moderation cares about changed."""
+        return self.content_changed or self.attachments_changed or self.mentions_changed
+
+
+def _mention_ids(message: discord.Message) -> FrozenSet[int]:
+    """User and role mention IDs of a message."""
+    return frozenset(
+        [user.id for user in message.mentions] + list(message.raw_role_mentions)
+    )
+
+
+def compute_edit_delta(
+    before: discord.Message,
+    after: discord.Message,
+    extract_urls: Callable[[str], List[str]],
+) -> EditDelta:
+    """
+    Compare two versions of a message.
+
+    Args:
+        before: Message before the edit
+        after: Message after the edit
+        extract_urls: URL extractor (PatternMatcher.extract_urls)
+
+    Returns:
+        EditDelta describing the change
+    """
+    content_changed = before.content != after.content
+
+    attachments_changed = (
+        {a.id for a in before.attachments} != {a.id for a in after.attachments}
+    )
+
+    mentions_changed = (
+        before.mention_everyone != after.mention_everyone
+        or _mention_ids(before) != _mention_ids(after)
+    )
+
+    added_urls: FrozenSet[str] = frozenset()
+    if content_changed:
+        added_urls = frozenset(extract_urls(after.content)) - frozenset(extract_urls(before.content))
+
+    return EditDelta(
+        content_changed=content_changed,
+        attachments_changed=attachments_changed,
+        mentions_changed=mentions_changed,
+        added_urls=added_urls,
+        added_mass_mention=after.mention_everyone and not before.mention_everyone,
+    )
@@ -0,0 +1,21 @@
+"""
+Structured outcome of a moderation filter pass.
+
+Filters (scam detection, gliquid channel, content filter) report what they
+did to the message, so the message pipeline can short-circuit without
+asking Discord whether the message still exists.
+"""
+
+from enum import Enum
+
+
+class FilterOutcome(Enum):
+    """What a filter did with a message."""
+    KEPT = "kept"  # Message passed - continue processing
+    DELETED = "deleted"  # Message removed (or already gone)
+    WARNED = "warned"  # Message flagged but left in place - stop processing
+
+    @property
+    def stops_pipeline(self) -> bool:
+        """Whether later handlers should skip this message."""
+        return self is not FilterOutcome.KEPT
@@ -5,9 +5,9 @@ Detects when users try to impersonate staff or brand names by checking
 similarity between their display names and protected names.
 """
 
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import discord
+from src.moderation.name_screening import NameScreener, normalize_name, similarity_ratio
 from src.utils import get_config, get_logger
 
 logger = get_logger(__name__)
@@ -34,8 +34,13 @@ class ImpersonationChecker:
         self.trusted_role_ids = [
             str(role_id) for role_id in self.anti_imp_config.trusted_role_ids
         ]
-        self.trusted_message_count = getattr(
-            self.anti_imp_config, 'trusted_message_count', 100
+        self.trusted_message_count = self.anti_imp_config.trusted_message_count
+        
+        # Protected names are normalized and indexed once
+        self.screener = NameScreener(
+            protected_names=self.protected_names,
+            similarity_threshold=self.similarity_threshold,
+            hard_threshold=self.hard_threshold,
         )
         
         # Silent init
@@ -52,14 +57,13 @@ class ImpersonationChecker:
             user_id: Discord user ID
             
         Returns:
-            Number of messages in database
+            Number of messages in database (from the in-memory counter cache)
         """
         if not self.message_storage:
             return 0
         
         try:
-            stats = self.message_storage.get_user_stats(user_id)
-            return stats.get("total_messages", 0)
+            return self.message_storage.get_user_message_count(user_id)
         except Exception as e:
             logger.debug(f"could not get message count for {user_id}: {e}")
             return 0
@@ -84,8 +88,7 @@ class ImpersonationChecker:
         """
         Calculate similarity between two strings.
         
-        Uses SequenceMatcher for fuzzy string matching.
-        Case-insensitive comparison.
+        Case-insensitive indel ratio (2 * LCS / total length).
         
         Args:
             str1: First string
@@ -94,42 +97,19 @@ class ImpersonationChecker:
         Returns:
             Similarity score between 0.0 and 1.0
         """
-        if not str1 or not str2:
-            return 0.0
-        
-        # Normalize strings (lowercase, strip whitespace)
-        s1 = str1.lower().strip()
-        s2 = str2.lower().strip()
-        
-        # Exact match
-        if s1 == s2:
-            return 1.0
-        
-        # Calculate similarity
-        return SequenceMatcher(None, s1, s2).ratio()
+        return similarity_ratio(str1, str2)
     
     def _normalize_name(self, name: str) -> str:
         """
-        Normalize name for comparison by removing common obfuscation characters.
+        Normalize name for comparison (homoglyphs folded, obfuscation removed).
         
         Args:
             name: Name to normalize
             
         Returns:
-            Normalized name (lowercase, special chars removed)
+            Normalized name
         """
-        if not name:
-            return ""
-        
-        # Lowercase
-        normalized = name.lower()
-        
-        # Remove common obfuscation characters
-        obfuscation_chars = ['_', '-', '.', ' ', '|', '/', '\\', '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '[', ']', '{', '}', '<', '>', '~', '`', "'", '"', ',', ';', ':', '0', '1', '2', '3', '4', '5', '6', '7', '8', '9']
-        for char in obfuscation_chars:
-            normalized = normalized.replace(char, '')
-        
-        return normalized
+        return normalize_name(name)
     
     def _check_contains_protected(self, display_name: str) -> Tuple[bool, Optional[str]]:
         """
@@ -143,22 +123,8 @@ class ImpersonationChecker:
         Returns:
             Tuple of (is_match, matched_name)
         """
-        name_lower = display_name.lower()
-        name_normalized = self._normalize_name(display_name)
-        
-        for protected_name in self.protected_names:
-            protected_lower = protected_name.lower()
-            protected_normalized = self._normalize_name(protected_name)
-            
-            # Skip very short names to avoid false positives (like "mod" in "modern")
-            if len(protected_normalized) < 4:
-                continue
-            
-            # Check if protected name is contained in display name
-            if protected_lower in name_lower or protected_normalized in name_normalized:
-                return True, protected_name
-        
-        return False, None
+        matched_name = self.screener.find_contained(display_name)
+        return matched_name is not None, matched_name
     
     def score_name_impersonation(
         self,
@@ -182,50 +148,53 @@ class ImpersonationChecker:
                 - is_impersonation: Whether score exceeds threshold
                 - is_high_confidence: Whether score exceeds hard threshold
         """
-        if not display_name:
-            return {
-                "score": 0.0,
-                "closest_match": None,
-                "is_impersonation": False,
-                "is_high_confidence": False,
-            }
+        return self.screener.screen(display_name)
+    
+    def audit_members(self, members: Iterable[discord.Member]) -> List[Dict[str, any]]:
+        """
+        Screen many members in one pass (roster audits, mass-join raids).
         
-        # First check: Does the name CONTAIN a protected name?
-        contains_match, contained_name = self._check_contains_protected(display_name)
-        if contains_match:
-            return {
-                "score": 0.95,  # High score for direct containment
-                "closest_match": contained_name,
-                "is_impersonation": True,
-                "is_high_confidence": True,
-            }
+        Bots, trusted roles and active members are skipped, identical
+        names are scored once.
         
-        max_score = 0.0
-        closest_match = None
+        Args:
+            members: Members to screen
+            
+        Returns:
+            Impersonation data (same shape as check_member_update) for
+            flagged members
+        """
+        if not self.enabled:
+            return []
         
-        # Second check: Similarity scoring
-        name_normalized = self._normalize_name(display_name)
+        candidates = {}
+        for member in members:
+            if member.bot or self.is_trusted(member):
+                continue
+            candidates[member.id] = member
+        
+        flagged = []
+        screened = self.screener.screen_many(
+            (member_id, member.display_name) for member_id, member in candidates.items()
+        )
         
-        for protected_name in self.protected_names:
-            # Standard similarity
-            score = self.calculate_similarity(display_name, protected_name)
+        for member_id, result in screened:
+            member = candidates[member_id]
             
-            # Also check normalized similarity (catches M_E_E_6 -> mee6)
-            protected_normalized = self._normalize_name(protected_name)
-            if name_normalized and protected_normalized:
-                normalized_score = self.calculate_similarity(name_normalized, protected_normalized)
-                score = max(score, normalized_score)
+            # Message count only for flagged members
+            message_count = self.get_user_message_count(str(member_id))
+            if message_count >= self.trusted_message_count:
+                continue
             
-            if score > max_score:
-                max_score = score
-                closest_match = protected_name
-        
-        return {
-            "score": max_score,
-            "closest_match": closest_match,
-            "is_impersonation": max_score >= self.similarity_threshold,
-            "is_high_confidence": max_score >= self.hard_threshold,
-        }
+            flagged.append({
+                **result,
+                "member": member,
+                "old_name": member.display_name,
+                "new_name": member.display_name,
+                "message_count": message_count,
+            })
+        
+        return flagged
     
     async def check_member_update(
         self,
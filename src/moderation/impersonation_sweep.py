@@ -0,0 +1,324 @@
+"""
+Retroactive impersonation sweep over a guild's full member list.
+
+Reactive checks (member join / update) never see members who joined while
+the bot was down, or who picked a name before it was protected. The sweep
+streams `guild.members` in chunks through ImpersonationChecker.audit_members,
+resets nicknames of high-confidence matches at a paced rate, and posts a
+single aggregated alert.
+
+Progress (last member ID per guild) is checkpointed after every chunk, so
+an interrupted sweep of a large guild resumes where it stopped. The
+checkpoint is discarded when the protected names change, since every
+member has to be re-screened against the new list.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+from src.moderation.impersonation_checker import ImpersonationChecker
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Max flagged members listed in the alert embed
+MAX_ALERT_ENTRIES = 20
+
+
+@dataclass
+class SweepResult:
+    """Outcome of a sweep run."""
+    guild_id: int
+    total_members: int = 0
+    screened: int = 0
+    flagged: List[Dict[str, Any]] = field(default_factory=list)
+    nicknames_reset: int = 0
+    flagged_before_resume: int = 0  # Flagged before the interruption (not in `flagged`)
+    resumed: bool = False
+    completed: bool = False
+
+
+ProgressCallback = Callable[[SweepResult], Awaitable[None]]
+
+
+class SweepAlreadyRunning(RuntimeError):
+    """A sweep for the guild is already in progress."""
+
+
+class ImpersonationSweep:
+    """
+    Full-guild impersonation sweep with checkpointing.
+
+    Usage:
+        sweep = ImpersonationSweep(impersonation_checker, config)
+        result = await sweep.run(guild)
+    """
+
+    def __init__(self, impersonation_checker: ImpersonationChecker, config: Dict[str, Any]):
+        """
+        Initialize sweep.
+
+        Args:
+            impersonation_checker: Checker with the protected-name index
+            config: anti_impersonation.sweep configuration
+        """
+        self.checker = impersonation_checker
+        self.config = config
+
+        self.chunk_size = max(1, config.get("chunk_size", 500))
+        self.reset_nicknames = config.get("reset_nicknames", True)
+        self.reset_interval = config.get("reset_interval_seconds", 1.0)
+        self.checkpoint_file = Path(config.get("checkpoint_file", "data/impersonation_sweep.json"))
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def is_running(self, guild_id: int) -> bool:
+        """Check if a sweep is running for the guild."""
+        lock = self._locks.get(guild_id)
+        return bool(lock and lock.locked())
+
+    async def run(
+        self,
+        guild: discord.Guild,
+        reset_nicknames: Optional[bool] = None,
+        restart: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> SweepResult:
+        """
+        Sweep all members of a guild.
+
+        Args:
+            guild: Guild to sweep
+            reset_nicknames: Override config (None = use config)
+            restart: Ignore existing checkpoint
+            progress_callback: Awaited after each chunk with the running result
+
+        Returns:
+            SweepResult
+
+        Raises:
+            SweepAlreadyRunning: Another sweep holds the guild's lock
+        """
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        if lock.locked():
+            raise SweepAlreadyRunning(f"Sweep already running for guild {guild.id}")
+
+        async with lock:
+            return await self._run(
+                guild,
+                self.reset_nicknames if reset_nicknames is None else reset_nicknames,
+                restart,
+                progress_callback,
+            )
+
+    async def _run(
+        self,
+        guild: discord.Guild,
+        reset_nicknames: bool,
+        restart: bool,
+        progress_callback: Optional[ProgressCallback],
+    ) -> SweepResult:
+        if not guild.chunked:
+            await guild.chunk(cache=True)
+
+        # Stable order so the checkpoint (last member ID) is meaningful
+        members = sorted(guild.members, key=lambda m: m.id)
+        result = SweepResult(guild_id=guild.id, total_members=len(members))
+
+        names_hash = self._protected_names_hash()
+        checkpoint = None if restart else self._load_checkpoint(guild.id, names_hash)
+
+        start_index = 0
+        if checkpoint:
+            last_member_id = checkpoint["last_member_id"]
+            start_index = next(
+                (i for i, m in enumerate(members) if m.id > last_member_id),
+                len(members),
+            )
+            result.screened = start_index
+            result.flagged_before_resume = checkpoint.get("flagged", 0)
+            result.resumed = True
+
+        logger.info(
+            "impersonation_sweep_started",
+            guild_id=guild.id,
+            members=len(members),
+            start_index=start_index,
+            resumed=result.resumed,
+        )
+
+        for offset in range(start_index, len(members), self.chunk_size):
+            chunk = members[offset:offset + self.chunk_size]
+
+            flagged = self.checker.audit_members(chunk)
+            result.flagged.extend(flagged)
+
+            if reset_nicknames:
+                for data in flagged:
+                    if await self._reset_nickname(data):
+                        result.nicknames_reset += 1
+
+            result.screened = offset + len(chunk)
+            self._save_checkpoint(guild.id, names_hash, chunk[-1].id, result)
+
+            if progress_callback:
+                try:
+                    await progress_callback(result)
+                except Exception as e:
+                    logger.debug("sweep_progress_callback_failed", error=str(e))
+
+            # Yield to the event loop between chunks
+            await asyncio.sleep(0)
+
+        result.completed = True
+        self._clear_checkpoint(guild.id)
+
+        logger.info(
+            "impersonation_sweep_completed",
+            guild_id=guild.id,
+            screened=result.screened,
+            flagged=len(result.flagged),
+            nicknames_reset=result.nicknames_reset,
+        )
+
+        await self._send_summary_alert(guild, result)
+        return result
+
+    async def _reset_nickname(self, data: Dict[str, Any]) -> bool:
+        """
+        Reset nickname of a high-confidence match.
+
+        Resets are paced (reset_interval) so a sweep that flags hundreds of
+        members stays well under the member-edit rate limit; discord.py
+        still honors Retry-After if a 429 happens anyway.
+        """
+        member: discord.Member = data["member"]
+
+        # Only nicknames can be reset (usernames/global names can't)
+        if not data["is_high_confidence"] or not member.nick:
+            return False
+
+        success = await self.checker.reset_nickname(
+            member,
+            reason=f"Anti-impersonation sweep: similar to '{data['closest_match']}'",
+        )
+        data["nickname_reset"] = success
+
+        if success and self.reset_interval > 0:
+            await asyncio.sleep(self.reset_interval)
+
+        return success
+
+    async def _send_summary_alert(self, guild: discord.Guild, result: SweepResult):
+        """Send one aggregated alert for the whole sweep."""
+        if not result.flagged:
+            return
+
+        log_channel_id = self.checker.anti_imp_config.log_channel_id
+        if not log_channel_id:
+            return
+
+        channel = guild.get_channel(int(log_channel_id))
+        if not isinstance(channel, discord.TextChannel):
+            logger.warning("impersonation_log_channel_not_found", channel_id=log_channel_id)
+            return
+
+        lines = []
+        for data in sorted(result.flagged, key=lambda d: d["score"], reverse=True)[:MAX_ALERT_ENTRIES]:
+            member = data["member"]
+            marker = "🚫" if data["is_high_confidence"] else "⚠️"
+            reset = " · nick reset" if data.get("nickname_reset") else ""
+            lines.append(
+                f"{marker} {member.mention} `{data['new_name']}` → `{data['closest_match']}` "
+                f"({data['score'] * 100:.0f}%){reset}"
+            )
+
+        remaining = len(result.flagged) - len(lines)
+        if remaining > 0:
+            lines.append(f"... and {remaining} more")
+
+        high_confidence = sum(1 for d in result.flagged if d["is_high_confidence"])
+
+        embed = discord.Embed(
+            color=0xFF0033 if high_confidence else 0xFFA500,
+            title="🔍 Impersonation Sweep",
+            description="\n".join(lines),
+        )
+        embed.add_field(name="Screened", value=f"`{result.screened}`", inline=True)
+        embed.add_field(name="Flagged", value=f"`{len(result.flagged)}` ({high_confidence} high)", inline=True)
+        embed.add_field(name="Nicknames Reset", value=f"`{result.nicknames_reset}`", inline=True)
+        if result.resumed:
+            embed.add_field(
+                name="Resumed",
+                value=f"Continued from checkpoint ({result.flagged_before_resume} flagged before interruption)",
+                inline=False,
+            )
+
+        from src.utils.branding import get_footer_kwargs
+        embed.set_footer(**get_footer_kwargs())
+        embed.timestamp = discord.utils.utcnow()
+
+        try:
+            await channel.send(embed=embed)
+        except Exception as e:
+            logger.error("sweep_alert_failed", error=str(e))
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Checkpoints
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _protected_names_hash(self) -> str:
+        names = "\n".join(sorted(self.checker.protected_names))
+        return hashlib.sha1(names.encode("utf-8")).hexdigest()
+
+    def _read_checkpoints(self) -> Dict[str, Dict[str, Any]]:
+        if not self.checkpoint_file.exists():
+            return {}
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error("failed_to_load_sweep_checkpoint", error=str(e))
+            return {}
+
+    def _write_checkpoints(self, checkpoints: Dict[str, Dict[str, Any]]):
+        try:
+            with open(self.checkpoint_file, "w", encoding="utf-8") as f:
+                json.dump(checkpoints, f, indent=2)
+        except Exception as e:
+            logger.error("failed_to_save_sweep_checkpoint", error=str(e))
+
+    def _load_checkpoint(self, guild_id: int, names_hash: str) -> Optional[Dict[str, Any]]:
+        checkpoint = self._read_checkpoints().get(str(guild_id))
+        if not checkpoint:
+            return None
+
+        if checkpoint.get("protected_names_hash") != names_hash:
+            logger.info("sweep_checkpoint_discarded_names_changed", guild_id=guild_id)
+            return None
+
+        return checkpoint
+
+    def _save_checkpoint(self, guild_id: int, names_hash: str, last_member_id: int, result: SweepResult):
+        checkpoints = self._read_checkpoints()
+        checkpoints[str(guild_id)] = {
+            "last_member_id": last_member_id,
+            "screened": result.screened,
+            "flagged": len(result.flagged),
+            "protected_names_hash": names_hash,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        self._write_checkpoints(checkpoints)
+
+    def _clear_checkpoint(self, guild_id: int):
+        checkpoints = self._read_checkpoints()
+        if checkpoints.pop(str(guild_id), None) is not None:
+            self._write_checkpoints(checkpoints)
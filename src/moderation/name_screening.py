@@ -0,0 +1,322 @@
+"""
+Name-screening engine for anti-impersonation.
+
+Everything that doesn't depend on the screened name is computed once:
+- Protected names are normalized and indexed at startup
+- Homoglyphs (Cyrillic/Greek look-alikes, fullwidth and styled letters)
+  are folded with a single str.translate table
+- Suspicious Unicode ranges are a compiled regex character class
+
+Similarity uses the indel ratio (2 * LCS / total length, the same measure
+difflib.SequenceMatcher.ratio approximates) computed with a bit-parallel
+LCS. Candidates are pruned first by cheap upper bounds (length and
+character counts), so most protected names never reach the scorer.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Suspicious Unicode ranges (scam prevention)
+SUSPICIOUS_RANGES = [
+    (0x0600, 0x06FF),  # Arabic (includes diacritics)
+    (0x0750, 0x077F),  # Arabic Supplement
+    (0x08A0, 0x08FF),  # Arabic Extended-A
+    (0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
+    (0xFE70, 0xFEFF),  # Arabic Presentation Forms-B
+    (0x200B, 0x200F),  # Zero-width spaces and direction marks
+    (0x2028, 0x202F),  # Line/paragraph separators
+    (0x2060, 0x206F),  # Word joiner, invisible operators
+    (0xFEFF, 0xFEFF),  # Zero-width no-break space (BOM)
+]
+
+SUSPICIOUS_UNICODE_RE = re.compile(
+    "[" + "".join(f"\\u{start:04x}-\\u{end:04x}" for start, end in SUSPICIOUS_RANGES) + "]"
+)
+
+# Homoglyphs that NFKD doesn't fold to ASCII
+CONFUSABLES: Dict[str, str] = {
+    # Cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h",
+    "о": "o", "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i",
+    "ї": "i", "ј": "j", "ѕ": "s", "ԁ": "d", "ԛ": "q", "ԝ": "w", "һ": "h",
+    "ӏ": "l",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v",
+    "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    # Latin look-alikes
+    "ı": "i", "ł": "l", "ø": "o", "ß": "ss", "ɡ": "g", "ɑ": "a", "ʏ": "y",
+    "ᴀ": "a", "ʙ": "b", "ᴄ": "c", "ᴅ": "d", "ᴇ": "e", "ɢ": "g", "ʜ": "h",
+    "ɪ": "i", "ᴊ": "j", "ᴋ": "k", "ʟ": "l", "ᴍ": "m", "ɴ": "n", "ᴏ": "o",
+    "ᴘ": "p", "ʀ": "r", "ꜱ": "s", "ᴛ": "t", "ᴜ": "u", "ᴠ": "v", "ᴡ": "w",
+    "ᴢ": "z",
+}
+
+# Characters stripped when normalizing (separators, punctuation, digits)
+OBFUSCATION_CHARS = "_-. |/\\!@#$%^&*()[]{}<>~`'\",;:0123456789"
+
+_FOLD_TABLE = str.maketrans(CONFUSABLES)
+_STRIP_TABLE = str.maketrans("", "", OBFUSCATION_CHARS)
+
+# Protected names shorter than this are not used for containment checks
+# (avoids "mod" matching "modern")
+MIN_CONTAINS_LENGTH = 4
+
+
+def contains_suspicious_unicode(text: str) -> bool:
+    """Check if text contains characters from SUSPICIOUS_RANGES."""
+    return bool(text) and SUSPICIOUS_UNICODE_RE.search(text) is not None
+
+
+def fold_confusables(text: str) -> str:
+    """Lowercase and fold compatibility forms and homoglyphs to ASCII."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    without_marks = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return without_marks.translate(_FOLD_TABLE)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for comparison.
+
+    Folds homoglyphs, then removes separators, punctuation and digits
+    (catches M_E_E_6 -> mee, аdmin (Cyrillic а) -> admin).
+    """
+    if not name:
+        return ""
+    return fold_confusables(name).translate(_STRIP_TABLE)
+
+
+class _Pattern:
+    """Precomputed bit masks of a string for bit-parallel LCS."""
+
+    __slots__ = ("text", "length", "masks", "counts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.length = len(text)
+        self.counts = Counter(text)
+        self.masks: Dict[str, int] = {}
+        for i, ch in enumerate(text):
+            self.masks[ch] = self.masks.get(ch, 0) | (1 << i)
+
+
+def lcs_length(text: str, pattern: _Pattern) -> int:
+    """Length of the longest common subsequence (Hyyrö bit-parallel LCS)."""
+    if not text or not pattern.length:
+        return 0
+
+    full = (1 << pattern.length) - 1
+    v = full
+    masks = pattern.masks
+    for ch in text:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+
+    return pattern.length - bin(v).count("1")
+
+
+def _ratio(text: str, text_counts: Counter, pattern: _Pattern, floor: float) -> float:
+    """
+    Indel similarity ratio (0.0-1.0), or 0.0 if it can't beat `floor`.
+
+    Upper bounds are checked before running LCS:
+    - length: LCS <= min(len1, len2)
+    - characters: LCS <= shared character count
+    """
+    if not text or not pattern.length:
+        return 0.0
+
+    if text == pattern.text:
+        return 1.0
+
+    total = len(text) + pattern.length
+
+    if 2 * min(len(text), pattern.length) / total < floor:
+        return 0.0
+
+    shared = sum(min(count, text_counts[ch]) for ch, count in pattern.counts.items())
+    if 2 * shared / total < floor:
+        return 0.0
+
+    return 2 * lcs_length(text, pattern) / total
+
+
+def similarity_ratio(str1: str, str2: str) -> float:
+    """Case-insensitive indel similarity between two strings (0.0-1.0)."""
+    s1 = (str1 or "").lower().strip()
+    s2 = (str2 or "").lower().strip()
+    if not s1 or not s2:
+        return 0.0
+    return _ratio(s1, Counter(s1), _Pattern(s2), floor=0.0)
+
+
+@dataclass(frozen=True)
+class ProtectedName:
+    """Protected name with its precomputed forms."""
+    name: str
+    lower: str
+    normalized: str
+    lower_pattern: _Pattern
+    normalized_pattern: _Pattern
+
+
+class NameScreener:
+    """
+    Screens display names against protected names.
+
+    Usage:
+        screener = NameScreener(["Liquid", "Admin"], 0.8, 0.9)
+        result = screener.screen("L1quid_Support")
+        flagged = screener.screen_many([(member.id, member.display_name), ...])
+    """
+
+    def __init__(
+        self,
+        protected_names: Iterable[str],
+        similarity_threshold: float,
+        hard_threshold: float,
+    ):
+        """
+        Initialize screener and index protected names.
+
+        Args:
+            protected_names: Names to protect (staff, brand, bots)
+            similarity_threshold: Score to flag as impersonation
+            hard_threshold: Score to flag as high-confidence impersonation
+        """
+        self.similarity_threshold = similarity_threshold
+        self.hard_threshold = hard_threshold
+
+        self.protected: List[ProtectedName] = []
+        for name in protected_names:
+            if not name:
+                continue
+            lower = name.lower().strip()
+            normalized = normalize_name(name)
+            self.protected.append(ProtectedName(
+                name=name,
+                lower=lower,
+                normalized=normalized,
+                lower_pattern=_Pattern(lower),
+                normalized_pattern=_Pattern(normalized),
+            ))
+
+        self._contains_index: List[ProtectedName] = [
+            p for p in self.protected if len(p.normalized) >= MIN_CONTAINS_LENGTH
+        ]
+
+    def find_contained(self, display_name: str) -> Optional[str]:
+        """
+        Find a protected name contained in the display name.
+
+        Catches cases like "MEE6_Support" or "Admin_Helper".
+
+        Returns:
+            Matched protected name, or None
+        """
+        name_lower = display_name.lower()
+        name_normalized = normalize_name(display_name)
+
+        for protected in self._contains_index:
+            if protected.lower in name_lower or protected.normalized in name_normalized:
+                return protected.name
+
+        return None
+
+    def screen(self, display_name: str, min_score: float = 0.0) -> Dict[str, any]:
+        """
+        Score a display name for impersonation.
+
+        Args:
+            display_name: Name to check
+            min_score: Skip scoring candidates that can't exceed this
+                (bulk mode passes the similarity threshold)
+
+        Returns:
+            Dictionary with score, closest_match, is_impersonation,
+            is_high_confidence
+        """
+        if not display_name:
+            return self._result(0.0, None)
+
+        contained = self.find_contained(display_name)
+        if contained:
+            return self._result(0.95, contained)  # High score for direct containment
+
+        name_lower = display_name.lower().strip()
+        name_normalized = normalize_name(display_name)
+        lower_counts = Counter(name_lower)
+        normalized_counts = Counter(name_normalized)
+
+        max_score = 0.0
+        closest_match = None
+
+        for protected in self.protected:
+            floor = max(max_score, min_score)
+
+            score = _ratio(name_lower, lower_counts, protected.lower_pattern, floor)
+
+            # Normalized similarity catches M_E_E_6 -> mee6
+            if name_normalized and protected.normalized:
+                score = max(score, _ratio(
+                    name_normalized, normalized_counts, protected.normalized_pattern, max(floor, score)
+                ))
+
+            if score > max_score:
+                max_score = score
+                closest_match = protected.name
+
+        return self._result(max_score, closest_match)
+
+    def screen_many(
+        self,
+        names: Iterable[Tuple[object, str]],
+    ) -> List[Tuple[object, Dict[str, any]]]:
+        """
+        Screen many names in one pass (roster audits, raids).
+
+        Identical names (common in raids) are scored once, and candidates
+        that can't reach the similarity threshold are pruned early.
+
+        Args:
+            names: Iterable of (key, display_name)
+
+        Returns:
+            List of (key, result) for flagged names only
+        """
+        cache: Dict[str, Dict[str, any]] = {}
+        flagged = []
+        screened = 0
+
+        for key, display_name in names:
+            screened += 1
+            result = cache.get(display_name)
+            if result is None:
+                result = self.screen(display_name, min_score=self.similarity_threshold)
+                cache[display_name] = result
+
+            if result["is_impersonation"]:
+                flagged.append((key, result))
+
+        logger.info(
+            "name_screening_bulk_complete",
+            screened=screened,
+            unique_names=len(cache),
+            flagged=len(flagged),
+        )
+        return flagged
+
+    def _result(self, score: float, closest_match: Optional[str]) -> Dict[str, any]:
+        return {
+            "score": score,
+            "closest_match": closest_match,
+            "is_impersonation": score >= self.similarity_threshold,
+            "is_high_confidence": score >= self.hard_threshold,
+        }
@@ -2,7 +2,8 @@
 Main scam detection system with multi-layer analysis.
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, TYPE_CHECKING
 from dataclasses import dataclass
 from datetime import timedelta
 
@@ -10,11 +11,15 @@ import discord
 
 from src.llm import OpenRouterClient
 from src.moderation.pattern_matcher import PatternMatcher
-from src.moderation.ai_analyzer import AIAnalyzer, AIAnalysisResult
+from src.moderation.ai_analyzer import AIAnalyzer, AIAnalysisResult, BatchingAIAnalyzer
 from src.moderation.alert_sender import AlertSender
+from src.moderation.edit_diff import compute_edit_delta
 from src.rag import get_message_storage
 from src.utils import get_logger
 
+if TYPE_CHECKING:
+    from src.utils.config import Config
+
 logger = get_logger(__name__)
 
 
@@ -73,10 +78,24 @@ class ScamDetector:
         ai_config = config.get("ai_analysis", {})
         self.ai_enabled = ai_config.get("enabled", True)
         self.ai_trigger_threshold = ai_config.get("trigger_threshold", 30)
-        self.ai_analyzer = AIAnalyzer(
-            llm_client=llm_client,
-            confidence_threshold=ai_config.get("confidence_threshold", 0.7),
-        ) if self.ai_enabled else None
+        batching_config = ai_config.get("batching", {})
+        if not self.ai_enabled:
+            self.ai_analyzer = None
+        elif batching_config.get("enabled", False):
+            # Micro-batch bursts of suspicious messages into one LLM call
+            self.ai_analyzer = BatchingAIAnalyzer(
+                llm_client=llm_client,
+                confidence_threshold=ai_config.get("confidence_threshold", 0.7),
+                window_ms=batching_config.get("window_ms", 400),
+                priority_window_ms=batching_config.get("priority_window_ms", 50),
+                max_batch_size=batching_config.get("max_batch_size", 8),
+                max_concurrent_batches=batching_config.get("max_concurrent_batches", 2),
+            )
+        else:
+            self.ai_analyzer = AIAnalyzer(
+                llm_client=llm_client,
+                confidence_threshold=ai_config.get("confidence_threshold", 0.7),
+            )
         
         # Initialize alert sender
         self.alert_sender = AlertSender(bot=bot)
@@ -105,18 +124,34 @@ class ScamDetector:
         self.check_roles = set(config.get("check_roles", []))
         
         # Strict link filter (delete ALL non-whitelisted links)
-        strict_filter_config = config.get("strict_link_filter", {})
-        self.strict_link_filter_enabled = strict_filter_config.get("enabled", False)
-        self.strict_link_delete = strict_filter_config.get("delete_message", True)
-        self.strict_link_warn = strict_filter_config.get("warn_user", False)
-        self.strict_link_warning = strict_filter_config.get("warning_message", "")
-        self.strict_link_min_messages = strict_filter_config.get("min_messages_exempt", 50)
+        self._load_strict_link_filter(config.get("strict_link_filter", {}))
         
         if self.strict_link_filter_enabled:
             logger.info("strict_link_filter_enabled")
         
+        # Verdicts of recently analyzed messages (message_id -> is_scam),
+        # reused when an edit doesn't add anything new
+        self._verdicts: "OrderedDict[int, bool]" = OrderedDict()
+        self._verdict_cache_size = config.get("edit_verdict_cache_size", 5000)
+        
         logger.info("scam_detector_initialized")
     
+    def _load_strict_link_filter(self, strict_filter_config: dict):
+        """Load strict link filter settings (also on config hot-reload)."""
+        self.strict_link_filter_enabled = strict_filter_config.get("enabled", False)
+        self.strict_link_delete = strict_filter_config.get("delete_message", True)
+        self.strict_link_warn = strict_filter_config.get("warn_user", False)
+        self.strict_link_warning = strict_filter_config.get("warning_message", "")
+        self.strict_link_min_messages = strict_filter_config.get("min_messages_exempt", 50)
+        self.strict_link_bypass_roles = frozenset(
+            int(role_id) for role_id in strict_filter_config.get("bypass_roles") or []
+        )
+    
+    def reload_config(self, config: "Config"):
+        """Pick up strict link filter settings after a config reload (ChannelRuleEngine)."""
+        if self.enabled:
+            self._load_strict_link_filter(config.moderation.model_dump().get("strict_link_filter", {}))
+    
     async def check_strict_link_filter(
         self,
         message: discord.Message,
@@ -139,11 +174,7 @@ class ScamDetector:
         
         # Skip users with trusted roles (Staff, Mish, admins)
         if isinstance(message.author, discord.Member):
-            # Trusted role IDs that bypass link filter
-            trusted_role_ids = {1436799852171235472, 1436767320239243519, 1436233268134678600, 1436217207825629277}
-            user_role_ids = {role.id for role in message.author.roles}
-            
-            if user_role_ids & trusted_role_ids:
+            if any(role.id in self.strict_link_bypass_roles for role in message.author.roles):
                 return False  # Trusted user, skip filter
             
             # Also skip if user has administrator permission
@@ -267,6 +298,79 @@ class ScamDetector:
         if not self.enabled:
             return None
         
+        result = await self._analyze(message)
+        self._remember_verdict(message.id, bool(result and result.is_scam))
+        return result
+    
+    async def analyze_edit(
+        self,
+        before: discord.Message,
+        after: discord.Message,
+    ) -> Optional[DetectionResult]:
+        """
+        Analyze an edited message, re-checking only what changed.
+        
+        - Nothing moderation-relevant changed (embed unfurls, pins) -> skip
+        - Original was clean and the edit adds no URLs, no @everyone and no
+          new pattern matches -> reuse the cached clean verdict
+        - Otherwise -> full analysis of the edited message
+        
+        Args:
+            before: Message before the edit
+            after: Message after the edit
+        
+        Returns:
+            DetectionResult if scam detected, None otherwise
+        """
+        if not self.enabled:
+            return None
+        
+        delta = compute_edit_delta(before, after, self.pattern_matcher.extract_urls)
+        
+        if not delta.changed:
+            return None
+        
+        was_scam = self._verdicts.get(after.id)
+        
+        if was_scam is False and not delta.added_urls and not delta.added_mass_mention:
+            if not delta.content_changed:
+                # Attachment/mention-only change on a clean message
+                return None
+            
+            before_match = self.pattern_matcher.check_message(before.content)
+            after_match = self.pattern_matcher.check_message(after.content)
+            
+            before_signals = set(before_match.matched_patterns) | set(before_match.matched_keywords)
+            after_signals = set(after_match.matched_patterns) | set(after_match.matched_keywords)
+            
+            if after_signals <= before_signals:
+                logger.debug(
+                    "edit_reused_clean_verdict",
+                    message_id=after.id,
+                )
+                return None
+        
+        logger.debug(
+            "edit_reanalyzed",
+            message_id=after.id,
+            added_urls=len(delta.added_urls),
+            cached=was_scam is not None,
+        )
+        return await self.analyze_message(after)
+    
+    def _remember_verdict(self, message_id: int, is_scam: bool):
+        """Cache verdict for the edit path (bounded, oldest evicted first)."""
+        self._verdicts[message_id] = is_scam
+        self._verdicts.move_to_end(message_id)
+        
+        while len(self._verdicts) > self._verdict_cache_size:
+            self._verdicts.popitem(last=False)
+    
+    async def _analyze(
+        self,
+        message: discord.Message,
+    ) -> Optional[DetectionResult]:
+        """Run the detection layers (strict links, patterns, AI) on a message."""
         # Step 0: Strict link filter (delete ALL non-whitelisted links)
         if await self.check_strict_link_filter(message):
             # Message was already deleted by strict filter, no further processing needed
@@ -13,7 +13,7 @@ Handles:
 import asyncio
 import re
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Set
+from typing import Optional, Dict, List, Set, TYPE_CHECKING
 
 import discord
 from discord import app_commands
@@ -28,6 +28,9 @@ from src.moderation.submission_storage import (
 )
 from src.utils import get_logger
 
+if TYPE_CHECKING:
+    from src.utils.config import Config
+
 logger = get_logger(__name__)
 
 # Reaction emojis
@@ -235,6 +238,7 @@ class SubmissionHandler:
         
         # Cache channel IDs
         self.submission_channels: Dict[str, int] = {}  # guild_path -> channel_id
+        self._channel_to_path: Dict[int, str] = {}  # channel_id -> guild_path
         self.approved_channel_id: Optional[int] = None
         self.spotlight_channel_id: Optional[int] = None
         
@@ -254,6 +258,11 @@ class SubmissionHandler:
             "content": int(channels.get("content") or 0),
             "designers": int(channels.get("designers") or 0),
         }
+        self._channel_to_path = {
+            ch_id: guild_path
+            for guild_path, ch_id in self.submission_channels.items()
+            if ch_id
+        }
         
         self.approved_channel_id = int(channels.get("approved") or 0)
         self.spotlight_channel_id = int(channels.get("spotlight") or 0) or self.approved_channel_id
@@ -269,12 +278,14 @@ class SubmissionHandler:
         # Max revisions before auto-reject
         self.max_revisions = self.config.get("max_revisions", 2)
     
+    def reload_config(self, config: "Config"):
+        """Pick up submission channels/roles after a config reload (ChannelRuleEngine)."""
+        self.config = config.content_submissions.model_dump()
+        self._load_config()
+    
     def is_submission_channel(self, channel_id: int) -> Optional[str]:
         """Check if channel is a submission channel. Returns guild path or None."""
-        for guild_path, ch_id in self.submission_channels.items():
-            if ch_id == channel_id:
-                return guild_path
-        return None
+        return self._channel_to_path.get(channel_id)
     
     def has_t1_role(self, member: discord.Member) -> bool:
         """Check if member has T1+ role for voting."""
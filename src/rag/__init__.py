@@ -9,6 +9,9 @@ from .sqlite_storage import (
     StoredMessage,
     get_message_storage,
 )
+from .user_activity_cache import UserActivityCache
+from .recent_messages import RecentMessage, RecentMessageStore, get_recent_message_store
+from .answer_cache import AnswerCache, answer_cache_scope, bump_docs_version, get_answer_cache
 
 __all__ = [
     "semantic_chunk",
@@ -24,4 +27,14 @@ __all__ = [
     "SQLiteMessageStorage",
     "StoredMessage",
     "get_message_storage",
+    "UserActivityCache",
+    # Local recent-message read path (ring buffer + SQLite)
+    "RecentMessage",
+    "RecentMessageStore",
+    "get_recent_message_store",
+    # Semantic answer cache
+    "AnswerCache",
+    "get_answer_cache",
+    "answer_cache_scope",
+    "bump_docs_version",
 ]
@@ -0,0 +1,302 @@
+"""
+Semantic answer cache for repeated FAQ-style questions.
+
+Answers are cached per agent and guild (responses carry guild-specific
+<#id> channel links) and keyed by query embedding; a lookup hits
+when the cosine similarity to a cached query is above a high threshold
+(exact repeats are matched on normalized text without embedding at all).
+
+Entries belong to a docs version. Re-indexing a doc collection bumps the
+version marker file (also from the indexing scripts, which run in their
+own process) and the cache drops everything on the next lookup.
+"""
+
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils import get_config, get_logger
+
+logger = get_logger(__name__)
+
+DOCS_VERSION_FILE = Path("data/docs_version.json")
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_TTL = 3600
+DEFAULT_MAX_SIZE = 1000
+
+QueryEmbedder = Callable[[str], Awaitable[List[float]]]
+
+
+def bump_docs_version(collection: str, version_file: Path = DOCS_VERSION_FILE):
+    """
+    Record that a doc collection was (re-)indexed.
+
+    Args:
+        collection: Doc collection name
+        version_file: Marker file watched by AnswerCache
+    """
+    try:
+        versions = json.loads(version_file.read_text(encoding="utf-8")) if version_file.exists() else {}
+    except (OSError, ValueError):
+        versions = {}
+
+    versions[collection] = datetime.utcnow().isoformat()
+
+    try:
+        version_file.parent.mkdir(parents=True, exist_ok=True)
+        version_file.write_text(json.dumps(versions, indent=2), encoding="utf-8")
+    except OSError as e:
+        logger.warning("docs_version_bump_failed", collection=collection, error=str(e))
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+@dataclass
+class CachedAnswer:
+    """Cached response for one query."""
+    query: str
+    answer: str
+    embedding: Optional[np.ndarray]  # Unit vector (None until embedded)
+    created: float
+    hits: int = 0
+
+
+class AnswerCache:
+    """
+    Per-scope (agent + guild) semantic response cache.
+
+    Usage:
+        cache = get_answer_cache()
+        scope = answer_cache_scope("general_agent", guild_id)
+        answer = await cache.lookup(scope, query, embedder.embed_query)
+        if answer is None:
+            answer = ...
+            await cache.store(scope, query, answer, embedder.embed_query)
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        ttl: float = DEFAULT_TTL,
+        max_size: int = DEFAULT_MAX_SIZE,
+        version_file: Path = DOCS_VERSION_FILE,
+    ):
+        """
+        Initialize answer cache.
+
+        Args:
+            similarity_threshold: Min cosine similarity for a semantic hit
+            ttl: Seconds an answer stays valid
+            max_size: Max answers per scope (least recently used are evicted)
+            version_file: Docs version marker file
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version_file = version_file
+
+        # scope -> normalized query -> entry (LRU order)
+        self._entries: Dict[str, "OrderedDict[str, CachedAnswer]"] = {}
+        self._docs_version = self._read_docs_version()
+
+        self.stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats["exact_hits"] + self.stats["semantic_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    async def lookup(
+        self,
+        scope: str,
+        query: str,
+        embed: QueryEmbedder,
+    ) -> Optional[str]:
+        """
+        Find a cached answer for the query.
+
+        Args:
+            scope: Cache scope (answer_cache_scope)
+            query: User query
+            embed: Async query embedder (only called when no exact match)
+
+        Returns:
+            Cached answer or None
+        """
+        started = time.monotonic()
+        self._check_docs_version()
+
+        entries = self._entries.get(scope)
+        if not entries:
+            self.stats["misses"] += 1
+            return None
+
+        self._expire(entries)
+        key = normalize_query(query)
+
+        entry = entries.get(key)
+        if entry:
+            self.stats["exact_hits"] += 1
+            return self._hit(scope, entries, key, entry, 1.0, started)
+
+        candidates = [(k, e) for k, e in entries.items() if e.embedding is not None]
+        if not candidates:
+            self.stats["misses"] += 1
+            return None
+
+        vector = _unit(await embed(query))
+        matrix = np.stack([e.embedding for _, e in candidates])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+
+        if scores[best] < self.similarity_threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["semantic_hits"] += 1
+        best_key, best_entry = candidates[best]
+        return self._hit(scope, entries, best_key, best_entry, float(scores[best]), started)
+
+    async def store(
+        self,
+        scope: str,
+        query: str,
+        answer: str,
+        embed: QueryEmbedder,
+    ):
+        """
+        Cache an answer.
+
+        Args:
+            scope: Cache scope (answer_cache_scope)
+            query: User query
+            answer: Final response text
+            embed: Async query embedder
+        """
+        if not answer.strip():
+            return
+
+        try:
+            embedding = _unit(await embed(query))
+        except Exception as e:
+            # Still usable for exact repeats
+            logger.debug("answer_cache_embed_failed", error=str(e))
+            embedding = None
+
+        entries = self._entries.setdefault(scope, OrderedDict())
+        key = normalize_query(query)
+        entries[key] = CachedAnswer(
+            query=query,
+            answer=answer,
+            embedding=embedding,
+            created=time.monotonic(),
+        )
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+        self.stats["stores"] += 1
+
+    def clear(self, reason: str = "manual"):
+        """Drop all cached answers."""
+        dropped = sum(len(entries) for entries in self._entries.values())
+        self._entries.clear()
+        self.stats["invalidations"] += 1
+        logger.info("answer_cache_cleared", reason=reason, dropped=dropped)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Cache counters, size and hit rate."""
+        return {
+            **self.stats,
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _hit(
+        self,
+        scope: str,
+        entries: "OrderedDict[str, CachedAnswer]",
+        key: str,
+        entry: CachedAnswer,
+        similarity: float,
+        started: float,
+    ) -> str:
+        entry.hits += 1
+        entries.move_to_end(key)
+        logger.info(
+            "answer_cache_hit",
+            scope=scope,
+            similarity=round(similarity, 3),
+            latency_ms=round((time.monotonic() - started) * 1000, 1),
+            hit_rate=round(self.hit_rate, 3),
+        )
+        return entry.answer
+
+    def _expire(self, entries: "OrderedDict[str, CachedAnswer]"):
+        cutoff = time.monotonic() - self.ttl
+        expired = [k for k, e in entries.items() if e.created < cutoff]
+        for key in expired:
+            del entries[key]
+
+    def _read_docs_version(self) -> Tuple[Optional[float], Optional[int]]:
+        try:
+            stat = self.version_file.stat()
+        except OSError:
+            return (None, None)
+        return (stat.st_mtime, stat.st_size)
+
+    def _check_docs_version(self):
+        version = self._read_docs_version()
+        if version != self._docs_version:
+            self._docs_version = version
+            self.clear(reason="docs_reindexed")
+
+
+def answer_cache_scope(agent: str, guild_id: Optional[int]) -> str:
+    """Cache scope for an agent's answers in one guild (None = DMs)."""
+    return f"{agent}:{guild_id or 'dm'}"
+
+
+def _unit(vector: List[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+# Singleton instance
+_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get singleton answer cache (configured from performance.cache)."""
+    global _cache
+    if _cache is None:
+        settings = get_config().performance.cache
+        _cache = AnswerCache(
+            similarity_threshold=settings.get("similarity_threshold", DEFAULT_SIMILARITY_THRESHOLD),
+            ttl=settings.get("ttl", DEFAULT_TTL),
+            max_size=settings.get("max_size", DEFAULT_MAX_SIZE),
+        )
+    return _cache
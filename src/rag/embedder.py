@@ -8,12 +8,15 @@ Supports:
 """
 
 from __future__ import annotations
-from typing import List, Union, Optional, TYPE_CHECKING, Any
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Union, Optional, TYPE_CHECKING, Any
 
 import numpy as np
 from openai import AsyncOpenAI
 
 from src.utils import get_logger
+from src.utils.metrics import EMBEDDING_QUERY_CACHE, EMBEDDING_REQUESTS, EMBEDDING_TEXTS
 
 logger = get_logger(__name__)
 
@@ -38,6 +41,9 @@ if TYPE_CHECKING:
 else:
     ImageType = Any
 
+# Query embeddings kept in memory (one question is embedded once, not per collection)
+QUERY_CACHE_SIZE = 256
+
 
 class TextEmbedder:
     """OpenAI text embeddings."""
@@ -69,6 +75,9 @@ class TextEmbedder:
         self.dimension = dimension
         self.batch_size = batch_size
         
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_pending: Dict[str, asyncio.Future] = {}
+        
         # Silent init
     
     async def embed_text(self, text: str) -> List[float]:
@@ -101,11 +110,13 @@ class TextEmbedder:
             batch = texts[i:i + self.batch_size]
             
             try:
-                response = await self.client.embeddings.create(
-                    model=self.model,
-                    input=batch,
-                    dimensions=self.dimension,
-                )
+                with EMBEDDING_REQUESTS.time(model=self.model):
+                    response = await self.client.embeddings.create(
+                        model=self.model,
+                        input=batch,
+                        dimensions=self.dimension,
+                    )
+                EMBEDDING_TEXTS.inc(len(batch), model=self.model)
                 
                 batch_embeddings = [item.embedding for item in response.data]
                 all_embeddings.extend(batch_embeddings)
@@ -137,7 +148,38 @@ class TextEmbedder:
         Returns:
             Query embedding vector
         """
-        return await self.embed_text(query)
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            EMBEDDING_QUERY_CACHE.inc(result="hit")
+            return cached
+        
+        # Concurrent searches for the same query share one request
+        pending = self._query_pending.get(query)
+        if pending is not None:
+            EMBEDDING_QUERY_CACHE.inc(result="shared")
+            return await asyncio.shield(pending)
+        
+        EMBEDDING_QUERY_CACHE.inc(result="miss")
+        future = asyncio.get_running_loop().create_future()
+        self._query_pending[query] = future
+        try:
+            embedding = await self.embed_text(query)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._query_pending.pop(query, None)
+        
+        future.set_result(embedding)
+        self._query_cache[query] = embedding
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return embedding
 
 
 class ImageEmbedder:
@@ -20,8 +20,9 @@ from pydantic import BaseModel
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, PointStruct, VectorParams, NamedVector
 
-from src.llm import OpenRouterClient
+from src.llm import BACKGROUND, OpenRouterClient
 from src.rag import MultimodalEmbedder, add_context_header, semantic_chunk
+from src.rag.answer_cache import bump_docs_version
 from src.rag.qdrant_singleton import get_qdrant_client
 from src.utils import get_logger, log_document_indexed
 
@@ -411,6 +412,8 @@ class MultimodalIndexer:
                 system_prompt="You are an expert at describing images accurately and concisely.",
                 max_tokens=150,
                 temperature=0.3,
+                priority=BACKGROUND,  # Shed under load; falls back to "Image attachment"
+                purpose="caption",
             )
             
             caption = response.content.strip()
@@ -548,6 +551,9 @@ class MultimodalIndexer:
             chunks=chunks_indexed,
         )
         
+        # Cached answers may be based on the previous version of the docs
+        bump_docs_version(channel_id)
+        
         return {
             "chunks": chunks_indexed,
             "images": 0,
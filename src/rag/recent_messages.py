@@ -0,0 +1,310 @@
+"""
+Local read path for recent channel messages.
+
+Answering a mention used to cost two to three REST round-trips before the
+LLM call (referenced message, mentioned channel's history, channel reads
+for GeneralAgent), although the same messages are already ingested.
+
+Reads are now served locally:
+- Per-channel ring buffer of the last K messages, kept current by
+  on_message / on_message_edit / on_raw_message_delete
+- Cold buffers are seeded once from messages.db
+- REST is only used when neither is fresh, i.e. the channel's
+  last_message_id (tracked by the gateway) hasn't been seen locally, or
+  the requested tail isn't known to be gap-free
+
+A buffer is only served from the oldest message it is known to hold
+contiguously: set by REST fetches (the channel's latest messages) and by
+seeds that reach the first live message; live messages extend it. After
+a restart, a seed that stops before the first live message leaves the
+downtime as a gap and is not trusted.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Set
+
+import discord
+
+from src.rag.sqlite_storage import StoredMessage, get_message_storage
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Messages kept per channel
+DEFAULT_BUFFER_SIZE = 50
+
+
+@dataclass
+class RecentMessage:
+    """Minimal message view used for context building."""
+    message_id: int
+    channel_id: int
+    author_id: int
+    author_name: str
+    author_display_name: str
+    author_is_bot: bool
+    content: str
+    created_at: datetime
+    url: str
+
+    @classmethod
+    def from_discord(cls, message: discord.Message) -> "RecentMessage":
+        return cls(
+            message_id=message.id,
+            channel_id=message.channel.id,
+            author_id=message.author.id,
+            author_name=message.author.name,
+            author_display_name=message.author.display_name or message.author.name,
+            author_is_bot=message.author.bot,
+            content=message.content,
+            created_at=message.created_at,
+            url=message.jump_url,
+        )
+
+    @classmethod
+    def from_stored(
+        cls,
+        stored: StoredMessage,
+        guild: Optional[discord.Guild] = None,
+    ) -> "RecentMessage":
+        # Stored rows don't record bots; resolve from the member cache
+        member = guild.get_member(int(stored.author_id)) if guild else None
+        return cls(
+            message_id=int(stored.message_id),
+            channel_id=int(stored.channel_id),
+            author_id=int(stored.author_id),
+            author_name=stored.author_name,
+            author_display_name=stored.author_display_name or stored.author_name,
+            author_is_bot=bool(member and member.bot),
+            content=stored.content,
+            created_at=datetime.fromisoformat(stored.timestamp),
+            url=stored.url,
+        )
+
+
+class RecentMessageStore:
+    """
+    Per-channel ring buffers of recent messages.
+
+    Usage:
+        store = get_recent_message_store()
+        store.record(message)  # on_message
+        recent = await store.get_recent(channel, limit=10)
+        replied = await store.get_message(channel, message_id)
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, message_storage=None):
+        """
+        Initialize store.
+
+        Args:
+            buffer_size: Messages kept per channel (K)
+            message_storage: SQLite message storage (seed source)
+        """
+        self.buffer_size = buffer_size
+        self.message_storage = message_storage or get_message_storage()
+
+        self._buffers: Dict[int, Deque[RecentMessage]] = {}
+        self._newest_seen: Dict[int, int] = {}  # High-water mark, survives deletes
+        self._first_live: Dict[int, int] = {}  # First message recorded from the gateway
+        self._contiguous_since: Dict[int, int] = {}  # No gaps from this ID on (0 = whole channel)
+        self._seeded: Set[int] = set()  # Channels seeded from SQLite
+
+        self.stats = {"local_hits": 0, "sqlite_seeds": 0, "rest_fallbacks": 0}
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Gateway events
+    # ─────────────────────────────────────────────────────────────────────
+
+    def record(self, message: discord.Message):
+        """Append a new message to its channel's buffer."""
+        self._first_live.setdefault(message.channel.id, message.id)
+        self._add(message.channel.id, [RecentMessage.from_discord(message)])
+
+    def update(self, message: discord.Message):
+        """Replace an edited message if it's buffered."""
+        buffer = self._buffers.get(message.channel.id)
+        if not buffer:
+            return
+        for i, entry in enumerate(buffer):
+            if entry.message_id == message.id:
+                buffer[i] = RecentMessage.from_discord(message)
+                return
+
+    def remove(self, channel_id: int, message_id: int):
+        """Drop a deleted message from its channel's buffer."""
+        buffer = self._buffers.get(channel_id)
+        if not buffer:
+            return
+        for entry in buffer:
+            if entry.message_id == message_id:
+                buffer.remove(entry)
+                return
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Reads
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def get_recent(
+        self,
+        channel: discord.abc.Messageable,
+        limit: int = 10,
+    ) -> List[RecentMessage]:
+        """
+        Get the channel's most recent messages (oldest first).
+
+        Served from the ring buffer, seeded from SQLite when cold; REST
+        history is only fetched when both are stale or too short.
+
+        Args:
+            channel: Text channel
+            limit: Number of messages
+
+        Returns:
+            Up to `limit` messages, oldest first
+        """
+        limit = min(limit, self.buffer_size)
+
+        if self._can_serve(channel, limit):
+            self.stats["local_hits"] += 1
+            return self._tail(channel.id, limit)
+
+        if channel.id not in self._seeded:
+            self._seed_from_storage(channel)
+            if self._can_serve(channel, limit):
+                self.stats["local_hits"] += 1
+                return self._tail(channel.id, limit)
+
+        # Cold: fetch from Discord and keep the result buffered
+        self.stats["rest_fallbacks"] += 1
+        fetched = [
+            RecentMessage.from_discord(message)
+            async for message in channel.history(limit=self.buffer_size)
+        ]
+        self._add(channel.id, fetched)
+        if len(fetched) < self.buffer_size:
+            self._contiguous_since[channel.id] = 0
+        elif fetched:
+            self._contiguous_since[channel.id] = min(m.message_id for m in fetched)
+
+        logger.debug("recent_messages_rest_fallback", channel_id=channel.id, fetched=len(fetched))
+        return self._tail(channel.id, limit)
+
+    async def get_message(
+        self,
+        channel: discord.abc.Messageable,
+        message_id: int,
+    ) -> Optional[RecentMessage]:
+        """
+        Get a single message (e.g. the one being replied to).
+
+        Looks in the ring buffer, then SQLite, then falls back to REST.
+
+        Returns:
+            Message or None if it doesn't exist / can't be fetched
+        """
+        buffer = self._buffers.get(channel.id)
+        if buffer:
+            for entry in buffer:
+                if entry.message_id == message_id:
+                    self.stats["local_hits"] += 1
+                    return entry
+
+        stored = self.message_storage.get_message(str(message_id))
+        if stored:
+            self.stats["local_hits"] += 1
+            return RecentMessage.from_stored(stored, getattr(channel, "guild", None))
+
+        self.stats["rest_fallbacks"] += 1
+        try:
+            message = await channel.fetch_message(message_id)
+        except discord.HTTPException:
+            return None
+        return RecentMessage.from_discord(message)
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _can_serve(self, channel: discord.abc.Messageable, limit: int) -> bool:
+        """Buffer is fresh (has the channel's latest message) and its last `limit` are gap-free."""
+        buffer = self._buffers.get(channel.id)
+        since = self._contiguous_since.get(channel.id)
+        if not buffer or since is None:
+            return False
+
+        last_message_id = getattr(channel, "last_message_id", None)
+        if last_message_id and self._newest_seen.get(channel.id, 0) < last_message_id:
+            return False
+
+        if since == 0:
+            return True
+        contiguous = sum(1 for entry in buffer if entry.message_id >= since)
+        return contiguous >= limit
+
+    def _seed_from_storage(self, channel: discord.abc.Messageable):
+        """Fill a cold buffer from messages.db."""
+        self._seeded.add(channel.id)
+        try:
+            stored = self.message_storage.get_channel_messages(
+                str(channel.id), limit=self.buffer_size
+            )
+        except Exception as e:
+            logger.error("recent_messages_seed_failed", channel_id=channel.id, error=str(e))
+            return
+
+        guild = getattr(channel, "guild", None)
+        messages = [RecentMessage.from_stored(row, guild) for row in stored]
+        self._add(channel.id, messages)
+        self.stats["sqlite_seeds"] += 1
+
+        # Trust the seed only if it reaches the live stream (or the channel
+        # head when nothing arrived live yet); otherwise the downtime is a gap
+        if not messages or channel.id in self._contiguous_since:
+            return
+        newest = max(m.message_id for m in messages)
+        reach = self._first_live.get(channel.id) or getattr(channel, "last_message_id", None)
+        if reach and newest >= reach:
+            self._contiguous_since[channel.id] = min(m.message_id for m in messages)
+
+    def _add(self, channel_id: int, messages: List[RecentMessage]):
+        """Merge messages into a buffer, keeping ID order and the last K."""
+        if not messages:
+            return
+
+        buffer = self._buffers.get(channel_id)
+        if buffer is None:
+            buffer = deque(maxlen=self.buffer_size)
+            self._buffers[channel_id] = buffer
+
+        newest = max(m.message_id for m in messages)
+        self._newest_seen[channel_id] = max(self._newest_seen.get(channel_id, 0), newest)
+
+        # Fast path: live message newer than everything buffered
+        if len(messages) == 1 and (not buffer or buffer[-1].message_id < messages[0].message_id):
+            buffer.append(messages[0])
+            return
+
+        merged = {m.message_id: m for m in buffer}
+        for m in messages:
+            merged.setdefault(m.message_id, m)
+        buffer.clear()
+        buffer.extend(merged[k] for k in sorted(merged)[-self.buffer_size:])
+
+    def _tail(self, channel_id: int, limit: int) -> List[RecentMessage]:
+        buffer = self._buffers.get(channel_id) or ()
+        return list(buffer)[-limit:]
+
+
+# Singleton instance
+_store: Optional[RecentMessageStore] = None
+
+
+def get_recent_message_store() -> RecentMessageStore:
+    """Get singleton recent message store."""
+    global _store
+    if _store is None:
+        _store = RecentMessageStore()
+    return _store
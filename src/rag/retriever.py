@@ -18,6 +18,7 @@ from qdrant_client.models import Filter, FieldCondition, MatchValue, ScoredPoint
 from src.rag import MultimodalEmbedder
 from src.rag.qdrant_singleton import get_qdrant_client
 from src.utils import get_logger, log_rag_retrieval
+from src.utils.metrics import DB_LATENCY
 
 logger = get_logger(__name__)
 
@@ -183,13 +184,14 @@ class HybridRetriever:
                 query_filter = Filter(**filter_args)
         
         # Vector search with named vector
-        search_results = self.qdrant.search(
-            collection_name=collection_name,
-            query_vector=("text", query_vector),  # Use 'text' named vector
-            limit=top_k * 2,  # Over-retrieve for filtering
-            query_filter=query_filter,
-            score_threshold=self.min_score,
-        )
+        with DB_LATENCY.time(backend="qdrant", operation="search"):
+            search_results = self.qdrant.search(
+                collection_name=collection_name,
+                query_vector=("text", query_vector),  # Use 'text' named vector
+                limit=top_k * 2,  # Over-retrieve for filtering
+                query_filter=query_filter,
+                score_threshold=self.min_score,
+            )
         
         # Convert to documents
         documents = []
@@ -252,11 +254,12 @@ class HybridRetriever:
         
         try:
             # Search messages using FTS5, exclude the asking user
-            results = self.sqlite_storage.search(
-                query=query,
-                category_ids_exclude=self.ignored_categories if self.ignored_categories else None,
-                limit=limit * 2,  # Get more results to filter
-            )
+            with DB_LATENCY.time(backend="sqlite", operation="fts_search"):
+                results = self.sqlite_storage.search(
+                    query=query,
+                    category_ids_exclude=self.ignored_categories if self.ignored_categories else None,
+                    limit=limit * 2,  # Get more results to filter
+                )
             
             documents = []
             seen_content = set()  # Deduplicate similar messages
@@ -360,12 +363,13 @@ class HybridRetriever:
                 ]
             )
             
-            search_results = self.qdrant.search(
-                collection_name=collection_name,
-                query_vector=("image", query_vector),  # Use 'image' named vector for CLIP
-                limit=top_k,
-                query_filter=type_filter,
-            )
+            with DB_LATENCY.time(backend="qdrant", operation="image_search"):
+                search_results = self.qdrant.search(
+                    collection_name=collection_name,
+                    query_vector=("image", query_vector),  # Use 'image' named vector for CLIP
+                    limit=top_k,
+                    query_filter=type_filter,
+                )
             
             # Convert to documents
             documents = [
@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from contextlib import contextmanager
 
+from src.rag.user_activity_cache import UserActivityCache
 from src.utils import get_logger
 
 logger = get_logger(__name__)
@@ -68,7 +69,11 @@ class SQLiteMessageStorage:
         self.db_path = db_path or DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Per-user message counters (O(1) reads for moderation trust checks)
+        self.user_activity = UserActivityCache()
+        
         self._init_database()
+        self._warm_user_activity()
         
         # Silent init
     
@@ -167,8 +172,60 @@ class SQLiteMessageStorage:
                 ON messages(category_id)
             """)
             
+            # Per-user message counts (kept in sync by triggers)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_message_counts (
+                    author_id TEXT PRIMARY KEY,
+                    message_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS messages_counts_ai AFTER INSERT ON messages BEGIN
+                    INSERT INTO user_message_counts(author_id, message_count)
+                    VALUES (new.author_id, 1)
+                    ON CONFLICT(author_id) DO UPDATE SET message_count = message_count + 1;
+                END
+            """)
+            
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS messages_counts_ad AFTER DELETE ON messages BEGIN
+                    UPDATE user_message_counts SET message_count = message_count - 1
+                    WHERE author_id = old.author_id;
+                END
+            """)
+            
+            # Backfill counts once for databases created before the counts table
+            cursor.execute("SELECT 1 FROM user_message_counts LIMIT 1")
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                    INSERT INTO user_message_counts (author_id, message_count)
+                    SELECT author_id, COUNT(*) FROM messages GROUP BY author_id
+                """)
+            
             pass  # Schema ready
     
+    def _warm_user_activity(self):
+        """Load per-user message counts into the in-memory cache."""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT author_id, message_count FROM user_message_counts"
+                )
+                self.user_activity.load(cursor.fetchall())
+        except Exception as e:
+            logger.error("user_activity_warm_failed", error=str(e))
+    
+    def refresh_user_activity(self):
+        """
+        Reload per-user message counts from SQLite.
+        
+        Picks up writes made outside this instance (e.g. standalone scraper
+        scripts); called periodically by SchedulerHandler.
+        """
+        self._warm_user_activity()
+    
     def store_message(self, message: StoredMessage) -> bool:
         """
         Store a message in the database.
@@ -206,6 +263,7 @@ class SQLiteMessageStorage:
                 ))
                 
                 if cursor.rowcount > 0:
+                    self.user_activity.increment(message.author_id)
                     logger.debug(
                         "message_stored",
                         message_id=message.message_id,
@@ -236,6 +294,7 @@ class SQLiteMessageStorage:
             return 0
         
         stored_count = 0
+        stored_authors: List[str] = []
         
         try:
             with self._get_connection() as conn:
@@ -266,6 +325,7 @@ class SQLiteMessageStorage:
                     
                     if cursor.rowcount > 0:
                         stored_count += 1
+                        stored_authors.append(message.author_id)
                 
                 # Log if some messages were skipped (duplicates)
                 skipped = len(messages) - stored_count
@@ -276,6 +336,10 @@ class SQLiteMessageStorage:
                         stored=stored_count,
                         skipped_duplicates=skipped,
                     )
+            
+            # Transaction committed - update in-memory counters
+            for author_id in stored_authors:
+                self.user_activity.increment(author_id)
                 
         except Exception as e:
             logger.error(
@@ -455,24 +519,44 @@ class SQLiteMessageStorage:
             
             rows = cursor.fetchall()
             
-            return [
-                StoredMessage(
-                    message_id=row["message_id"],
-                    channel_id=row["channel_id"],
-                    channel_name=row["channel_name"],
-                    guild_id=row["guild_id"],
-                    category_id=row["category_id"],
-                    author_id=row["author_id"],
-                    author_name=row["author_name"],
-                    author_display_name=row["author_display_name"],
-                    author_roles=json.loads(row["author_roles"]) if row["author_roles"] else None,
-                    content=row["content"],
-                    timestamp=row["timestamp"],
-                    url=row["url"],
-                    attachments_count=row["attachments_count"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_message(row) for row in rows]
+    
+    def get_message(self, message_id: str) -> Optional[StoredMessage]:
+        """
+        Get a single message by ID.
+        
+        Args:
+            message_id: Discord message ID
+            
+        Returns:
+            Stored message or None
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM messages WHERE message_id = ? LIMIT 1",
+                (message_id,)
+            )
+            row = cursor.fetchone()
+            return self._row_to_message(row) if row else None
+    
+    def _row_to_message(self, row: sqlite3.Row) -> StoredMessage:
+        """Convert a messages row to StoredMessage."""
+        return StoredMessage(
+            message_id=row["message_id"],
+            channel_id=row["channel_id"],
+            channel_name=row["channel_name"],
+            guild_id=row["guild_id"],
+            category_id=row["category_id"],
+            author_id=row["author_id"],
+            author_name=row["author_name"],
+            author_display_name=row["author_display_name"],
+            author_roles=json.loads(row["author_roles"]) if row["author_roles"] else None,
+            content=row["content"],
+            timestamp=row["timestamp"],
+            url=row["url"],
+            attachments_count=row["attachments_count"],
+        )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get storage statistics."""
@@ -596,7 +680,15 @@ class SQLiteMessageStorage:
             }
     
     def get_user_message_count(self, user_id: str) -> int:
-        """Get total message count for a user."""
+        """
+        Get total message count for a user.
+        
+        Served from the in-memory counter cache; falls back to COUNT(*)
+        only if the cache could not be warmed.
+        """
+        if self.user_activity.warmed:
+            return self.user_activity.get(user_id)
+        
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -747,8 +839,12 @@ class SQLiteMessageStorage:
                 channel_id=channel_id,
                 deleted=deleted,
             )
-            
-            return deleted
+        
+        # Counts table was updated by trigger - resync cache
+        if deleted:
+            self._warm_user_activity()
+        
+        return deleted
 
 
 # Singleton instance
@@ -0,0 +1,62 @@
+"""
+In-memory per-user message counters for trust decisions.
+
+Moderation checks (scam detection, strict link filter, anti-impersonation)
+need a user's message count for every checked message. Counting rows in
+SQLite each time means a new connection and a COUNT(*) per check, so the
+counts are kept in a dict instead:
+
+- Warmed once at startup from the `user_message_counts` table
+  (backfilled with a single GROUP BY when the table is first created)
+- Incremented by the ingestion path whenever a message is stored
+- Persisted by SQLite triggers, so restarts don't need a full recount
+- Reloaded periodically (SchedulerHandler) to pick up rows written by other
+  processes, e.g. scripts/scrape_discord_messages.py
+"""
+
+from typing import Dict, Iterable, Tuple
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class UserActivityCache:
+    """
+    Per-user message counter cache.
+
+    Reads are O(1) dict lookups. The cache is owned by
+    SQLiteMessageStorage, which keeps it in sync with inserts.
+    """
+
+    def __init__(self):
+        """Initialize empty cache."""
+        self._counts: Dict[str, int] = {}
+        self.warmed = False
+
+    def load(self, rows: Iterable[Tuple[str, int]]):
+        """
+        Replace cache contents with (author_id, message_count) rows.
+
+        Args:
+            rows: Iterable of (author_id, message_count) pairs
+        """
+        self._counts = {str(author_id): int(count) for author_id, count in rows if count > 0}
+        self.warmed = True
+
+        logger.debug(
+            "user_activity_cache_warmed",
+            users=len(self._counts),
+        )
+
+    def get(self, user_id: str) -> int:
+        """Get cached message count for a user (0 if unknown)."""
+        return self._counts.get(str(user_id), 0)
+
+    def increment(self, user_id: str, amount: int = 1):
+        """Increment message count for a user."""
+        user_id = str(user_id)
+        self._counts[user_id] = self._counts.get(user_id, 0) + amount
+
+    def __len__(self) -> int:
+        return len(self._counts)
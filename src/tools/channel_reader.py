@@ -1,12 +1,16 @@
 """
 Channel reader tool for reading recent messages from Discord channels.
+
+Reads go through the local recent-message store (ring buffer + SQLite);
+Discord history is only requested when the local copy is cold.
 """
 
 from typing import List, Dict, Optional
 import discord
 from datetime import datetime
 
-from src.utils import get_logger
+from src.rag import get_recent_message_store
+from src.utils import get_channel_index, get_logger
 
 logger = get_logger(__name__)
 
@@ -59,23 +63,18 @@ class ChannelReader:
                 )
                 return []
             
-            # Fetch recent messages
-            messages = []
-            async for message in channel.history(limit=limit):
-                # Skip bot messages
-                if message.author.bot:
-                    continue
-                
-                # Format message
-                messages.append({
-                    "author": message.author.display_name or message.author.name,
+            # Recent messages (oldest first), skipping bot messages
+            recent = await get_recent_message_store().get_recent(channel, limit=limit)
+            messages = [
+                {
+                    "author": message.author_display_name,
                     "content": message.content,
                     "timestamp": message.created_at.strftime("%Y-%m-%d %H:%M"),
-                    "url": message.jump_url,
-                })
-            
-            # Reverse to show oldest first
-            messages.reverse()
+                    "url": message.url,
+                }
+                for message in recent
+                if not message.author_is_bot
+            ]
             
             logger.info(
                 "channel_messages_read",
@@ -119,9 +118,9 @@ class ChannelReader:
                 return None
             
             # Find channel by name
-            channel = discord.utils.get(guild.channels, name=channel_name)
+            channel_id = get_channel_index().get_id(guild, channel_name)
             
-            if not channel:
+            if not channel_id:
                 logger.warning(
                     "channel_not_found_by_name",
                     guild_id=guild_id,
@@ -129,7 +128,7 @@ class ChannelReader:
                 )
                 return None
             
-            return await self.read_recent_messages(channel.id, limit)
+            return await self.read_recent_messages(channel_id, limit)
             
         except Exception as e:
             logger.error(
@@ -23,6 +23,9 @@ from .production_logger import (
     console_print,
 )
 from .scraper_progress import ScraperProgress
+from .adaptive_concurrency import AdaptiveConcurrency, ThroughputMeter
+from .rate_limiter import TokenBucketLimiter, get_rate_limiter
+from .channel_index import ChannelIndex, get_channel_index
 
 __all__ = [
     # Config
@@ -46,4 +49,13 @@ __all__ = [
     "console_print",
     # Scraper progress
     "ScraperProgress",
+    # Adaptive scrape concurrency
+    "AdaptiveConcurrency",
+    "ThroughputMeter",
+    # Mention rate limiting
+    "TokenBucketLimiter",
+    "get_rate_limiter",
+    # Channel-name index
+    "ChannelIndex",
+    "get_channel_index",
 ]
@@ -0,0 +1,263 @@
+"""
+Adaptive (AIMD) concurrency for Discord history scraping.
+
+A fixed semaphore is either too cautious (cold-start backfill of a large
+server crawls) or too aggressive (429 storms). The controller instead:
+- adds one slot after every `limit` consecutive fast requests (additive increase)
+- halves the limit on a 429 or when request latency rises well above the
+  observed baseline (multiplicative decrease)
+
+discord.py retries 429s internally, so rate limits are observed through the
+"discord.http" logger (see install_rate_limit_listener) and through latency.
+"""
+
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, List, Optional
+
+import discord
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Messages per channel.history() request
+HISTORY_PAGE_SIZE = 100
+
+# Channels with messages newer than this are scraped first
+RECENT_ACTIVITY_WINDOW = timedelta(days=7)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limiter.
+
+    Usage:
+        limiter = AdaptiveConcurrency(initial=5, maximum=20)
+        async with limiter.slot():
+            ...
+            limiter.record_success(latency)
+    """
+
+    def __init__(
+        self,
+        initial: int = 5,
+        minimum: int = 1,
+        maximum: int = 20,
+        latency_backoff_ratio: float = 2.0,
+        cooldown: float = 5.0,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            initial: Starting concurrency
+            minimum: Lowest concurrency after back-off
+            maximum: Highest concurrency
+            latency_backoff_ratio: Back off when latency exceeds baseline * ratio
+            cooldown: Min seconds between two decreases
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.latency_backoff_ratio = latency_backoff_ratio
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.rate_limits = 0
+        self.latency: Optional[float] = None  # EWMA
+        self.baseline: Optional[float] = None  # Lowest EWMA seen
+
+        self._successes = 0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one concurrency slot."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+        try:
+            wait = self._paused_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self, latency: float):
+        """
+        Record a successful request.
+
+        Args:
+            latency: Request latency in seconds
+        """
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.baseline is None or self.latency < self.baseline:
+            self.baseline = self.latency
+
+        if self.latency > self.baseline * self.latency_backoff_ratio and self.latency > 0.5:
+            self._decrease("latency")
+            return
+
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self._successes = 0
+            self._set_limit(self.limit + 1)
+
+    def record_rate_limit(self, retry_after: float = 0.0):
+        """
+        Record a 429 response.
+
+        Args:
+            retry_after: Seconds Discord asked to wait
+        """
+        self.rate_limits += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        self._decrease("rate_limited")
+
+    def _decrease(self, reason: str):
+        self._successes = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+
+        # Latency after back-off becomes the new reference
+        self.baseline = self.latency
+        self._set_limit(max(self.minimum, self.limit // 2), reason)
+
+    def _set_limit(self, limit: int, reason: str = "increase"):
+        if limit == self.limit:
+            return
+        # Waiters re-check the limit on the next slot release
+        logger.debug("scrape_concurrency_changed", old=self.limit, new=limit, reason=reason)
+        self.limit = limit
+
+
+class ThroughputMeter:
+    """Messages/sec since start."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.count = 0
+
+    def add(self, count: int = 1):
+        self.count += count
+
+    @property
+    def per_second(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+
+async def timed_history(history, on_page):
+    """
+    Iterate channel.history(), reporting request latency per page.
+
+    Only time spent waiting on the iterator is measured (not the caller's
+    processing), so `on_page(latency)` reflects the API round-trip.
+    """
+    iterator = history.__aiter__()
+    waited = 0.0
+    count = 0
+
+    while True:
+        started = time.monotonic()
+        try:
+            message = await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+        waited += time.monotonic() - started
+        count += 1
+
+        if count >= HISTORY_PAGE_SIZE:
+            on_page(waited)
+            waited = 0.0
+            count = 0
+
+        yield message
+
+    if count:
+        on_page(waited)
+
+
+def _last_activity(channel: discord.TextChannel) -> datetime:
+    if channel.last_message_id:
+        return discord.utils.snowflake_time(channel.last_message_id)
+    return channel.created_at
+
+
+def estimate_channel_size(channel: discord.TextChannel, before_id: Optional[int] = None) -> float:
+    """
+    Rough size estimate: active lifetime of the channel in seconds.
+
+    Discord exposes no message count for text channels; the span between
+    creation and last message (or the backfill cursor) is a usable proxy.
+    """
+    end = discord.utils.snowflake_time(before_id) if before_id else _last_activity(channel)
+    return max(0.0, (end - channel.created_at).total_seconds())
+
+
+def prioritize_channels(
+    channels: Iterable[discord.TextChannel],
+    size_of: Optional[Callable[[discord.TextChannel], float]] = None,
+    now: Optional[datetime] = None,
+) -> List[discord.TextChannel]:
+    """
+    Order channels for scraping.
+
+    Recently active channels go first; within each group the largest
+    channels start first, so long backfills don't end up as the tail.
+
+    Args:
+        channels: Channels to order
+        size_of: Remaining-work estimate (default: estimate_channel_size)
+        now: Current time (for tests)
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - RECENT_ACTIVITY_WINDOW
+    size_of = size_of or estimate_channel_size
+
+    return sorted(
+        channels,
+        key=lambda ch: (_last_activity(ch) < cutoff, -size_of(ch)),
+    )
+
+
+_RATE_LIMIT_RE = re.compile(r"^/channels/\d+/messages")
+
+
+def install_rate_limit_listener(limiter: AdaptiveConcurrency) -> Callable:
+    """
+    Report discord.py rate limits on message history routes to the limiter.
+
+    Uses the shared 429 parser in src.utils.metrics, which also feeds
+    the discord_rate_limited_total metric.
+
+    Returns:
+        Listener (pass to remove_rate_limit_listener when done)
+    """
+    from src.utils.metrics import get_rate_limit_handler
+
+    def listener(event):
+        if event.scope == "global" or _RATE_LIMIT_RE.match(event.path):
+            limiter.record_rate_limit(event.retry_after)
+
+    get_rate_limit_handler().add_listener(listener)
+    return listener
+
+
+def remove_rate_limit_listener(listener: Callable):
+    """Detach a listener added by install_rate_limit_listener."""
+    from src.utils.metrics import get_rate_limit_handler
+
+    get_rate_limit_handler().remove_listener(listener)
@@ -0,0 +1,111 @@
+"""
+Per-guild channel-name index.
+
+Channel names in LLM responses (#name) and channel-read requests are
+resolved through a name -> ID map instead of scanning guild.channels for
+every match. The same index keeps the visible text channels in server
+order for the prompt channel list.
+
+Built lazily per guild and refreshed from the on_guild_channel_* events.
+"""
+
+from typing import Dict, List, Optional
+
+import discord
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class _GuildChannels:
+    __slots__ = ("by_name", "visible_text")
+
+    def __init__(self, by_name: Dict[str, int], visible_text: List[int]):
+        self.by_name = by_name
+        self.visible_text = visible_text
+
+
+class ChannelIndex:
+    """
+    Channel name -> ID lookup per guild.
+
+    Usage:
+        index = get_channel_index()
+        channel_id = index.get_id(guild, "general")
+        index.refresh(guild)  # channel create/update/delete
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, _GuildChannels] = {}
+        self.stats = {"lookups": 0, "builds": 0}
+
+    def get_id(self, guild: discord.Guild, name: str) -> Optional[int]:
+        """
+        Resolve a channel name (without #, case-insensitive).
+
+        Returns:
+            Channel ID or None if the guild has no such channel
+        """
+        self.stats["lookups"] += 1
+        return self._get(guild).by_name.get(name.lower())
+
+    def visible_text_channels(self, guild: discord.Guild) -> List[int]:
+        """IDs of text channels the bot can see, in server order."""
+        return self._get(guild).visible_text
+
+    def refresh(self, guild: discord.Guild):
+        """Rebuild the guild's index from its current channels."""
+        self._guilds[guild.id] = self._build(guild)
+
+    def remove_guild(self, guild_id: int):
+        """Forget a guild (bot left)."""
+        self._guilds.pop(guild_id, None)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Index counters and size."""
+        return {
+            **self.stats,
+            "guilds": len(self._guilds),
+            "channels": sum(len(g.by_name) for g in self._guilds.values()),
+        }
+
+    def _get(self, guild: discord.Guild) -> _GuildChannels:
+        entry = self._guilds.get(guild.id)
+        if entry is None:
+            entry = self._build(guild)
+            self._guilds[guild.id] = entry
+        return entry
+
+    def _build(self, guild: discord.Guild) -> _GuildChannels:
+        by_name: Dict[str, int] = {}
+        for channel in guild.channels:
+            # Duplicate names resolve to the first channel, like discord.utils.get
+            by_name.setdefault(channel.name.lower(), channel.id)
+
+        me = guild.me
+        visible_text = [
+            ch.id for ch in guild.text_channels
+            if me is None or ch.permissions_for(me).view_channel
+        ]
+
+        self.stats["builds"] += 1
+        logger.debug(
+            "channel_index_built",
+            guild_id=guild.id,
+            channels=len(by_name),
+            visible_text=len(visible_text),
+        )
+        return _GuildChannels(by_name, visible_text)
+
+
+# Singleton instance
+_index: Optional[ChannelIndex] = None
+
+
+def get_channel_index() -> ChannelIndex:
+    """Get singleton channel-name index."""
+    global _index
+    if _index is None:
+        _index = ChannelIndex()
+    return _index
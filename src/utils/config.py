@@ -35,6 +35,7 @@ class LLMConfig(BaseModel):
     max_tokens: int = 2000
     timeout: int = 30
     base_url: str = "https://openrouter.ai/api/v1"
+    streaming: bool = True  # Stream replies with progressive message edits
 
 
 class EmbeddingsConfig(BaseModel):
@@ -68,12 +69,16 @@ class AutoIndexingConfig(BaseModel):
     queue_size: int = 1000
     batch_size: int = 50  # Messages per batch for indexing
     batch_timeout: int = 5
-    parallel_channels: int = 5  # Max channels to scrape in parallel
+    parallel_channels: int = 5  # Initial channels to scrape in parallel
+    max_parallel_channels: int = 20  # Upper bound for adaptive concurrency
+    latency_backoff_ratio: float = 2.0  # Back off when history latency exceeds baseline * ratio
     exclude_channels: list[str] = Field(default_factory=list)
     exclude_bots: bool = True
     ignored_categories: list[str] = Field(default_factory=list)  # Discord category IDs to exclude
     scrape_on_startup: bool = True
     scrape_limit_per_channel: Optional[int] = None  # None = scrape all messages
+    checkpoint_every_batches: int = 5  # Save mid-channel scrape progress every N batches
+    user_activity_refresh_interval: int = 600  # Seconds; reload counts written by other processes (0 = off)
 
 
 class LoggingConfig(BaseModel):
@@ -93,6 +98,8 @@ class MonitoringConfig(BaseModel):
     """Monitoring configuration."""
     langsmith: Dict[str, Any] = Field(default_factory=dict)
     metrics: Dict[str, Any] = Field(default_factory=dict)
+    loop_watchdog: Dict[str, Any] = Field(default_factory=dict)
+    openrouter_usage: Dict[str, Any] = Field(default_factory=dict)
 
 
 class PerformanceConfig(BaseModel):
@@ -102,6 +109,17 @@ class PerformanceConfig(BaseModel):
     retry_attempts: int = 3
     retry_backoff: int = 2
     cache: Dict[str, Any] = Field(default_factory=dict)
+    # Per-stage timeouts (seconds) for the pre-LLM pipeline
+    stage_timeouts: Dict[str, float] = Field(default_factory=lambda: {
+        "reply_context": 3.0,
+        "channel_content": 4.0,
+        "routing": 5.0,
+        "rag_context": 8.0,
+        "tools": 6.0,
+    })
+    # LLM priority classes: class_limits, queue_deadlines, moderation_reserve,
+    # max_background_queue
+    llm_scheduler: Dict[str, Any] = Field(default_factory=dict)
 
 
 class RateLimitConfig(BaseModel):
@@ -109,6 +127,18 @@ class RateLimitConfig(BaseModel):
     enabled: bool = True
     requests_per_minute: int = 10
     burst: int = 5
+    per_channel: bool = False  # Separate buckets per user + channel
+
+
+class ConversationMemoryConfig(BaseModel):
+    """Conversation memory configuration."""
+    max_users: int = 5000  # Users kept in memory (LRU; the rest stay in SQLite)
+    max_total_mb: int = 32  # Cap on history kept in memory
+    user_byte_budget: int = 16384  # Max history bytes per user
+    max_turn_chars: int = 1500  # Stored queries/responses are truncated to this
+    idle_ttl_hours: float = 24  # Forget users idle for longer
+    summarize: bool = False  # Roll dropped turns into a short LLM summary
+    summary_max_chars: int = 600
 
 
 class ModerationConfig(BaseModel):
@@ -118,6 +148,7 @@ class ModerationConfig(BaseModel):
     check_roles: list[str] = Field(default_factory=list)
     url_whitelist: list[str] = Field(default_factory=list)
     strict_link_filter: Dict[str, Any] = Field(default_factory=dict)
+    user_history: Dict[str, Any] = Field(default_factory=dict)
     patterns: Dict[str, Any] = Field(default_factory=dict)
     ai_analysis: Dict[str, Any] = Field(default_factory=dict)
     actions: Dict[str, Any] = Field(default_factory=dict)
@@ -190,6 +221,8 @@ class AntiImpersonationConfig(BaseModel):
     log_channel_id: str = ""
     protected_names: list[str] = Field(default_factory=list)
     trusted_role_ids: list[str] = Field(default_factory=list)
+    trusted_message_count: int = 100  # Users with this many messages skip checks
+    sweep: Dict[str, Any] = Field(default_factory=dict)  # Full-guild retroactive sweep
 
 
 class EmbedConfig(BaseModel):
@@ -250,6 +283,22 @@ class ContentFilterConfig(BaseModel):
     warning_delete_after: int = 5
 
 
+class ChannelRuleConfig(BaseModel):
+    """Single per-channel rule."""
+    channel: str
+    rule: str
+    warning: Optional[str] = None
+    bypass_roles: Optional[list[str]] = None  # None = use channel_rules.bypass_roles
+    bypass_admins: bool = False
+
+
+class ChannelRulesConfig(BaseModel):
+    """Per-channel rule engine configuration."""
+    reload_interval: int = 30
+    bypass_roles: list[str] = Field(default_factory=list)
+    rules: list[ChannelRuleConfig] = Field(default_factory=list)
+
+
 class ReactAllConfig(BaseModel):
     """React all command configuration."""
     enabled: bool = True
@@ -301,6 +350,7 @@ class Config(BaseModel):
     monitoring: MonitoringConfig
     performance: PerformanceConfig
     rate_limit: RateLimitConfig
+    conversation_memory: ConversationMemoryConfig = Field(default_factory=lambda: ConversationMemoryConfig())
     moderation: ModerationConfig = Field(default_factory=lambda: ModerationConfig())
     reports: ReportsConfig = Field(default_factory=lambda: ReportsConfig())
     about_command: AboutCommandConfig = Field(default_factory=lambda: AboutCommandConfig())
@@ -308,6 +358,7 @@ class Config(BaseModel):
     activity_checker: ActivityCheckerConfig = Field(default_factory=lambda: ActivityCheckerConfig())
     nominations: NominationsConfig = Field(default_factory=lambda: NominationsConfig())
     content_filter: ContentFilterConfig = Field(default_factory=lambda: ContentFilterConfig())
+    channel_rules: ChannelRulesConfig = Field(default_factory=lambda: ChannelRulesConfig())
     react_all: ReactAllConfig = Field(default_factory=lambda: ReactAllConfig())
     content_submissions: ContentSubmissionsConfig = Field(default_factory=lambda: ContentSubmissionsConfig())
 
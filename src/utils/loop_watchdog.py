@@ -0,0 +1,234 @@
+"""
+Event-loop lag watchdog.
+
+A heartbeat coroutine wakes every `interval` and records how late it was
+(loop lag). A sampler thread watches the heartbeat; while it is stale by
+more than `threshold`, the loop thread is blocked, and the sampler grabs
+its current stack every `sample_interval`.
+
+Samples are aggregated by blocking site: the innermost frame in this
+repo (the caller that did the blocking work) plus the innermost frame
+overall (the library call that actually blocked). Sites are ranked by
+total blocked time and exposed via /loop_lag and metrics.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils import get_logger
+from src.utils.metrics import LOOP_BLOCKED_SECONDS, LOOP_LAG
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Distinct sites kept (the rest are counted as "other")
+MAX_SITES = 100
+
+
+@dataclass
+class BlockingSite:
+    """Aggregated samples for one blocking call site."""
+    caller: str  # Innermost repo frame
+    leaf: str  # Innermost frame overall
+    samples: int = 0
+    stalls: int = 0  # Distinct blocking episodes
+    blocked_s: float = 0.0
+    max_stall_ms: float = 0.0
+    last_seen: float = 0.0
+    stack: List[str] = field(default_factory=list)  # Last sampled stack (repo frames)
+
+
+class LoopWatchdog:
+    """
+    Measures loop lag and samples the loop thread's stack when it stalls.
+
+    Usage:
+        watchdog = get_loop_watchdog()
+        watchdog.start()  # inside the running loop
+        ...
+        watchdog.top_sites(10)
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        sample_interval: float = 0.02,
+    ):
+        """
+        Initialize watchdog.
+
+        Args:
+            interval: Heartbeat period in seconds
+            threshold: Lag in seconds that counts as a stall
+            sample_interval: Seconds between stack samples during a stall
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._lock = threading.Lock()
+        self._sites: Dict[str, BlockingSite] = {}
+        self.started_at = time.time()
+        self.max_lag_ms = 0.0
+        self.stalls = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the heartbeat task and sampler thread (call from the loop)."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._sample_loop, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            "loop_watchdog_started",
+            threshold_ms=round(self.threshold * 1000),
+            sample_interval_ms=round(self.sample_interval * 1000),
+        )
+
+    def stop(self):
+        """Stop the heartbeat and sampler."""
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def reset(self):
+        """Drop aggregated samples."""
+        with self._lock:
+            self._sites.clear()
+            self.max_lag_ms = 0.0
+            self.stalls = 0
+            self.started_at = time.time()
+
+    def top_sites(self, limit: int = 10) -> List[BlockingSite]:
+        """Blocking sites ranked by total blocked time."""
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda s: s.blocked_s, reverse=True)
+            return sites[:limit]
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._beat = time.monotonic()
+
+            LOOP_LAG.observe(lag)
+            if lag * 1000 > self.max_lag_ms:
+                self.max_lag_ms = lag * 1000
+
+    def _sample_loop(self):
+        episode_sites: set = set()
+        stalled_since: Optional[float] = None
+
+        while not self._stop.wait(self.sample_interval):
+            stale = time.monotonic() - self._beat - self.interval
+            if stale < self.threshold:
+                if stalled_since is not None:
+                    stalled_since = None
+                    episode_sites.clear()
+                continue
+
+            if stalled_since is None:
+                stalled_since = time.monotonic()
+                with self._lock:
+                    self.stalls += 1
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._record(frame, stale, episode_sites)
+
+    def _record(self, frame, stale: float, episode_sites: set):
+        stack = traceback.extract_stack(frame)
+        repo_frames = [f for f in stack if _is_repo_frame(f.filename)]
+        caller = _format_frame(repo_frames[-1]) if repo_frames else "<outside repo>"
+        leaf = _format_frame(stack[-1]) if stack else "<unknown>"
+        key = f"{caller} -> {leaf}"
+
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                if len(self._sites) >= MAX_SITES:
+                    key, caller, leaf = "other", "other", "other"
+                    site = self._sites.get(key)
+                if site is None:
+                    site = self._sites[key] = BlockingSite(caller=caller, leaf=leaf)
+
+            site.samples += 1
+            site.blocked_s += self.sample_interval
+            site.max_stall_ms = max(site.max_stall_ms, stale * 1000)
+            site.last_seen = time.time()
+            site.stack = [_format_frame(f) for f in repo_frames[-6:]]
+            if key not in episode_sites:
+                episode_sites.add(key)
+                site.stalls += 1
+
+        LOOP_BLOCKED_SECONDS.inc(self.sample_interval, caller=site.caller)
+
+
+def _is_repo_frame(filename: str) -> bool:
+    try:
+        path = Path(filename).resolve()
+    except (OSError, ValueError):
+        return False
+    return PROJECT_ROOT in path.parents and "site-packages" not in path.parts
+
+
+def _format_frame(frame: traceback.FrameSummary) -> str:
+    path = Path(frame.filename)
+    try:
+        name = str(path.resolve().relative_to(PROJECT_ROOT))
+    except ValueError:
+        name = "/".join(path.parts[-2:])
+    return f"{name}:{frame.lineno} {frame.name}"
+
+
+# Singleton instance
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def get_loop_watchdog(settings: Optional[dict] = None) -> LoopWatchdog:
+    """
+    Get singleton watchdog.
+
+    Args:
+        settings: monitoring.loop_watchdog section (first call)
+    """
+    global _watchdog
+    if _watchdog is None:
+        settings = settings or {}
+        _watchdog = LoopWatchdog(
+            interval=settings.get("interval_ms", 50) / 1000,
+            threshold=settings.get("threshold_ms", 100) / 1000,
+            sample_interval=settings.get("sample_interval_ms", 20) / 1000,
+        )
+    return _watchdog
@@ -0,0 +1,424 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Counters and histograms are plain dict updates on the hot path; component
+snapshots (scheduler, caches, rate limiter, queues) are only read when
+/metrics is scraped. Served by a small aiohttp app inside the bot process
+(monitoring.metrics in system.yaml).
+
+Usage:
+    from src.utils.metrics import LLM_TOKENS, STAGE_LATENCY
+
+    STAGE_LATENCY.observe(0.12, pipeline="pre_agent", stage="routing")
+    with DB_LATENCY.time(backend="qdrant", operation="search"):
+        ...
+"""
+
+import logging
+import math
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+SnapshotFunc = Callable[[], Dict]
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        # An undeclared label would silently land in an empty series
+        for name in labels:
+            if name not in self.labels:
+                raise ValueError(f"{self.name} has no label {name!r} (labels: {self.labels})")
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, Tuple[Tuple[str, str], ...], float]]:
+        """(suffix, label values, extra labels, value)"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield "", key, (), value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        for key, value in self._values.items():
+            yield "", key, (), value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram."""
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0.0] * (len(self.buckets) + 2)
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        for key, series in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield "_bucket", key, (("le", _format_value(bound)),), cumulative
+            cumulative += series[len(self.buckets)]
+            yield "_bucket", key, (("le", "+Inf"),), cumulative
+            yield "_count", key, (), cumulative
+            yield "_sum", key, (), series[-1]
+
+
+class MetricsRegistry:
+    """Metric definitions plus snapshot collectors."""
+
+    def __init__(self, prefix: str = "liquidbot"):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._snapshots: Dict[str, Tuple[SnapshotFunc, Optional[str]]] = {}
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(f"{self.prefix}_{name}", help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(f"{self.prefix}_{name}", help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(f"{self.prefix}_{name}", help, labels, buckets))
+
+    def register_snapshot(self, component: str, snapshot: SnapshotFunc, label: Optional[str] = None):
+        """
+        Export a component's snapshot() dict as gauges at scrape time.
+
+        Args:
+            component: Metric name part (liquidbot_<component>_<key>)
+            snapshot: Returns {key: number} or, with label, {label_value: {key: number}}
+            label: Label name for nested snapshots (e.g. "priority")
+        """
+        self._snapshots[component] = (snapshot, label)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, key, extra, value in metric.samples():
+                pairs = list(zip(metric.labels, key)) + list(extra)
+                lines.append(f"{metric.name}{suffix}{_format_labels(pairs)} {_format_value(value)}")
+
+        for component, (snapshot, label) in self._snapshots.items():
+            try:
+                lines.extend(self._render_snapshot(component, snapshot(), label))
+            except Exception as e:
+                logger.debug("metrics_snapshot_failed", component=component, error=str(e))
+
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric: _Metric):
+        existing = self._metrics.get(metric.name)
+        if existing:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _render_snapshot(self, component: str, values: Dict, label: Optional[str]) -> List[str]:
+        series: Dict[str, List[Tuple[list, float]]] = {}
+        if label:
+            for label_value, nested in values.items():
+                for key, value in nested.items():
+                    if isinstance(value, (int, float)):
+                        series.setdefault(key, []).append(([(label, str(label_value))], value))
+        else:
+            for key, value in values.items():
+                if isinstance(value, (int, float)):
+                    series.setdefault(key, []).append(([], value))
+
+        lines = []
+        for key, samples in series.items():
+            name = f"{self.prefix}_{component}_{_sanitize(key)}"
+            lines.append(f"# TYPE {name} gauge")
+            for pairs, value in samples:
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(float(value))}")
+        return lines
+
+
+def _sanitize(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+@dataclass
+class RateLimitEvent:
+    """One 429 reported by discord.py."""
+    scope: str  # route | global
+    method: str = ""
+    path: str = ""  # Request path without the API prefix
+    retry_after: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """Path with snowflakes replaced by {id} (bounded label cardinality)."""
+        return _SNOWFLAKE_RE.sub("{id}", self.path)
+
+
+RateLimitListener = Callable[[RateLimitEvent], None]
+
+_SNOWFLAKE_RE = re.compile(r"\d{15,}")
+
+
+def parse_rate_limit_record(record: logging.LogRecord) -> Optional[RateLimitEvent]:
+    """Parse discord.http's "We are being rate limited" / "Global rate limit" warnings."""
+    if record.levelno < logging.WARNING:
+        return None
+    message = str(record.msg)
+    args = record.args if isinstance(record.args, tuple) else ()
+    retry_after = float(args[-1]) if args and isinstance(args[-1], (int, float)) else 0.0
+
+    if message.startswith("We are being rate limited") and len(args) >= 2:
+        path = str(args[1]).split("/api/v10", 1)[-1].split("?", 1)[0]
+        return RateLimitEvent("route", str(args[0]), path, retry_after)
+    if message.startswith("Global rate limit has been hit"):
+        return RateLimitEvent("global", retry_after=retry_after)
+    return None
+
+
+class DiscordRateLimitHandler(logging.Handler):
+    """
+    Single parser for discord.py's 429 warnings.
+
+    Counts them in DISCORD_RATE_LIMITS and passes each event to listeners
+    (the scraper's AIMD limiter registers one while it runs).
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self._listeners: List[RateLimitListener] = []
+
+    def add_listener(self, listener: RateLimitListener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: RateLimitListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def emit(self, record: logging.LogRecord):
+        event = parse_rate_limit_record(record)
+        if event is None:
+            return
+        if event.scope == "global":
+            DISCORD_RATE_LIMITS.inc(method="", route="", scope="global")
+        else:
+            DISCORD_RATE_LIMITS.inc(method=event.method, route=event.route, scope="route")
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.debug("rate_limit_listener_failed", error=str(e))
+
+
+_rate_limit_handler: Optional[DiscordRateLimitHandler] = None
+
+
+def get_rate_limit_handler() -> DiscordRateLimitHandler:
+    """Get the rate-limit handler, attaching it to the discord.http logger on first use."""
+    global _rate_limit_handler
+    if _rate_limit_handler is None:
+        _rate_limit_handler = DiscordRateLimitHandler()
+        logging.getLogger("discord.http").addHandler(_rate_limit_handler)
+    return _rate_limit_handler
+
+
+class MetricsServer:
+    """
+    Serves the registry over HTTP.
+
+    There is no auth (the output includes cost and usage data), so the
+    server binds to localhost unless monitoring.metrics.host says otherwise.
+
+    Usage:
+        server = MetricsServer(port=8080, path="/metrics")
+        await server.start()
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, port: int = 8080, path: str = "/metrics", host: str = "127.0.0.1"):
+        self.port = port
+        self.path = path
+        self.host = host
+        self._runner = None
+
+    async def start(self):
+        from aiohttp import web
+
+        async def handle(request):
+            return web.Response(
+                text=get_metrics().render(),
+                content_type="text/plain",
+                headers={"X-Content-Type-Options": "nosniff"},
+            )
+
+        app = web.Application()
+        app.router.add_get(self.path, handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("metrics_server_started", port=self.port, path=self.path)
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# Singleton registry
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the metrics registry."""
+    return _registry
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Metric definitions
+# ─────────────────────────────────────────────────────────────────────
+
+STAGE_LATENCY = _registry.histogram(
+    "stage_latency_seconds", "Pipeline stage latency", ("pipeline", "stage", "outcome")
+)
+
+LLM_LATENCY = _registry.histogram(
+    "llm_request_seconds", "OpenRouter request latency (excluding queue wait)", ("model", "purpose"),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_QUEUE_WAIT = _registry.histogram(
+    "llm_queue_wait_seconds", "Time queued in the LLM scheduler", ("priority",)
+)
+LLM_TOKENS = _registry.counter("llm_tokens_total", "LLM tokens", ("model", "purpose", "kind"))
+LLM_COST = _registry.counter("llm_cost_usd_total", "LLM cost in USD", ("model", "purpose"))
+
+EMBEDDING_REQUESTS = _registry.histogram(
+    "embedding_request_seconds", "Embedding API request latency", ("model",)
+)
+EMBEDDING_TEXTS = _registry.counter("embedding_texts_total", "Texts sent for embedding", ("model",))
+EMBEDDING_QUERY_CACHE = _registry.counter(
+    "embedding_query_cache_total", "Query embedding lookups", ("result",)  # hit | shared | miss
+)
+
+DB_LATENCY = _registry.histogram(
+    "db_query_seconds", "Vector/SQLite query latency", ("backend", "operation")
+)
+
+SCRAPED_MESSAGES = _registry.counter("scraper_messages_total", "Messages read by the scraper")
+
+DISCORD_RATE_LIMITS = _registry.counter(
+    "discord_rate_limited_total", "Discord REST 429 responses", ("method", "route", "scope")
+)
+
+LOOP_LAG = _registry.histogram(
+    "event_loop_lag_seconds", "Event loop wake-up delay",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKED_SECONDS = _registry.counter(
+    "event_loop_blocked_seconds_total", "Sampled time the loop was blocked, by repo caller", ("caller",)
+)
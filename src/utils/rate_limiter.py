@@ -0,0 +1,162 @@
+"""
+Per-user token-bucket rate limiting for bot mentions.
+
+Each mention costs one token; buckets refill at `requests_per_minute` and
+hold at most `burst` tokens. A bucket that has been idle long enough to
+refill completely is indistinguishable from a new one, so the periodic
+sweep simply drops it - memory stays proportional to recently active users.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, Optional
+
+from src.utils import get_config, get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between sweeps of idle buckets
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    retry_after: float = 0.0  # Seconds until the next token
+    first_denial: bool = False  # First denied request since the last allowed one
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "notified")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+        self.notified = False
+
+
+class TokenBucketLimiter:
+    """
+    Token-bucket limiter keyed by user (optionally user + channel).
+
+    Usage:
+        limiter = get_rate_limiter()
+        result = limiter.check(user_id, channel_id)
+        if not result.allowed:
+            ...  # retry in result.retry_after seconds
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 10,
+        burst: int = 5,
+        per_channel: bool = False,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            requests_per_minute: Refill rate
+            burst: Bucket capacity
+            per_channel: Separate buckets per (user, channel)
+            sweep_interval: Seconds between sweeps of idle buckets
+        """
+        self.rate = max(requests_per_minute, 0.001) / 60.0  # Tokens per second
+        self.capacity = float(max(1, burst))
+        self.per_channel = per_channel
+        self.sweep_interval = sweep_interval
+
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._last_sweep = time.monotonic()
+
+        self.stats = {"allowed": 0, "limited": 0, "swept": 0}
+
+    def check(
+        self,
+        user_id: int,
+        channel_id: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> RateLimitResult:
+        """
+        Take one token for the user if available.
+
+        Args:
+            user_id: Discord user ID
+            channel_id: Channel ID (only used when per_channel is enabled)
+            now: Monotonic time (for tests)
+
+        Returns:
+            RateLimitResult
+        """
+        now = time.monotonic() if now is None else now
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        key = (user_id, channel_id) if self.per_channel else user_id
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self.capacity, now)
+            self._buckets[key] = bucket
+        else:
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            bucket.notified = False
+            self.stats["allowed"] += 1
+            return RateLimitResult(allowed=True)
+
+        self.stats["limited"] += 1
+        first_denial = not bucket.notified
+        bucket.notified = True
+        return RateLimitResult(
+            allowed=False,
+            retry_after=(1.0 - bucket.tokens) / self.rate,
+            first_denial=first_denial,
+        )
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Drop buckets that have refilled completely.
+
+        Returns:
+            Number of buckets removed
+        """
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+
+        idle = [
+            key for key, bucket in self._buckets.items()
+            if (now - bucket.updated) * self.rate >= self.capacity - bucket.tokens
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+        self.stats["swept"] += len(idle)
+        if idle:
+            logger.debug("rate_limit_buckets_swept", swept=len(idle), remaining=len(self._buckets))
+        return len(idle)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Limiter counters and current bucket count."""
+        return {**self.stats, "buckets": len(self._buckets)}
+
+
+# Singleton instance
+_limiter: Optional[TokenBucketLimiter] = None
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Get singleton mention rate limiter (configured from rate_limit settings)."""
+    global _limiter
+    if _limiter is None:
+        rate_limit = get_config().rate_limit
+        _limiter = TokenBucketLimiter(
+            requests_per_minute=rate_limit.requests_per_minute,
+            burst=rate_limit.burst,
+            per_channel=rate_limit.per_channel,
+        )
+    return _limiter
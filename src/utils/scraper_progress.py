@@ -1,10 +1,21 @@
 """
 Scraper progress tracker to persist scraping state across bot restarts.
 
-Saves the last scraped message ID for each channel to avoid re-scraping.
+Progress lives in a SQLite table (one row per channel), so checkpoints are
+single-row upserts and can be written in the middle of a channel scrape.
+
+Per channel it tracks two cursors:
+- newest_message_id: catch-up resumes with `after=` this ID
+- oldest_message_id: backfill of older history resumes with `before=` this ID
+  until backfill_complete is set
+
+backfill_scanned counts messages walked by backfill so far, so a scrape
+limit is honoured across restarts rather than re-applied from each resume.
 """
 
 import json
+import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
@@ -13,79 +24,233 @@ from src.utils import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_DB_PATH = Path("data/messages.db")
+LEGACY_PROGRESS_FILE = Path("data/scraper_progress.json")
+
 
 class ScraperProgress:
     """
     Tracks scraping progress to avoid re-scraping messages after restart.
-    
+
     Stores:
-    - Last scraped message ID per channel
+    - Newest and oldest scraped message ID per channel
+    - Whether historical backfill finished
+    - Messages walked by backfill so far (for the scrape limit)
     - Timestamp of last scrape
     - Total messages scraped per channel
     """
-    
-    def __init__(self, progress_file: str = "data/scraper_progress.json"):
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        legacy_file: Optional[Path] = LEGACY_PROGRESS_FILE,
+    ):
         """
         Initialize scraper progress tracker.
-        
+
         Args:
-            progress_file: Path to progress JSON file
-        """
-        self.progress_file = Path(progress_file)
-        self.progress: Dict[str, Dict] = {}
-        
-        # Ensure data directory exists
-        self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Load existing progress
-        self._load_progress()
-        
-        # Silent init
-    
-    def _load_progress(self):
-        """Load progress from JSON file."""
-        if self.progress_file.exists():
-            try:
-                with open(self.progress_file, "r", encoding="utf-8") as f:
-                    self.progress = json.load(f)
-                
-                pass  # Progress loaded
-            except Exception as e:
-                logger.error(
-                    "failed_to_load_progress",
-                    error=str(e),
+            db_path: Path to SQLite database file
+            legacy_file: Old JSON progress file to import once (if present)
+        """
+        self.db_path = db_path or DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._init_table()
+
+        if legacy_file:
+            self._migrate_legacy_file(Path(legacy_file))
+
+    @contextmanager
+    def _get_connection(self):
+        """Get database connection with context manager."""
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _init_table(self):
+        """Create progress table."""
+        with self._get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scraper_progress (
+                    channel_id TEXT PRIMARY KEY,
+                    channel_name TEXT,
+                    newest_message_id TEXT,
+                    oldest_message_id TEXT,
+                    backfill_complete INTEGER NOT NULL DEFAULT 0,
+                    backfill_scanned INTEGER NOT NULL DEFAULT 0,
+                    total_messages INTEGER NOT NULL DEFAULT 0,
+                    first_scraped TEXT,
+                    last_scraped TEXT
                 )
-                self.progress = {}
-        else:
-            logger.info("no_existing_progress_found")
-            self.progress = {}
-    
-    def _save_progress(self):
-        """Save progress to JSON file."""
+            """)
+            columns = {
+                row["name"]
+                for row in conn.execute("PRAGMA table_info(scraper_progress)")
+            }
+            if "backfill_scanned" not in columns:
+                conn.execute(
+                    "ALTER TABLE scraper_progress "
+                    "ADD COLUMN backfill_scanned INTEGER NOT NULL DEFAULT 0"
+                )
+
+    def _migrate_legacy_file(self, legacy_file: Path):
+        """
+        Import progress from the old JSON file, then rename it.
+
+        The JSON file was only written after a channel finished, so every
+        channel in it is treated as fully backfilled.
+        """
+        if not legacy_file.exists():
+            return
+
         try:
-            with open(self.progress_file, "w", encoding="utf-8") as f:
-                json.dump(self.progress, f, indent=2, ensure_ascii=False)
-            
-            logger.debug("scraper_progress_saved")
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+
+            with self._get_connection() as conn:
+                for channel_id, data in legacy.items():
+                    conn.execute(
+                        """
+                        INSERT OR IGNORE INTO scraper_progress (
+                            channel_id, channel_name, newest_message_id,
+                            backfill_complete, total_messages, first_scraped, last_scraped
+                        ) VALUES (?, ?, ?, 1, ?, ?, ?)
+                        """,
+                        (
+                            channel_id,
+                            data.get("channel_name"),
+                            data.get("last_message_id"),
+                            data.get("total_messages", 0),
+                            data.get("first_scraped"),
+                            data.get("last_scraped"),
+                        ),
+                    )
+
+            legacy_file.rename(legacy_file.with_suffix(".json.migrated"))
+            logger.info("scraper_progress_migrated", channels=len(legacy))
         except Exception as e:
             logger.error(
-                "failed_to_save_progress",
+                "failed_to_migrate_progress",
                 error=str(e),
             )
-    
+
+    def _get_row(self, channel_id: str) -> Optional[sqlite3.Row]:
+        with self._get_connection() as conn:
+            return conn.execute(
+                "SELECT * FROM scraper_progress WHERE channel_id = ?",
+                (channel_id,),
+            ).fetchone()
+
     def get_last_message_id(self, channel_id: str) -> Optional[str]:
         """
-        Get last scraped message ID for channel.
-        
+        Get newest scraped message ID for channel.
+
         Args:
             channel_id: Discord channel ID
-            
+
         Returns:
-            Last message ID or None if never scraped
+            Newest message ID or None if never scraped
+        """
+        row = self._get_row(channel_id)
+        return row["newest_message_id"] if row else None
+
+    def get_oldest_message_id(self, channel_id: str) -> Optional[str]:
         """
-        channel_data = self.progress.get(channel_id, {})
-        return channel_data.get("last_message_id")
-    
+        Get oldest message ID seen by backfill for channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            Oldest message ID or None if backfill never started
+        """
+        row = self._get_row(channel_id)
+        return row["oldest_message_id"] if row else None
+
+    def is_backfill_complete(self, channel_id: str) -> bool:
+        """Check if historical backfill finished for channel."""
+        row = self._get_row(channel_id)
+        return bool(row and row["backfill_complete"])
+
+    def get_backfill_scanned(self, channel_id: str) -> int:
+        """
+        Get number of messages walked by backfill for channel.
+
+        Args:
+            channel_id: Discord channel ID
+
+        Returns:
+            Messages scanned by backfill across all runs (0 if never started)
+        """
+        row = self._get_row(channel_id)
+        return row["backfill_scanned"] if row else 0
+
+    def checkpoint(
+        self,
+        channel_id: str,
+        channel_name: str,
+        newest_message_id: Optional[str] = None,
+        oldest_message_id: Optional[str] = None,
+        messages_scraped: int = 0,
+        backfill_scanned: int = 0,
+        backfill_complete: Optional[bool] = None,
+    ):
+        """
+        Save scraping progress for channel (single-row upsert).
+
+        Cursors that are None are left unchanged.
+
+        Args:
+            channel_id: Discord channel ID
+            channel_name: Channel name
+            newest_message_id: Newest message processed
+            oldest_message_id: Oldest message processed by backfill
+            messages_scraped: Messages scraped since the previous checkpoint
+            backfill_scanned: Messages walked by backfill since the previous checkpoint
+            backfill_complete: Mark backfill finished (None = unchanged)
+        """
+        now = datetime.utcnow().isoformat()
+        backfill = None if backfill_complete is None else int(backfill_complete)
+
+        try:
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO scraper_progress (
+                        channel_id, channel_name, newest_message_id, oldest_message_id,
+                        backfill_complete, backfill_scanned, total_messages,
+                        first_scraped, last_scraped
+                    ) VALUES (?, ?, ?, ?, COALESCE(?, 0), ?, ?, ?, ?)
+                    ON CONFLICT(channel_id) DO UPDATE SET
+                        channel_name = excluded.channel_name,
+                        newest_message_id = COALESCE(excluded.newest_message_id, newest_message_id),
+                        oldest_message_id = COALESCE(excluded.oldest_message_id, oldest_message_id),
+                        backfill_complete = COALESCE(?, backfill_complete),
+                        backfill_scanned = backfill_scanned + excluded.backfill_scanned,
+                        total_messages = total_messages + excluded.total_messages,
+                        last_scraped = excluded.last_scraped
+                    """,
+                    (
+                        channel_id, channel_name, newest_message_id, oldest_message_id,
+                        backfill, backfill_scanned, messages_scraped, now, now,
+                        backfill,
+                    ),
+                )
+
+            logger.debug("scraper_progress_saved")
+        except Exception as e:
+            logger.error(
+                "failed_to_save_progress",
+                error=str(e),
+            )
+
     def update_progress(
         self,
         channel_id: str,
@@ -94,74 +259,69 @@ class ScraperProgress:
         messages_scraped: int
     ):
         """
-        Update scraping progress for channel.
-        
+        Update newest scraped message for channel.
+
         Args:
             channel_id: Discord channel ID
             channel_name: Channel name
-            last_message_id: ID of last scraped message
+            last_message_id: ID of newest scraped message
             messages_scraped: Number of messages scraped in this session
         """
-        if channel_id not in self.progress:
-            self.progress[channel_id] = {
-                "channel_name": channel_name,
-                "first_scraped": datetime.utcnow().isoformat(),
-                "total_messages": 0,
-            }
-        
-        # Update data
-        self.progress[channel_id].update({
-            "channel_name": channel_name,  # Update in case renamed
-            "last_message_id": last_message_id,
-            "last_scraped": datetime.utcnow().isoformat(),
-            "total_messages": self.progress[channel_id].get("total_messages", 0) + messages_scraped,
-        })
-        
-        # Save to file
-        self._save_progress()
-        
+        self.checkpoint(
+            channel_id=channel_id,
+            channel_name=channel_name,
+            newest_message_id=last_message_id,
+            messages_scraped=messages_scraped,
+        )
+
         logger.debug(
             "progress_updated",
             channel_id=channel_id,
             channel_name=channel_name,
             messages_scraped=messages_scraped,
         )
-    
+
     def get_channel_stats(self, channel_id: str) -> Optional[Dict]:
         """
         Get scraping stats for channel.
-        
+
         Args:
             channel_id: Discord channel ID
-            
+
         Returns:
             Channel stats dict or None
         """
-        return self.progress.get(channel_id)
-    
+        row = self._get_row(channel_id)
+        return dict(row) if row else None
+
     def get_all_stats(self) -> Dict[str, Dict]:
         """Get all channel scraping stats."""
-        return self.progress.copy()
-    
+        with self._get_connection() as conn:
+            rows = conn.execute("SELECT * FROM scraper_progress").fetchall()
+        return {row["channel_id"]: dict(row) for row in rows}
+
     def reset_channel(self, channel_id: str):
         """
         Reset progress for specific channel.
-        
+
         Args:
             channel_id: Discord channel ID
         """
-        if channel_id in self.progress:
-            del self.progress[channel_id]
-            self._save_progress()
-            
+        with self._get_connection() as conn:
+            deleted = conn.execute(
+                "DELETE FROM scraper_progress WHERE channel_id = ?",
+                (channel_id,),
+            ).rowcount
+
+        if deleted:
             logger.info(
                 "channel_progress_reset",
                 channel_id=channel_id,
             )
-    
+
     def reset_all(self):
         """Reset all scraping progress."""
-        self.progress = {}
-        self._save_progress()
-        
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM scraper_progress")
+
         logger.info("all_progress_reset")
@@ -0,0 +1,149 @@
+"""
+Dependency-aware async stage pipeline.
+
+Pre-LLM work (reply context, mentioned-channel reads, routing, RAG search,
+tools) is mostly independent I/O. Stages declare what they depend on and
+run as soon as their dependencies finish, each under its own timeout:
+
+- required stage fails/times out -> the pipeline raises
+- optional stage fails/times out -> its default is used, so a slow optional
+  stage costs at most its timeout
+
+Per-stage latency is recorded for every run.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from src.utils import get_logger
+from src.utils.metrics import STAGE_LATENCY
+
+logger = get_logger(__name__)
+
+# Stage callables receive the results of their dependencies
+StageFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class Stage:
+    """Single pipeline stage."""
+    name: str
+    func: StageFunc
+    depends_on: Sequence[str] = ()
+    timeout: Optional[float] = None  # Seconds (None = no limit)
+    optional: bool = False
+    default: Any = None  # Result used when an optional stage fails
+
+
+@dataclass
+class PipelineResult:
+    """Stage results and timings."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    latencies_ms: Dict[str, float] = field(default_factory=dict)
+    degraded: List[str] = field(default_factory=list)  # Optional stages that fell back
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+
+class StagePipeline:
+    """
+    Runs stages concurrently, respecting dependencies.
+
+    Usage:
+        pipeline = StagePipeline("agent", [
+            Stage("context", build_context, timeout=8, optional=True, default=""),
+            Stage("tools", run_tools, timeout=6, optional=True),
+        ])
+        result = await pipeline.run()
+        context = result["context"]
+    """
+
+    def __init__(self, name: str, stages: Sequence[Stage]):
+        """
+        Initialize pipeline.
+
+        Args:
+            name: Pipeline name (for logs)
+            stages: Stages; dependencies must refer to stages in this list
+        """
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+    async def run(self) -> PipelineResult:
+        """
+        Run all stages.
+
+        Returns:
+            PipelineResult
+
+        Raises:
+            Exception from a required stage (asyncio.TimeoutError on timeout)
+        """
+        result = PipelineResult()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            # Wait for dependencies (a failed required dependency propagates)
+            if stage.depends_on:
+                await asyncio.gather(*(tasks[dep] for dep in stage.depends_on))
+            inputs = {dep: result.values[dep] for dep in stage.depends_on}
+
+            started = time.monotonic()
+            try:
+                value = await asyncio.wait_for(stage.func(inputs), timeout=stage.timeout)
+            except Exception as e:
+                result.latencies_ms[stage.name] = (time.monotonic() - started) * 1000
+                STAGE_LATENCY.observe(
+                    time.monotonic() - started,
+                    pipeline=self.name,
+                    stage=stage.name,
+                    outcome="degraded" if stage.optional else "error",
+                )
+                if not stage.optional:
+                    raise
+
+                result.degraded.append(stage.name)
+                logger.warning(
+                    "pipeline_stage_degraded",
+                    pipeline=self.name,
+                    stage=stage.name,
+                    reason="timeout" if isinstance(e, asyncio.TimeoutError) else str(e),
+                )
+                value = stage.default
+
+            if stage.name not in result.latencies_ms:
+                result.latencies_ms[stage.name] = (time.monotonic() - started) * 1000
+                STAGE_LATENCY.observe(
+                    time.monotonic() - started, pipeline=self.name, stage=stage.name, outcome="ok"
+                )
+            result.values[stage.name] = value
+            return value
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+
+        started = time.monotonic()
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        finally:
+            logger.info(
+                "pipeline_stage_latencies",
+                pipeline=self.name,
+                total_ms=round((time.monotonic() - started) * 1000, 1),
+                **{f"{name}_ms": round(ms, 1) for name, ms in result.latencies_ms.items()},
+                degraded=result.degraded or None,
+            )
+
+        return result
@@ -0,0 +1,104 @@
+"""Agents are shared across requests - concurrent mentions must not leak state."""
+
+import asyncio
+import os
+import random
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents import base_agent
+from src.agents.base_agent import AgentConfig, AgentContext, BaseAgent
+
+
+class EchoAgent(BaseAgent):
+    """Agent without RAG or tools."""
+
+    def get_name(self) -> str:
+        return "echo"
+
+    def get_description(self) -> str:
+        return "echo"
+
+
+class SlowLLM:
+    """Answers after a random delay so concurrent requests interleave."""
+
+    async def chat_completion(self, messages, **kwargs):
+        await asyncio.sleep(random.uniform(0, 0.02))
+        return SimpleNamespace(content=f"{messages[-1]['content']} - ask in #general")
+
+
+def make_message(message_id: int, guild_id: int, channel_id: int):
+    channel = SimpleNamespace(id=channel_id, name="general")
+    guild = SimpleNamespace(id=guild_id, me=None, channels=[channel], text_channels=[])
+    return SimpleNamespace(
+        id=message_id,
+        guild=guild,
+        reference=None,
+        attachments=[],
+        stickers=[],
+        mentions=[],
+        role_mentions=[],
+        channel_mentions=[],
+        mention_everyone=False,
+    )
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    config = SimpleNamespace(performance=SimpleNamespace(
+        cache={"enabled": False},
+        stage_timeouts={},
+    ))
+    monkeypatch.setattr(base_agent, "get_config", lambda: config)
+    monkeypatch.setattr("src.agents.prompt_builder.get_channel_purposes", lambda: {})
+
+    return EchoAgent(
+        AgentConfig(
+            name="echo",
+            description="echo",
+            channels=[],
+            system_prompt="You are a test agent.",
+            rag_enabled=False,
+            rag_sources=[],
+            supports_vision=False,
+            include_images=False,
+            max_history=5,
+            tools=[],
+            response={},
+        ),
+        llm_client=SlowLLM(),
+    )
+
+
+async def test_concurrent_messages_use_their_own_guild(agent):
+    """Each response links the channel from its own message's guild."""
+    requests = [
+        (make_message(message_id=i, guild_id=1000 + i, channel_id=5000 + i), f"question {i}")
+        for i in range(50)
+    ]
+
+    responses = await asyncio.gather(*[
+        agent.process_message(message, query) for message, query in requests
+    ])
+
+    for (message, query), response in zip(requests, responses):
+        assert response.startswith(query)
+        assert response.endswith(f"<#{message.guild.channels[0].id}>")
+
+
+async def test_agent_keeps_no_request_state(agent):
+    """Nothing request-specific is left on the shared agent."""
+    before = set(vars(agent))
+    await agent.process_message(make_message(1, 1, 1), "hi")
+    assert set(vars(agent)) == before
+
+
+def test_context_guild_without_message():
+    ctx = AgentContext(message=None, query="hi")
+    assert ctx.guild is None
+    assert ctx.conversation_history == []